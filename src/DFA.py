@@ -1,5 +1,151 @@
-import copy
-from typing import List, Dict, Tuple
+import compact
+import sys
+from array import array
+from typing import Any, Callable, Iterable, List, Dict, Mapping, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class BuildError(ValueError):
+    """ Raised by the bulk construction of an automaton (see `DFA.from_table`
+        and `Builder`) when its description is invalid."""
+    pass
+
+class DuplicateStateError(BuildError):
+    """ Raised when a state is declared twice."""
+    def __init__(self, state: str):
+        super().__init__("state '" + str(state) + "' already exists.")
+        self.state : str = state
+        """ str: The duplicated state."""
+
+class UnknownStateError(BuildError):
+    """ Raised when a state which is not declared is referenced."""
+    def __init__(self, state: str):
+        super().__init__("the state '" + str(state) + "' is not an existing state.")
+        self.state : str = state
+        """ str: The unknown state."""
+
+class UnknownSymbolError(BuildError):
+    """ Raised when a symbol is not part of the alphabet."""
+    def __init__(self, symbol: str):
+        super().__init__("the symbol '" + str(symbol) + "' is not part of the alphabet.")
+        self.symbol : str = symbol
+        """ str: The unknown symbol."""
+
+class TransitionConflictError(BuildError):
+    """ Raised when two transitions with the same source state and symbol
+        lead to different states."""
+    def __init__(self, src_state: str, symbol: str):
+        super().__init__("the transition (" + str(src_state) + ", " + str(symbol)
+                         + ", ...) already exists.")
+        self.src_state : str = src_state
+        """ str: The source state of the transitions."""
+        self.symbol : str = symbol
+        """ str: The symbol of the transitions."""
+
+class TableError(BuildError):
+    """ Raised when a transition table has the wrong size or contains an
+        invalid destination id."""
+    def __init__(self, message: str, index: int = None):
+        super().__init__(message)
+        self.index : int = index
+        """ int: The position of the invalid entry in the table, None if the
+            size is wrong."""
+
+def equal_columns(table: array, width: int) -> List[List[int]]:
+    """
+    Groups the equal columns of a table. Each column is compared as a whole,
+        which costs a copy of the table, not a Python loop over its entries.
+
+    :param table: a flat row-major table.
+    :type table: array
+    :param width: the number of columns.
+    :type width: int
+    :return: the groups of indices of equal columns, ordered by their first
+            column.
+    :rtype: List[List[int]]
+    """
+    groups = {}
+    for column in range(width):
+        groups.setdefault(table[column::width].tobytes(), []).append(column)
+    return list(groups.values())
+
+def select_columns(table: array, width: int, columns: List[int]) -> array:
+    """
+    :param table: a flat row-major table.
+    :type table: array
+    :param width: the number of columns.
+    :type width: int
+    :param columns: the indices of columns to select, in order.
+    :type columns: List[int]
+    :return: the table made of the selected columns.
+    :rtype: array
+    """
+    n_rows = len(table) // width if width > 0 else 0
+    ret = array("l", [0]) * (n_rows * len(columns))
+    for (i, column) in enumerate(columns):
+        ret[i::len(columns)] = array("l", table[column::width])
+    return ret
+
+def predecessor_lists(table: array, width: int, n_states: int) -> List[List[int]]:
+    """
+    :param table: a transition table (see `DFA.table`).
+    :type table: array
+    :param width: the number of classes.
+    :type width: int
+    :param n_states: the number of states.
+    :type n_states: int
+    :return: the predecessors of each state (see `DFA.predecessor_ids`).
+    :rtype: List[List[int]]
+    """
+    ret = [[] for _ in range(n_states)]
+    for (index, dst) in enumerate(table):
+        if dst >= 0:
+            ret[dst].append(index // width)
+    return ret
+
+class StateList(list):
+    """
+    This class represent a list of states which notifies its automaton of
+        each modification (see `DFA.version`).
+    """
+    def __init__(self, owner, states = ()):
+        """
+        Initialise the list.
+
+        :param owner: the automaton to notify.
+        :type owner: DFA
+        :param states: the initial content of the list, defaults to ()
+        :type states: Iterable[str], optional
+        """
+        super().__init__(states)
+        self.owner = owner
+
+    def __reduce_ex__(self, protocol):
+        """ Copies and pickles the list with its owner."""
+        return (StateList, (self.owner, list(self)))
+
+def notifying(name: str):
+    """
+    Returns a version of the list method `name` which notifies the owner of
+        the list after the modification.
+
+    :param name: the name of the list method.
+    :type name: str
+    """
+    method = getattr(list, name)
+    def wrapper(self, *args):
+        ret = method(self, *args)
+        self.owner.version += 1
+        return ret
+    wrapper.__name__ = name
+    return wrapper
+
+for name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+             "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(StateList, name, notifying(name))
 
 class DFA:
     """
@@ -13,21 +159,250 @@ class DFA:
         :type alphabet: str
         """
 
+        self.version : int = 0
+        """ int: Modification counter, incremented by `add_state`,
+            `add_transition` and any change of `init` or `finals`."""
+        self.cache : Dict[str, Any] = {}
+        """ Dict[str, Any]: The derived properties computed for the current
+            version (see `cached`)."""
+        self.cache_version : int = 0
+        """ int: The version for which the cache has been computed."""
         self.states : List[str] = []
         """ List of string corresponding to states name.
             States are always identificated by name."""
-        self.transitions : Dict[str, List[Typle[str, str]]] = {}
-        """ Dict[str, List[Typle[str, str]]]: Dictionary mapping src state to a list of
-            pairs (dest_state, symbol)."""
+        self.state_ids : Dict[str, int] = {}
+        """ Dict[str, int]: Dictionary interning each state name to its index
+            in `states`."""
         self.init : str = None
         """ str: The initial state of the automaton."""
-        self.finals = []
-        """ List[str]: A list containing the name of the final states."""
+        self.finals : List[str] = []
+        """ List[str]: A list containing the name of the final states. Stored
+            as a `StateList`, so that modifications update `version`."""
         self.alphabet = ""
         """ str: A string containing all symbols in the alphabet."""
+        self.symbol_ids : Dict[str, int] = {}
+        """ Dict[str, int]: Dictionary interning each symbol to its index
+            in `alphabet`."""
         for s in alphabet:
-            if s not in self.alphabet:
+            if s not in self.symbol_ids:
+                self.symbol_ids[s] = len(self.alphabet)
                 self.alphabet += s
+        self.class_symbols : List[List[int]] = [list(range(len(self.alphabet)))] if self.alphabet else []
+        """ List[List[int]]: The classes of symbols, as lists of increasing
+            symbol ids. All the symbols of a class have the same transitions,
+            which are stored once (see `table`)."""
+        self.class_ids : array = array("l", [0]) * len(self.alphabet)
+        """ array: The index in `class_symbols` of the class of each symbol
+            id."""
+        self.table = array("l")
+        """ array: Flat row-major `state x class` table of destination state
+            ids, the transition (q, a) is stored at
+            `q * len(class_symbols) + class_ids[a]`. Missing transitions are
+            set to -1."""
+        self.predecessor_ids : List[List[int]] = []
+        """ List[List[int]]: Reverse adjacency index, for each state id the
+            list of the source state ids of its incoming transitions (one
+            entry per transition on a class)."""
+        self.sharers : List[int] = [1]
+        """ List[int]: The number of automata sharing the storage of the
+            states and transitions, in a one-element list shared by all of
+            them (see `shared`)."""
+        self.compacted : bool = False
+        """ bool: True if the automaton is stored in compact mode (see
+            `compact`)."""
+        self.overlaid : bool = False
+        """ bool: True if the table and predecessors are read-only views
+            completing the storage of another automaton (see
+            `clone_with_sink`)."""
+
+    @staticmethod
+    def from_table(alphabet: str, states: List[str], table: Iterable[int],
+                   init: str = None, finals: Iterable[str] = (),
+                   class_symbols: List[List[int]] = None) -> "DFA":
+        """
+        Builds an automaton in bulk from its transition table. The whole
+            description is validated at once (with NumPy if the table is a
+            NumPy array) and errors are raised instead of printed, which
+            makes it much faster than `add_state` and `add_transition` for
+            large automata. The symbols with the same transitions are grouped
+            in classes (see `class_symbols`).
+
+        :param alphabet: the alphabet of the automaton.
+        :type alphabet: str
+        :param states: the names of the states, their index is their id.
+        :type states: List[str]
+        :param table: the flat row-major `state x symbol` table of the
+                destination ids, -1 for missing transitions (see `table`).
+        :type table: Iterable[int]
+        :param init: the initial state, defaults to None
+        :type init: str, optional
+        :param finals: the final states, defaults to ()
+        :type finals: Iterable[str], optional
+        :param class_symbols: if given, the table is a `state x class` table
+                over these classes of symbol ids (see `class_symbols`), which
+                must partition the alphabet, defaults to None
+        :type class_symbols: List[List[int]], optional
+        :raises BuildError: if the description is invalid.
+        :return: the automaton.
+        :rtype: DFA
+        """
+        a = DFA(alphabet)
+        states = list(states)
+        n_states = len(states)
+        n_symbols = len(a.alphabet)
+        if class_symbols is not None:
+            class_symbols = [list(ids) for ids in class_symbols]
+            if sorted(i for ids in class_symbols for i in ids) != list(range(n_symbols)) \
+                    or any(len(ids) == 0 for ids in class_symbols):
+                raise TableError("the classes are not a partition of the alphabet.")
+            n_symbols = len(class_symbols)
+        state_ids = {state: i for (i, state) in enumerate(states)}
+        if len(state_ids) != n_states:
+            seen = set()
+            for state in states:
+                if state in seen:
+                    raise DuplicateStateError(state)
+                seen.add(state)
+
+        if numpy is not None and isinstance(table, numpy.ndarray):
+            values = table.ravel()
+            if len(values) != n_states * n_symbols:
+                raise TableError("the table has " + str(len(values)) + " entries instead of "
+                                 + str(n_states * n_symbols) + ".")
+            invalid = numpy.flatnonzero((values < -1) | (values >= n_states))
+            if len(invalid) > 0:
+                raise TableError("invalid destination id " + str(values[invalid[0]])
+                                 + " in the table.", int(invalid[0]))
+            table = array("l")
+            table.frombytes(values.astype(numpy.dtype("l")).tobytes())
+        else:
+            table = array("l", table)
+            if len(table) != n_states * n_symbols:
+                raise TableError("the table has " + str(len(table)) + " entries instead of "
+                                 + str(n_states * n_symbols) + ".")
+            if len(table) > 0 and (min(table) < -1 or max(table) >= n_states):
+                index = next(i for (i, dst) in enumerate(table) if dst < -1 or dst >= n_states)
+                raise TableError("invalid destination id " + str(table[index])
+                                 + " in the table.", index)
+
+        if init is not None and init not in state_ids:
+            raise UnknownStateError(init)
+        finals = list(finals)
+        for state in finals:
+            if state not in state_ids:
+                raise UnknownStateError(state)
+
+        if class_symbols is None:
+            class_symbols = equal_columns(table, n_symbols)
+            if len(class_symbols) < n_symbols:
+                table = select_columns(table, n_symbols, [ids[0] for ids in class_symbols])
+
+        a.states = states
+        a.state_ids = state_ids
+        a.table = table
+        a.set_classes(class_symbols)
+        a.predecessor_ids = predecessor_lists(table, len(class_symbols), n_states)
+        a.finals = list(dict.fromkeys(finals))
+        a.init = init
+        return a
+
+    @staticmethod
+    def builder(alphabet: str) -> "Builder":
+        """
+        :param alphabet: the alphabet of the automaton.
+        :type alphabet: str
+        :return: a new builder for an automaton over the alphabet (see
+                `Builder`).
+        :rtype: Builder
+        """
+        return Builder(alphabet)
+
+    @property
+    def transitions(self) -> Mapping[str, List[Tuple[str, str]]]:
+        """ Mapping[str, List[Tuple[str, str]]]: Read-only view mapping each
+            state to the list of the pairs (symbol, dst_state) of its
+            transitions, in the order of the alphabet, computed from `table`
+            (see `compact.TableTransitions`). The lists are computed on each
+            access, modifying them has no effect: the transitions are changed
+            with `add_transition` and `remove_transition`, or replaced by
+            assigning a whole mapping."""
+        return compact.TableTransitions(self.states, self.state_ids, self.alphabet, self.table, self.class_ids)
+
+    @transitions.setter
+    def transitions(self, transitions: Mapping[str, Iterable[Tuple[str, str]]]):
+        """
+        Replaces all the transitions of the automaton, the table is rebuilt in
+            bulk (see `Builder`). The states missing from the mapping have no
+            transition.
+
+        :param transitions: maps states to the pairs (symbol, dst_state) of
+                their transitions.
+        :type transitions: Mapping[str, Iterable[Tuple[str, str]]]
+        :raises BuildError: if a state or a symbol is unknown or if two
+                transitions conflict.
+        """
+        builder = Builder(self.alphabet).add_states(self.states)
+        for (state, pairs) in transitions.items():
+            if state not in self.state_ids:
+                raise UnknownStateError(state)
+            builder.add_transitions((state, symbol, dst_state) for (symbol, dst_state) in pairs)
+        a = builder.build()
+        if self.shared:
+            self.states = self.states.copy()
+            self.state_ids = self.state_ids.copy()
+            self.leave()
+        self.version += 1
+        self.table = a.table
+        self.set_classes(a.class_symbols)
+        self.predecessor_ids = a.predecessor_ids
+        self.compacted = False
+        self.overlaid = False
+
+    @property
+    def shared(self) -> bool:
+        """ bool: True if the storage of the states and transitions is shared
+            with clones, in which case it is copied before the next
+            modification (copy-on-write). The automaton which detaches its
+            storage leaves the count of the others."""
+        return self.sharers[0] > 1
+
+    @property
+    def init(self) -> str:
+        return self._init
+
+    @init.setter
+    def init(self, state: str):
+        self._init = state
+        self.version += 1
+
+    @property
+    def finals(self) -> List[str]:
+        return self._finals
+
+    @finals.setter
+    def finals(self, states: List[str]):
+        self._finals = StateList(self, states)
+        self.version += 1
+
+    def cached(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the derived property `key` of the automaton, computing it with
+            `compute` if it has not been computed since the last modification
+            (see `version`). The returned value must not be modified.
+
+        :param key: the name of the property.
+        :type key: str
+        :param compute: the function computing the property.
+        :type compute: Callable[[], Any]
+        :return: the value of the property.
+        :rtype: Any
+        """
+        if self.cache_version != self.version:
+            self.cache = {}
+            self.cache_version = self.version
+        if key not in self.cache:
+            self.cache[key] = compute()
+        return self.cache[key]
 
     def add_state(self, state: str, final : bool = False):
         """
@@ -39,11 +414,15 @@ class DFA:
                 final, defaults to False
         :type final: bool, optional
         """
-        if state in self.states:
+        if state in self.state_ids:
             print("error : state '" + state + "' already exists.")
             return
-        self.transitions[state] = []
+        self.detach()
+        self.version += 1
+        self.state_ids[state] = len(self.states)
         self.states.append(state)
+        self.table.extend([-1] * len(self.class_symbols))
+        self.predecessor_ids.append([])
         if final:
             self.finals.append(state)
 
@@ -57,8 +436,22 @@ class DFA:
         :return: _description_
         :rtype: bool
         """
-        if symbol not in self.alphabet: return False
-        return True
+        return symbol in self.symbol_ids
+
+    def dst_id(self, src_id: int, symbol_id: int) -> int:
+        """
+        Returns the id of the destination state of the transition from the
+            state `src_id` on the symbol `symbol_id`, or -1 if the transition
+            does not exists. No check is performed on the ids.
+
+        :param src_id: the id of the source state.
+        :type src_id: int
+        :param symbol_id: the id of the symbol.
+        :type symbol_id: int
+        :return: the id of the destination state.
+        :rtype: int
+        """
+        return self.table[src_id * len(self.class_symbols) + self.class_ids[symbol_id]]
 
     def dst_state(self, src_state: str, symbol: str) -> str:
         """
@@ -73,18 +466,24 @@ class DFA:
         :return: the destination state.
         :rtype: str
         """
-        if src_state not in self.states:
+        src_id = self.state_ids.get(src_state)
+        if src_id is None:
             print("error : the state '" + str(src_state) + "' is not an existing state.")
             return
-        for (s, dst_state) in self.transitions[src_state]:
-            if s == symbol:
-                return dst_state
-        return None
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            return None
+        dst_id = self.table[src_id * len(self.class_symbols) + self.class_ids[symbol_id]]
+        if dst_id < 0:
+            return None
+        return self.states[dst_id]
 
     def add_transition(self, src_state: str, symbol: str, dst_state: str):
         """
         Add a transition to the FA. Print error if the automaton already have a
-            transition for the specified source state and symbol.
+            transition for the specified source state and symbol. The symbol
+            leaves its class if the class has other symbols (see
+            `split_class`).
 
         :param src_state: the name of the source state.
         :type src_state: str
@@ -96,32 +495,270 @@ class DFA:
         if not self.valid_symbol(symbol):
             print("error : the symbol '" + symbol + "' is not part of the alphabet.")
             return
-        if src_state not in self.states:
+        src_id = self.state_ids.get(src_state)
+        if src_id is None:
             print("error : the state '" + src_state + "' is not an existing state.")
             return
-        if dst_state not in self.states:
+        dst_id = self.state_ids.get(dst_state)
+        if dst_id is None:
             print("error : the state '" + dst_state + "' is not an existing state.")
             return
 
-        if self.dst_state(src_state, symbol) != None:
+        symbol_id = self.symbol_ids[symbol]
+        if self.dst_id(src_id, symbol_id) >= 0:
             print("error : the transition (" + src_state + ", " + symbol + ", ...) already exists.")
             return
 
-        self.transitions[src_state].append((symbol, dst_state))
+        self.detach()
+        self.version += 1
+        class_id = self.split_class(symbol_id)
+        self.table[src_id * len(self.class_symbols) + class_id] = dst_id
+        self.predecessor_ids[dst_id].append(src_id)
         return
 
+    def add_class_transition(self, src_state: str, class_id: int, dst_state: str):
+        """
+        Add a transition on all the symbols of a class (see `class_symbols`).
+            Print error if the automaton already have a transition for the
+            specified source state and class.
+
+        :param src_state: the name of the source state.
+        :type src_state: str
+        :param class_id: the index of the class in `class_symbols`.
+        :type class_id: int
+        :param dst_state: the name of the destination state.
+        :type dst_state: str
+        """
+        src_id = self.state_ids.get(src_state)
+        if src_id is None:
+            print("error : the state '" + str(src_state) + "' is not an existing state.")
+            return
+        dst_id = self.state_ids.get(dst_state)
+        if dst_id is None:
+            print("error : the state '" + str(dst_state) + "' is not an existing state.")
+            return
+        if not 0 <= class_id < len(self.class_symbols):
+            print("error : the class " + str(class_id) + " does not exist.")
+            return
+        index = src_id * len(self.class_symbols) + class_id
+        if self.table[index] >= 0:
+            print("error : the transition (" + src_state + ", class " + str(class_id) + ", ...) already exists.")
+            return
+
+        self.detach()
+        self.version += 1
+        self.table[index] = dst_id
+        self.predecessor_ids[dst_id].append(src_id)
+
+    def remove_transition(self, src_state: str, symbol: str):
+        """
+        Remove a transition from the automaton. Print error if the automaton
+            has no transition for the specified source state and symbol.
+
+        :param src_state: the name of the source state.
+        :type src_state: str
+        :param symbol: the symbol of the transition.
+        :type symbol: str
+        """
+        src_id = self.state_ids.get(src_state)
+        if src_id is None:
+            print("error : the state '" + str(src_state) + "' is not an existing state.")
+            return
+        symbol_id = self.symbol_ids.get(symbol)
+        dst_id = -1 if symbol_id is None else self.dst_id(src_id, symbol_id)
+        if dst_id < 0:
+            print("error : the transition (" + src_state + ", " + str(symbol) + ", ...) does not exist.")
+            return
+
+        self.detach()
+        self.version += 1
+        class_id = self.split_class(symbol_id)
+        self.table[src_id * len(self.class_symbols) + class_id] = -1
+        self.predecessor_ids[dst_id].remove(src_id)
+
+    def split_class(self, symbol_id: int) -> int:
+        """
+        Moves a symbol out of its class into a new class of its own, whose
+            column of `table` is a copy of the column of the old class, so
+            that its transitions can be changed alone. Nothing is done if the
+            symbol is alone in its class. Must be called after `detach`.
+
+        :param symbol_id: the id of the symbol.
+        :type symbol_id: int
+        :return: the index of the class of the symbol.
+        :rtype: int
+        """
+        class_id = self.class_ids[symbol_id]
+        if len(self.class_symbols[class_id]) == 1:
+            return class_id
+        width = len(self.class_symbols)
+        self.class_symbols[class_id].remove(symbol_id)
+        self.class_symbols.append([symbol_id])
+        self.class_ids[symbol_id] = width
+        self.table = select_columns(self.table, width, list(range(width)) + [class_id])
+        for (src, dst) in enumerate(self.table[class_id::width + 1]):
+            if dst >= 0:
+                self.predecessor_ids[dst].append(src)
+        return width
+
+    def merge_classes(self):
+        """
+        Merges the classes of the symbols which have the same transitions,
+            which `split_class` leaves separated, so that `table` has one
+            column per class of equivalent symbols (see `equal_columns`).
+        """
+        width = len(self.class_symbols)
+        columns = equal_columns(self.table, width)
+        if len(columns) == width:
+            return
+        self.detach()
+        self.version += 1
+        class_symbols = [sorted(i for column in ids for i in self.class_symbols[column]) for ids in columns]
+        self.table = select_columns(self.table, width, [ids[0] for ids in columns])
+        self.set_classes(class_symbols)
+        self.predecessor_ids = predecessor_lists(self.table, len(class_symbols), len(self.states))
+
+    def set_classes(self, class_symbols: List[List[int]]):
+        """
+        Sets `class_symbols` and `class_ids`, without changing the table.
+
+        :param class_symbols: the classes of symbol ids.
+        :type class_symbols: List[List[int]]
+        """
+        self.class_symbols = class_symbols
+        self.class_ids = array("l", [0]) * len(self.alphabet)
+        for (class_id, ids) in enumerate(class_symbols):
+            for i in ids:
+                self.class_ids[i] = class_id
+
+    def detach(self):
+        """
+        Gives the automaton its own copy of the storage it shares with its
+            clones, if any, and restores the regular layout if it is in
+            compact mode or overlaid. Called before each modification.
+        """
+        if not self.shared and not self.compacted and not self.overlaid:
+            return
+        if self.shared:
+            self.states = self.states.copy()
+            self.state_ids = self.state_ids.copy()
+            self.class_symbols = [list(ids) for ids in self.class_symbols]
+            self.class_ids = array("l", self.class_ids)
+            self.leave()
+        self.table = array("l", self.table)
+        self.predecessor_ids = [list(preds) for preds in self.predecessor_ids]
+        self.compacted = False
+        self.overlaid = False
+
+    def leave(self):
+        """
+        Removes the automaton from the count of the automata sharing its
+            storage, once it has its own copy.
+        """
+        self.sharers[0] -= 1
+        self.sharers = [1]
+
+    def compact(self):
+        """
+        Switches the automaton to a compact storage, for automata which are
+            kept in memory but rarely modified. The state names are interned,
+            the table uses 4 bytes per entry when possible and the
+            predecessors are packed in arrays (`compact.PackedLists`). The
+            automaton behaves the same, the regular layout is restored by the
+            next modification.
+        """
+        if self.compacted:
+            return
+        n = len(self.states)
+        self.states = [sys.intern(state) for state in self.states]
+        self.state_ids = {state: i for (i, state) in enumerate(self.states)}
+        self.table = compact.id_array(self.table, n)
+        self.predecessor_ids = compact.PackedLists(self.predecessor_ids, n)
+        self.finals = [sys.intern(state) for state in self.finals]
+        if self.init is not None:
+            self.init = sys.intern(self.init)
+        if self.shared:
+            self.class_symbols = [list(ids) for ids in self.class_symbols]
+            self.class_ids = array("l", self.class_ids)
+            self.leave()
+        self.compacted = True
+        self.overlaid = False
+
+    def memory_report(self) -> Dict[str, int]:
+        """
+        Returns the memory used by each component of the automaton, in bytes
+            (see `compact.memory_report`).
+
+        :return: the size of `states`, `state_ids`, `table`,
+                `predecessor_ids`, `finals`, `alphabet` (with `symbol_ids`),
+                `classes` (`class_symbols` and `class_ids`), `cache` and the
+                total.
+        :rtype: Dict[str, int]
+        """
+        return compact.memory_report({
+            "states": self.states,
+            "state_ids": self.state_ids,
+            "table": self.table,
+            "predecessor_ids": self.predecessor_ids,
+            "finals": self.finals,
+            "alphabet": (self.alphabet, self.symbol_ids),
+            "classes": (self.class_symbols, self.class_ids),
+            "cache": self.cache,
+        })
+
     def clone(self):
         """
-        Clones the DFA.
+        Clones the DFA. The states and transitions are shared between the DFA
+            and its clone until one of them is modified (copy-on-write), so
+            cloning is cheap. The final states are copied.
 
         :return: the cloned automaton.
         :rtype: DFA
         """
         a = DFA(self.alphabet)
-        a.states = self.states.copy()
+        a.states = self.states
+        a.state_ids = self.state_ids
+        a.table = self.table
+        a.predecessor_ids = self.predecessor_ids
+        a.class_symbols = self.class_symbols
+        a.class_ids = self.class_ids
+        a.init = self.init
+        a.finals = self.finals.copy()
+        a.compacted = self.compacted
+        a.overlaid = self.overlaid
+        a.sharers = self.sharers
+        self.sharers[0] += 1
+        a.cache = self.cache
+        a.cache_version = a.version if self.cache_version == self.version else -1
+        return a
+
+    def clone_with_sink(self, sink: str) -> "DFA":
+        """
+        Clones the DFA and adds a sink state to the clone: a new non-final
+            state, destination of all the missing transitions of the clone.
+            The table and predecessors of the clone are read-only views on
+            those of the DFA (see `compact.SinkTable`), shared until one of
+            them is modified like with `clone`, so only the states are copied.
+
+        :param sink: the name of the sink state, which must not exist.
+        :type sink: str
+        :return: the completed clone.
+        :rtype: DFA
+        """
+        n = len(self.states)
+        a = DFA(self.alphabet)
+        a.states = self.states + [sink]
+        a.state_ids = self.state_ids.copy()
+        a.state_ids[sink] = n
+        a.table = compact.SinkTable(self.table, len(self.class_symbols), n)
+        a.predecessor_ids = compact.SinkPredecessors(self.predecessor_ids, self.table, len(self.class_symbols))
+        a.class_symbols = self.class_symbols
+        a.class_ids = self.class_ids
         a.init = self.init
-        a.finals = self.finals
-        a.transitions = copy.deepcopy(self.transitions)
+        a.finals = self.finals.copy()
+        a.overlaid = True
+        a.sharers = self.sharers
+        self.sharers[0] += 1
         return a
 
     def __str__(self) -> str:
@@ -143,3 +780,117 @@ class DFA:
                 for (sym, dest) in self.transitions[state]:
                     ret += "          --(%s)--> (%s)\n" % (sym, dest)
         return ret
+
+class Builder:
+    """
+    This class collects the description of an automaton (states and named
+        transitions) without any check, and builds it in bulk with `build`,
+        which validates everything at once and raises a `BuildError` on the
+        first problem. It is returned by `DFA.builder`.
+    """
+    def __init__(self, alphabet: str):
+        """
+        Initialise the builder.
+
+        :param alphabet: the alphabet of the automaton.
+        :type alphabet: str
+        """
+        self.alphabet : str = alphabet
+        """ str: The alphabet of the automaton."""
+        self.states : List[str] = []
+        """ List[str]: The states, in order of declaration."""
+        self.finals : List[str] = []
+        """ List[str]: The final states."""
+        self.init : str = None
+        """ str: The initial state."""
+        self.transitions : List[Tuple[str, str, str]] = []
+        """ List[Tuple[str, str, str]]: The transitions (src, symbol, dst)."""
+
+    def add_state(self, state: str, final: bool = False) -> "Builder":
+        """
+        Declares a state.
+
+        :param state: the name of the state.
+        :type state: str
+        :param final: True if the state is final, defaults to False
+        :type final: bool, optional
+        :return: the builder.
+        :rtype: Builder
+        """
+        self.states.append(state)
+        if final:
+            self.finals.append(state)
+        return self
+
+    def add_states(self, states: Iterable[str], finals: Iterable[str] = ()) -> "Builder":
+        """
+        Declares several states.
+
+        :param states: the names of the states.
+        :type states: Iterable[str]
+        :param finals: the states which are final, defaults to ()
+        :type finals: Iterable[str], optional
+        :return: the builder.
+        :rtype: Builder
+        """
+        self.states.extend(states)
+        self.finals.extend(finals)
+        return self
+
+    def add_transition(self, src_state: str, symbol: str, dst_state: str) -> "Builder":
+        """
+        Declares a transition.
+
+        :param src_state: the name of the source state.
+        :type src_state: str
+        :param symbol: the symbol of the transition.
+        :type symbol: str
+        :param dst_state: the name of the destination state.
+        :type dst_state: str
+        :return: the builder.
+        :rtype: Builder
+        """
+        self.transitions.append((src_state, symbol, dst_state))
+        return self
+
+    def add_transitions(self, transitions: Iterable[Tuple[str, str, str]]) -> "Builder":
+        """
+        Declares several transitions.
+
+        :param transitions: the transitions (src, symbol, dst).
+        :type transitions: Iterable[Tuple[str, str, str]]
+        :return: the builder.
+        :rtype: Builder
+        """
+        self.transitions.extend(transitions)
+        return self
+
+    def build(self) -> DFA:
+        """
+        Validates the description and builds the automaton (see
+            `DFA.from_table`). Declaring the same transition twice is allowed,
+            declaring two transitions with the same source and symbol but
+            different destinations is not.
+
+        :raises BuildError: if the description is invalid.
+        :return: the automaton.
+        :rtype: DFA
+        """
+        alphabet = "".join(dict.fromkeys(self.alphabet))
+        state_ids = {state: i for (i, state) in enumerate(self.states)}
+        symbol_ids = {symbol: i for (i, symbol) in enumerate(alphabet)}
+        n_symbols = len(alphabet)
+        table = array("l", [-1]) * (len(self.states) * n_symbols)
+        for (src_state, symbol, dst_state) in self.transitions:
+            try:
+                index = state_ids[src_state] * n_symbols + symbol_ids[symbol]
+                dst = state_ids[dst_state]
+            except KeyError:
+                if symbol not in symbol_ids:
+                    raise UnknownSymbolError(symbol) from None
+                raise UnknownStateError(dst_state if src_state in state_ids else src_state) from None
+            if table[index] != dst:
+                if table[index] >= 0:
+                    raise TransitionConflictError(src_state, symbol)
+                table[index] = dst
+        return DFA.from_table(alphabet, self.states, table, self.init, self.finals)
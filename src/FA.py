@@ -1,4 +1,10 @@
 
+import compact
+import sys
+
+EPSILON = "\\e"
+""" The symbol used for epsilon transitions."""
+
 class FA:
     """ This class represent any type of finite automaton."""
     def __init__(self, alphabet):
@@ -15,9 +21,45 @@ class FA:
         self.init = None
         """ A list containing the name of the final states."""
         self.finals = []
-        """ A string containing all symbol in the alphabet. The string "\e"
+        """ A string containing all symbol in the alphabet. The string "\\e"
             is used to represent epsilon and is implicit"""
         self.alphabet = alphabet
+        """ True if the automaton is stored in compact mode (see compact)."""
+        self.compacted = False
+
+    def compact(self):
+        """ Switches the automaton to a compact storage: the state names are
+            interned and the transitions, epsilon transitions and multiple
+            destinations included, are packed in arrays behind a read-only
+            view (compact.PackedTransitions). The automaton behaves the same,
+            the regular layout is restored by the next modification."""
+        if self.compacted:
+            return
+        self.states = [sys.intern(state) for state in self.states]
+        self.transitions = compact.PackedTransitions(self.states, self.alphabet, EPSILON, self.transitions)
+        self.finals = [sys.intern(state) for state in self.finals]
+        if self.init is not None:
+            self.init = sys.intern(self.init)
+        self.compacted = True
+
+    def expand(self):
+        """ Restores the regular layout of an automaton in compact mode.
+            Called before each modification."""
+        if not self.compacted:
+            return
+        self.transitions = {state: self.transitions[state] for state in self.states}
+        self.compacted = False
+
+    def memory_report(self):
+        """ Returns the memory used by each component of the automaton, in
+            bytes: states, transitions, finals, alphabet and the total (see
+            compact.memory_report)."""
+        return compact.memory_report({
+            "states": self.states,
+            "transitions": self.transitions,
+            "finals": self.finals,
+            "alphabet": self.alphabet,
+        })
 
     def add_state(self, state, final = False):
         """ Add a new state. Print error if the state already exists.
@@ -25,6 +67,7 @@ class FA:
         if state in self.states:
             print("error : state '" + state + "' already exists.")
             return
+        self.expand()
         self.transitions[state] = []
         self.states.append(state)
         if final:
@@ -34,7 +77,7 @@ class FA:
         """ Returns true if the symbol is part of the alphabet,
             false otherwise.
             @param symbol the symbol to be tested """
-        if symbol is "\e": return True
+        if symbol == EPSILON: return True
         if symbol not in self.alphabet: return False
         return True
 
@@ -58,6 +101,7 @@ class FA:
             print("error : the transition (" + src_state + ", " + symbol + ", " + dst_state + ") already exists.")
             return
 
+        self.expand()
         self.transitions[src_state].append((symbol, dst_state))
         return
 
@@ -69,7 +113,7 @@ class FA:
         ret = ret + "   - states (%d) :\n" % (len(self.states))
         for state in self.states:
             ret = ret + "       - (%s)" % (state)
-            if len(self.transitions[state]) is 0:
+            if len(self.transitions[state]) == 0:
                 ret = ret + ".\n"
             else:
                 ret = ret + ":\n"
@@ -1,12 +1,17 @@
 import DFA
+import FA
+import classes
+import profiling
+from array import array
 from typing import List, Tuple
-import copy
-import itertools
+import hashlib
+import json
 
 def run(dfa: DFA, word: str, verbose : bool = False) -> bool:
     """
     Runs the specified DFA on a word and returns True if the word is
-        accepted.
+        accepted. To test many words against the same automaton, see
+        `matcher.compile`.
 
     :param dfa: the DFA to be executed.
     :type dfa: DFA
@@ -33,11 +38,13 @@ def run(dfa: DFA, word: str, verbose : bool = False) -> bool:
         next_state = dfa.dst_state(current_state, symbol)
         if next_state is None:
             if verbose: print("no transition available for (" + current_state + ", " + symbol + ").")
+            if profiling.ENABLED: profiling.count("run.transitions", i + 1)
             return False;
 
         current_state = next_state
         i = i+1
 
+    if profiling.ENABLED: profiling.count("run.transitions", i)
     if current_state in dfa.finals:
         if verbose: print("ending on final state '" + current_state + "'.")
         return True
@@ -55,16 +62,14 @@ def successors(dfa: DFA, state: str) -> List[str]:
     :return: the list of the successors of the state.
     :rtype: List[str]
     """
-    if state not in dfa.states:
+    if state not in dfa.state_ids:
         print("error : the specified state '" + state + "' is not part of the automaton.")
         return
 
-    ret = []
-    for (symbol, dst_state) in dfa.transitions[state]:
-        if dst_state not in ret:
-            ret.append(dst_state)
-
-    return ret
+    # One entry per class of symbols (see `DFA.class_symbols`).
+    k = len(dfa.class_symbols)
+    base = dfa.state_ids[state] * k
+    return list(dict.fromkeys(dfa.states[dst] for dst in dfa.table[base:base + k] if dst >= 0))
 
 def predecessors(dfa: DFA, state: str) -> List[str]:    
     """ 
@@ -77,17 +82,12 @@ def predecessors(dfa: DFA, state: str) -> List[str]:
     :return: the list of the predecessors of the state.
     :rtype: List[str]
     """
-    if state not in dfa.states:
+    if state not in dfa.state_ids:
         print("error : the specified state '" + state + "' is not part of the automaton.")
         return
 
-    ret = []
-    for src_state in dfa.states:
-        for (symbol, dst_state) in dfa.transitions[src_state]:
-            if dst_state == state and src_state not in ret:
-                ret.append(src_state)
-
-    return ret
+    src_ids = sorted(set(dfa.predecessor_ids[dfa.state_ids[state]]))
+    return [dfa.states[src_id] for src_id in src_ids]
 
 def is_complete(dfa: DFA) -> bool:
     """
@@ -98,15 +98,14 @@ def is_complete(dfa: DFA) -> bool:
     :return: a boolean corresponding to the completion of the automaton.
     :rtype: bool
     """
-    for state in dfa.states:
-        for symbol in dfa.alphabet:
-            if dfa.dst_state(state, symbol) == None:
-                return False
-    return True
+    return dfa.cached("is_complete", lambda : -1 not in dfa.table)
 
 def complete(dfa: DFA) -> DFA:
     """
-    Completes the specified automaton.
+    Completes the specified automaton. The missing transitions are added per
+        class of symbols (see `DFA.class_symbols`), after merging the classes
+        of equivalent symbols, so the sink state costs one transition per
+        class and state, not per symbol.
 
     :param dfa: the automaton to complete.
     :type dfa: DFA
@@ -114,42 +113,103 @@ def complete(dfa: DFA) -> DFA:
     :rtype: DFA
     """
     if is_complete(dfa): return
-    # Find a name for Qp
+    qp = sink_name(dfa)
+
+    # Complete. The missing transitions are located with array.index, so the
+    # complete parts of the table are skipped at C speed.
+    dfa.merge_classes()
+    dfa.add_state(qp)
+    k = len(dfa.class_symbols)
+    missing = []
+    index = -1
+    try:
+        while True:
+            index = dfa.table.index(-1, index + 1)
+            missing.append(index)
+    except ValueError:
+        pass
+    for index in missing:
+        dfa.add_class_transition(dfa.states[index // k], index % k, qp)
+
+    return dfa
+
+def class_column(dfa: DFA, symbol: str) -> int:
+    """
+    :param dfa: an automaton.
+    :type dfa: DFA
+    :param symbol: a symbol.
+    :type symbol: str
+    :return: the column of the class of the symbol in the table of the
+            automaton (see `DFA.class_ids`), -1 if the symbol is not part of
+            its alphabet.
+    :rtype: int
+    """
+    symbol_id = dfa.symbol_ids.get(symbol)
+    return -1 if symbol_id is None else dfa.class_ids[symbol_id]
+
+def sink_name(dfa: DFA) -> str:
+    """
+    :param dfa: an automaton.
+    :type dfa: DFA
+    :return: a name for a new sink state of the automaton: "Qp", or "Qp"
+            followed by a number if it is taken.
+    :rtype: str
+    """
     qp = "Qp"
     i = 0
-    while qp in dfa.states:
+    while qp in dfa.state_ids:
         qp = "Qp" + str(i)
         i += 1
+    return qp
 
-    # Complete
-    dfa.add_state(qp)
-    for state in dfa.states:
-        for symbol in dfa.alphabet:
-            if dfa.dst_state(state, symbol) == None:
-                dfa.add_transition(state, symbol, qp)
+def completed(dfa: DFA) -> DFA:
+    """
+    Returns a completed copy of the specified automaton, which is not modified
+        (see `complete`). The copy shares the states and transitions of the
+        automaton, the sink state is an overlay on its table (see
+        `DFA.clone` and `DFA.clone_with_sink`).
 
-    return dfa
+    :param dfa: the automaton to complete.
+    :type dfa: DFA
+    :return: the completed automaton.
+    :rtype: DFA
+    """
+    if is_complete(dfa):
+        return dfa.clone()
+    return dfa.clone_with_sink(sink_name(dfa))
 
 def accessible_states(dfa: DFA) -> List[str]:
     """ 
-    Returns the list of all accessible states in the specified automaton.
+    Returns the list of all accessible states in the specified automaton. The
+        result is cached until the automaton is modified (see `DFA.cached`).
 
     :param dfa: the automaton considered.
     :type dfa: DFA
     :return: the list of the accessible states.
     :rtype: List[str]
     """
-    visited = []
-    to_visit = [dfa.init]
-
-    while len(to_visit) > 0:
-        state = to_visit.pop()
-        visited.append(state)
-        for succ in successors(dfa, state):
-            if succ not in visited and succ not in to_visit:
-                to_visit.append(succ)
-
-    return visited
+    def compute() -> List[str]:
+        visited = []
+        to_visit = [dfa.init]
+        seen = {dfa.init} # States already visited or to visit.
+        frontier = 1 # Maximal size of to_visit, only measured if instrumented.
+        instrumented = profiling.ENABLED
+
+        while len(to_visit) > 0:
+            if instrumented and len(to_visit) > frontier: frontier = len(to_visit)
+            state = to_visit.pop()
+            visited.append(state)
+            for succ in successors(dfa, state):
+                if succ not in seen:
+                    seen.add(succ)
+                    to_visit.append(succ)
+
+        if instrumented:
+            profiling.count("accessible_states.visited", len(visited))
+            profiling.count("accessible_states.max_frontier", frontier)
+        return visited
+
+    return dfa.cached("accessible_states", compute).copy()
 
 def accessible(dfa: DFA, state: str) -> bool:
     """ 
@@ -163,7 +223,7 @@ def accessible(dfa: DFA, state: str) -> bool:
     :return: True if the state is accessible, False otherwise.
     :rtype: bool
     """
-    if state not in dfa.states:
+    if state not in dfa.state_ids:
         print("error : the state '" + state + "' is not part of the automaton.")
         return
 
@@ -183,24 +243,36 @@ def accessible(dfa: DFA) -> bool:
 
 def coaccessible_states(dfa: DFA) -> List[str]:
     """ 
-    Returns the list of all coaccessible states in the specified automaton.
+    Returns the list of all coaccessible states in the specified automaton. The
+        result is cached until the automaton is modified (see `DFA.cached`).
 
     :param dfa: the automaton considered.
     :type dfa: DFA
     :return: the list of the coaccessible states.
     :rtype: List[str]
     """
-    visited = []
-    to_visit = dfa.finals.copy()
-
-    while len(to_visit) > 0:
-        state = to_visit.pop()
-        visited.append(state)
-        for pred in predecessors(dfa, state):
-            if pred not in visited and pred not in to_visit:
-                to_visit.append(pred)
-
-    return visited
+    def compute() -> List[str]:
+        visited = []
+        to_visit = list(dfa.finals)
+        seen = set(to_visit) # States already visited or to visit.
+        frontier = len(to_visit) # Maximal size of to_visit, only measured if instrumented.
+        instrumented = profiling.ENABLED
+
+        while len(to_visit) > 0:
+            if instrumented and len(to_visit) > frontier: frontier = len(to_visit)
+            state = to_visit.pop()
+            visited.append(state)
+            for pred in predecessors(dfa, state):
+                if pred not in seen:
+                    seen.add(pred)
+                    to_visit.append(pred)
+
+        if instrumented:
+            profiling.count("coaccessible_states.visited", len(visited))
+            profiling.count("coaccessible_states.max_frontier", frontier)
+        return visited
+
+    return dfa.cached("coaccessible_states", compute).copy()
 
 def coaccessible(dfa: DFA, state: str) -> bool:
     """ 
@@ -214,7 +286,7 @@ def coaccessible(dfa: DFA, state: str) -> bool:
     :return: True if the state is coaccessible, False otherwise.
     :rtype: bool
     """
-    if state not in dfa.states:
+    if state not in dfa.state_ids:
         print("error : the state '" + state + "' is not part of the automaton.")
         return
 
@@ -244,6 +316,137 @@ def trim(dfa: DFA) -> bool:
     """
     return accessible(dfa) and coaccessible(dfa)
 
+def trimmed(dfa: DFA) -> DFA:
+    """
+    Returns a new automaton recognizing the same language, from which the
+        useless states (not accessible or not coaccessible) have been removed.
+        The initial state is always kept. States keep their name and order.
+
+    :param dfa: the considered automaton.
+    :type dfa: DFA
+    :return: the trimmed automaton.
+    :rtype: DFA
+    """
+    useful = set(useful_states(dfa))
+    useful.add(dfa.init)
+    finals = set(dfa.finals)
+    states = [state for state in dfa.states if state in useful]
+
+    # Built in bulk with the classes of symbols of the automaton.
+    new_ids = [-1] * len(dfa.states)
+    for (i, state) in enumerate(states):
+        new_ids[dfa.state_ids[state]] = i
+    width = len(dfa.class_symbols)
+    table = array("l")
+    for state in states:
+        base = dfa.state_ids[state] * width
+        table.extend(-1 if dst < 0 else new_ids[dst] for dst in dfa.table[base:base + width])
+    return DFA.DFA.from_table(dfa.alphabet, states, table, dfa.init,
+                              [state for state in states if state in finals], dfa.class_symbols)
+
+def useful_states(dfa: DFA) -> List[str]:
+    """
+    Returns the list of the useful states (accessible and coaccessible) of the
+        specified automaton, in the order of `dfa.states`. The result is
+        cached until the automaton is modified (see `DFA.cached`).
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :return: the list of the useful states.
+    :rtype: List[str]
+    """
+    def compute() -> List[str]:
+        useful = set(accessible_states(dfa)).intersection(coaccessible_states(dfa))
+        return [state for state in dfa.states if state in useful]
+
+    return dfa.cached("useful_states", compute).copy()
+
+def strongly_connected_components(dfa: DFA) -> List[List[str]]:
+    """
+    Returns the strongly connected components of the transition graph of the
+        specified automaton, using Tarjan's algorithm (iterative). Components
+        are listed in reverse topological order: no transition leads from a
+        component to a previous one.
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :return: the list of the components.
+    :rtype: List[List[str]]
+    """
+    n = len(dfa.states)
+    k = len(dfa.class_symbols)
+    table = dfa.table
+    index = [-1] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        work = [(root, 0)] # Pairs (state, next class to explore).
+        while len(work) > 0:
+            (state, symbol) = work.pop()
+            if symbol == 0:
+                index[state] = lowlink[state] = counter
+                counter += 1
+                stack.append(state)
+                on_stack[state] = True
+            recurse = False
+            while symbol < k:
+                dst = table[state * k + symbol]
+                symbol += 1
+                if dst < 0:
+                    continue
+                if index[dst] < 0:
+                    work.append((state, symbol))
+                    work.append((dst, 0))
+                    recurse = True
+                    break
+                if on_stack[dst]:
+                    lowlink[state] = min(lowlink[state], index[dst])
+            if recurse:
+                continue
+            if lowlink[state] == index[state]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(dfa.states[member])
+                    if member == state:
+                        break
+                components.append(component)
+            if len(work) > 0:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[state])
+
+    return components
+
+def is_finite(dfa: DFA) -> bool:
+    """
+    Returns True if the language of the specified automaton is finite, i.e. if
+        no cycle goes through useful states. The test uses the strongly
+        connected components of the useful part of the automaton.
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :return: True if the language is finite, False otherwise.
+    :rtype: bool
+    """
+    useful = useful_states(dfa)
+    if len(useful) == 0:
+        return True
+    ret = trimmed(dfa)
+    for component in strongly_connected_components(ret):
+        if len(component) > 1:
+            return False
+        state = component[0]
+        if state in successors(ret, state):
+            return False
+    return True
+
 def negate(dfa: DFA) -> DFA:
     """ Negates the specfied automaton, which now recognizes the complementary
         language of the original DFA.
@@ -252,7 +455,7 @@ def negate(dfa: DFA) -> DFA:
     if not is_complete(dfa):
         print("error : negation requires a complete DFA.")
         return None
-    oldfinals = dfa.finals.copy()
+    oldfinals = set(dfa.finals)
     dfa.finals.clear()
 
     for state in dfa.states:
@@ -261,6 +464,23 @@ def negate(dfa: DFA) -> DFA:
 
     return dfa
 
+def negated(dfa: DFA) -> DFA:
+    """
+    Returns a copy of the specified complete automaton recognizing the
+        complementary language, the automaton is not modified (see `negate`).
+        The copy shares the states and transitions of the automaton (see
+        `DFA.clone`), only the final states differ.
+
+    :param dfa: the input automaton.
+    :type dfa: DFA
+    :return: the negated automaton, None if the DFA is not complete.
+    :rtype: DFA
+    """
+    if not is_complete(dfa):
+        print("error : negation requires a complete DFA.")
+        return None
+    return negate(dfa.clone())
+
 def product(dfa1: DFA, dfa2: DFA) -> DFA:
     """
     Returns a new automaton which is the product of the two specified DFAs.
@@ -274,50 +494,350 @@ def product(dfa1: DFA, dfa2: DFA) -> DFA:
     """
     
     
-    alphabet = set.union(set(list(dfa1.alphabet)), set(list(dfa2.alphabet)))
-    ret = DFA.DFA(alphabet)
+    alphabet = DFA.DFA(set.union(set(list(dfa1.alphabet)), set(list(dfa2.alphabet)))).alphabet
+    finals1 = set(dfa1.finals)
+    finals2 = set(dfa2.finals)
+
+    # The symbols are handled by equivalence classes (see
+    # `classes.symbol_class_ids`): the product has one column per class, the
+    # destination is computed once per class.
+    class_ids = classes.symbol_class_ids([dfa1, dfa2], alphabet)
+    k = len(class_ids)
+    symbols1 = [class_column(dfa1, alphabet[ids[0]]) for ids in class_ids]
+    symbols2 = [class_column(dfa2, alphabet[ids[0]]) for ids in class_ids]
+    k1 = len(dfa1.class_symbols)
+    k2 = len(dfa2.class_symbols)
+    table1 = dfa1.table
+    table2 = dfa2.table
+
+    states = []
+    finals = []
+    table = array("l")
+    missing = array("l", [-1]) * k # Row of a new state.
+    ids = {} # Maps each pair of state ids to the id of its superstate.
     to_visit = []
 
-    def get_superstate(state1: str, state2: str) -> str:
+    def get_superstate(id1: int, id2: int) -> int:
         """
          Returns the superstate corresponding to the specified states and add it
         to the product DFA if it doesn't exist.
 
-        :param state1: state in DFA1.
-        :type state1: str
-        :param state2: state in DFA2.
-        :type state2: str
-        :return: the corresponding superstate.
-        :rtype: str
+        :param id1: the id of the state in DFA1.
+        :type id1: int
+        :param id2: the id of the state in DFA2.
+        :type id2: int
+        :return: the id of the corresponding superstate.
+        :rtype: int
         """
-        sstate = "{" + state1 + "," + state2 + "}"
-
-        if sstate not in ret.states:
-            is_final = state1 in dfa1.finals and state2 in dfa2.finals
-            ret.add_state(sstate, is_final)
-            to_visit.append((sstate, state1, state2))
-
+        sstate = ids.get((id1, id2))
+        if sstate is None:
+            sstate = len(states)
+            ids[(id1, id2)] = sstate
+            (state1, state2) = (dfa1.states[id1], dfa2.states[id2])
+            states.append("{" + state1 + "," + state2 + "}")
+            if state1 in finals1 and state2 in finals2:
+                finals.append(states[-1])
+            table.extend(missing)
+            to_visit.append((sstate, id1, id2))
         return sstate
 
-    ret.init = get_superstate(dfa1.init, dfa2.init) # Add init state.
+    init = get_superstate(dfa1.state_ids[dfa1.init], dfa2.state_ids[dfa2.init]) # Add init state.
 
     while len(to_visit) > 0:
-        (sstate, state1, state2) = to_visit.pop()
+        (sstate, id1, id2) = to_visit.pop()
 
         # Add transitions.
-        for symbol in ret.alphabet:
-            dst_state1 = dfa1.dst_state(state1, symbol)
-            dst_state2 = dfa2.dst_state(state2, symbol)
-
-            if dst_state1 is None or dst_state2 is None:
+        base = sstate * k
+        for (column, (symbol1, symbol2)) in enumerate(zip(symbols1, symbols2)):
+            if symbol1 < 0 or symbol2 < 0:
+                continue
+            dst1 = table1[id1 * k1 + symbol1]
+            dst2 = table2[id2 * k2 + symbol2]
+            if dst1 < 0 or dst2 < 0:
                 continue
 
-            dst_sstate = get_superstate(dst_state1, dst_state2)
-
-            ret.add_transition(sstate, symbol, dst_sstate)
+            table[base + column] = get_superstate(dst1, dst2)
 
+    ret = DFA.DFA.from_table(alphabet, states, table, states[init], finals, class_ids)
+    if profiling.ENABLED:
+        profiling.count("product.pairs", len(ret.states))
+        profiling.count("product.transitions", len(ret.states) * len(class_ids))
     return ret
 
+def product_witness(dfa1: DFA, dfa2: DFA, goal: str = "intersection") -> str:
+    """
+    Explores the product of the two specified DFAs on demand, in breadth-first
+        order, and returns a shortest word satisfying the goal, or None if
+        there is no such word. The exploration stops at the first witness and
+        the product DFA is never built. Missing transitions (and symbols which
+        are not part of an alphabet) go to an implicit non-final sink state.
+        Pairs which cannot reach the goal are not explored: the components
+        which must reach a final state have to be coaccessible (see
+        `coaccessible_states`).
+
+    The goals are:
+         - `"intersection"`: a word accepted by both DFAs.
+         - `"difference"`: a word accepted by `dfa1` but not by `dfa2`.
+         - `"symmetric_difference"`: a word accepted by exactly one of the DFAs.
+
+    :param dfa1: the first operand of the product.
+    :type dfa1: DFA
+    :param dfa2: the second operand of the product.
+    :type dfa2: DFA
+    :param goal: the searched word, defaults to "intersection"
+    :type goal: str, optional
+    :return: a shortest witness word, None if there is none.
+    :rtype: str
+    """
+    if goal not in ("intersection", "difference", "symmetric_difference"):
+        print("error : unknown goal '" + str(goal) + "'.")
+        return None
+
+    # Ids of the coaccessible states, the sink (-1) is not coaccessible.
+    coaccessible1 = set(dfa1.state_ids[state] for state in coaccessible_states(dfa1))
+    coaccessible2 = set(dfa2.state_ids[state] for state in coaccessible_states(dfa2))
+    if goal == "intersection":
+        is_goal = lambda f1, f2: f1 and f2
+        is_alive = lambda s1, s2: s1 in coaccessible1 and s2 in coaccessible2
+    elif goal == "difference":
+        is_goal = lambda f1, f2: f1 and not f2
+        is_alive = lambda s1, s2: s1 in coaccessible1
+    else:
+        is_goal = lambda f1, f2: f1 != f2
+        is_alive = lambda s1, s2: s1 in coaccessible1 or s2 in coaccessible2
+
+    # One symbol per class (see `classes.symbol_class_ids`), the first one so
+    # that the witness is the same as with the whole alphabet.
+    alphabet = dfa1.alphabet + "".join(s for s in dfa2.alphabet if s not in dfa1.symbol_ids)
+    class_ids = classes.symbol_class_ids([dfa1, dfa2], alphabet)
+    alphabet = "".join(alphabet[ids[0]] for ids in class_ids)
+    symbols1 = [class_column(dfa1, s) for s in alphabet]
+    symbols2 = [class_column(dfa2, s) for s in alphabet]
+    k1 = len(dfa1.class_symbols)
+    k2 = len(dfa2.class_symbols)
+    table1 = dfa1.table
+    table2 = dfa2.table
+    finals1 = set(dfa1.state_ids[state] for state in dfa1.finals)
+    finals2 = set(dfa2.state_ids[state] for state in dfa2.finals)
+
+    init = (-1 if dfa1.init is None else dfa1.state_ids[dfa1.init],
+            -1 if dfa2.init is None else dfa2.state_ids[dfa2.init])
+    if not is_alive(*init):
+        return None
+    parent = {init: None} # Maps each visited pair to (previous pair, symbol).
+    to_visit = [init]
+
+    for pair in to_visit: # Grows while iterated: breadth-first order.
+        (state1, state2) = pair
+        if is_goal(state1 in finals1, state2 in finals2):
+            word = []
+            while parent[pair] is not None:
+                (pair, symbol) = parent[pair]
+                word.append(symbol)
+            return "".join(reversed(word))
+
+        for (symbol, symbol1, symbol2) in zip(alphabet, symbols1, symbols2):
+            dst1 = -1 if state1 < 0 or symbol1 < 0 else table1[state1 * k1 + symbol1]
+            dst2 = -1 if state2 < 0 or symbol2 < 0 else table2[state2 * k2 + symbol2]
+            dst = (dst1, dst2)
+            if dst not in parent and is_alive(dst1, dst2):
+                parent[dst] = (pair, symbol)
+                to_visit.append(dst)
+
+    return None
+
+def is_empty_intersection(dfa1: DFA, dfa2: DFA) -> bool:
+    """
+    Returns True if no word is accepted by both DFAs, without building their
+        product. See `product_witness` to get a common word.
+
+    :param dfa1: the first automaton.
+    :type dfa1: DFA
+    :param dfa2: the second automaton.
+    :type dfa2: DFA
+    :return: True if the intersection of the languages is empty, False otherwise.
+    :rtype: bool
+    """
+    return product_witness(dfa1, dfa2, "intersection") is None
+
+def is_included(dfa1: DFA, dfa2: DFA) -> bool:
+    """
+    Returns True if the language of `dfa1` is included in the language of
+        `dfa2`, without building their product. See `product_witness` to get
+        a counterexample.
+
+    :param dfa1: the automaton of the included language.
+    :type dfa1: DFA
+    :param dfa2: the automaton of the including language.
+    :type dfa2: DFA
+    :return: True if L(dfa1) is included in L(dfa2), False otherwise.
+    :rtype: bool
+    """
+    return product_witness(dfa1, dfa2, "difference") is None
+
+def equivalent(dfa1: DFA, dfa2: DFA) -> bool:
+    """
+    Returns True if the two DFAs recognize the same language. The test uses
+        the Hopcroft-Karp algorithm: the states of both DFAs are merged with a
+        union-find structure, in near-linear time, without building their
+        product nor minimizing them. Missing transitions (and symbols which
+        are not part of an alphabet) go to an implicit non-final sink state.
+
+    :param dfa1: the first automaton.
+    :type dfa1: DFA
+    :param dfa2: the second automaton.
+    :type dfa2: DFA
+    :return: True if the DFAs are equivalent, False otherwise.
+    :rtype: bool
+    """
+    alphabet = dfa1.alphabet + "".join(s for s in dfa2.alphabet if s not in dfa1.symbol_ids)
+    n1 = len(dfa1.states)
+    sink = n1 + len(dfa2.states) # Shared by both automata.
+
+    # Successors in the disjoint union of both automata, for each class of
+    # symbols (see `classes.symbol_class_ids`).
+    moves = []
+    for ids in classes.symbol_class_ids([dfa1, dfa2], alphabet):
+        column1 = class_column(dfa1, alphabet[ids[0]])
+        column2 = class_column(dfa2, alphabet[ids[0]])
+        row = [sink] * (sink + 1)
+        if column1 >= 0:
+            for (state, dst) in enumerate(dfa1.table[column1::len(dfa1.class_symbols)]):
+                if dst >= 0:
+                    row[state] = dst
+        if column2 >= 0:
+            for (state, dst) in enumerate(dfa2.table[column2::len(dfa2.class_symbols)]):
+                if dst >= 0:
+                    row[n1 + state] = n1 + dst
+        moves.append(row)
+
+    is_final = [False] * (sink + 1)
+    for state in dfa1.finals:
+        is_final[dfa1.state_ids[state]] = True
+    for state in dfa2.finals:
+        is_final[n1 + dfa2.state_ids[state]] = True
+
+    init1 = sink if dfa1.init is None else dfa1.state_ids[dfa1.init]
+    init2 = sink if dfa2.init is None else n1 + dfa2.state_ids[dfa2.init]
+
+    parent = list(range(sink + 1))
+    size = [1] * (sink + 1)
+
+    def find(state: int) -> int:
+        """
+        Returns the representative of the class of the specified state.
+
+        :param state: the state id.
+        :type state: int
+        :return: the id of the representative.
+        :rtype: int
+        """
+        while parent[state] != state:
+            parent[state] = parent[parent[state]]
+            state = parent[state]
+        return state
+
+    def union(state1: int, state2: int) -> bool:
+        """
+        Merges the classes of the two states, returns False if they were already
+            merged.
+
+        :param state1: the first state id.
+        :type state1: int
+        :param state2: the second state id.
+        :type state2: int
+        :return: True if the classes have been merged, False otherwise.
+        :rtype: bool
+        """
+        root1 = find(state1)
+        root2 = find(state2)
+        if root1 == root2:
+            return False
+        if size[root1] < size[root2]:
+            root1, root2 = root2, root1
+        parent[root2] = root1
+        size[root1] += size[root2]
+        return True
+
+    union(init1, init2)
+    to_visit = [(init1, init2)]
+    while len(to_visit) > 0:
+        (state1, state2) = to_visit.pop()
+        if is_final[state1] != is_final[state2]:
+            return False
+        for row in moves:
+            dst1 = row[state1]
+            dst2 = row[state2]
+            if union(dst1, dst2):
+                to_visit.append((dst1, dst2))
+
+    return True
+
+def distinguishing_word(dfa1: DFA, dfa2: DFA) -> str:
+    """
+    Returns a shortest word accepted by exactly one of the two DFAs, or None if
+        they are equivalent. Equivalence is first decided with `equivalent`,
+        the word is then searched with `product_witness`.
+
+    :param dfa1: the first automaton.
+    :type dfa1: DFA
+    :param dfa2: the second automaton.
+    :type dfa2: DFA
+    :return: a shortest distinguishing word, None if the DFAs are equivalent.
+    :rtype: str
+    """
+    if equivalent(dfa1, dfa2):
+        return None
+    return product_witness(dfa1, dfa2, "symmetric_difference")
+
+def canonical_form(dfa: DFA) -> Tuple[str, List[bool], List[int]]:
+    """
+    Returns the canonical form of the accessible part of the specified
+        automaton: its states are numbered in breadth-first order from the
+        initial state (0), following the symbols in sorted order. Two
+        minimal DFAs over the same alphabet recognize the same language if
+        and only if their canonical forms are equal.
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :return: the tuple (sorted alphabet, finality of each state, flat table of
+            the destination numbers, -1 for missing transitions).
+    :rtype: Tuple[str, List[bool], List[int]]
+    """
+    alphabet = "".join(sorted(dfa.alphabet))
+    if dfa.init is None:
+        return (alphabet, [], [])
+    symbol_ids = [dfa.class_ids[dfa.symbol_ids[symbol]] for symbol in alphabet]
+    k = len(dfa.class_symbols)
+    finals = set(dfa.state_ids[state] for state in dfa.finals)
+
+    number = {dfa.state_ids[dfa.init]: 0}
+    order = [dfa.state_ids[dfa.init]]
+    table = []
+    for state in order: # Grows while iterated: breadth-first order.
+        for symbol_id in symbol_ids:
+            dst = dfa.table[state * k + symbol_id]
+            if dst >= 0 and dst not in number:
+                number[dst] = len(order)
+                order.append(dst)
+            table.append(-1 if dst < 0 else number[dst])
+
+    return (alphabet, [state in finals for state in order], table)
+
+def canonical_hash(dfa: DFA) -> str:
+    """
+    Returns a stable hash (SHA-256, hexadecimal) of the canonical form of the
+        specified automaton. It does not depend on the state names nor on the
+        order of the states or symbols. On minimal DFAs, equal hashes mean
+        equal languages.
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :return: the hash of the canonical form.
+    :rtype: str
+    """
+    return hashlib.sha256(json.dumps(canonical_form(dfa)).encode("utf-8")).hexdigest()
+
 def distinguish(dfa: DFA, partitions: List[List[str]], partition: List[str]) -> List[List[str]]:
     """
     Try to distinguish a state partition, returning the new partition generated by the step.
@@ -332,6 +852,7 @@ def distinguish(dfa: DFA, partitions: List[List[str]], partition: List[str]) ->
     :rtype: List[List[str]]
     """
     new_partitions = dict()
+    partition_ids = {state: id for (id, part) in enumerate(partitions) for state in part}
 
     def partition_index(state: str) -> int:
         """
@@ -342,12 +863,7 @@ def distinguish(dfa: DFA, partitions: List[List[str]], partition: List[str]) ->
         :return: the index of the partition of the state
         :rtype: int
         """
-        id = 0
-        for partition in partitions:
-            if state in partition:
-                return id
-            id = id + 1
-        return -1        
+        return partition_ids.get(state, -1)
 
     def dst_partition(state: str, symbol: str) -> int:
         """
@@ -363,9 +879,12 @@ def distinguish(dfa: DFA, partitions: List[List[str]], partition: List[str]) ->
         dst = dfa.dst_state(state, symbol)
         return partition_index(dst)
     
+    # Equivalent symbols (see `classes.symbol_class_ids`) give the same
+    # colors, one symbol per class is enough.
+    symbols = [dfa.alphabet[ids[0]] for ids in classes.symbol_class_ids([dfa], dfa.alphabet)]
     for state in partition:
         coloration = []
-        for symbol in dfa.alphabet:
+        for symbol in symbols:
             pid = dst_partition(state, symbol)
             coloration.append(pid)
         
@@ -375,49 +894,150 @@ def distinguish(dfa: DFA, partitions: List[List[str]], partition: List[str]) ->
         else:
             new_partitions[coloration] = [state]
 
+    if profiling.ENABLED: profiling.count("distinguish.transitions", len(partition) * len(symbols))
     return list(new_partitions.values())
 
+def refine_partition(inverse: List[List[List[int]]], blocks: List[List[int]]) -> Tuple[List[int], int]:
+    """
+    Refines a partition of states with Hopcroft's algorithm, in
+        O(k.n.log(n)) for n states and k symbols: returns the coarsest
+        partition finer than the specified one in which the states of a block
+        go to the same block on each symbol.
+
+    :param inverse: the inverse transitions, `inverse[c][q]` lists the states
+            reaching q with the symbol c. States without transition on a
+            symbol must be alone in their initial block.
+    :type inverse: List[List[List[int]]]
+    :param blocks: the initial partition of the states 0, ..., n - 1, without
+            empty blocks.
+    :type blocks: List[List[int]]
+    :return: the block of each state, the initial blocks keep their index,
+            and the number of splitters processed.
+    :rtype: Tuple[List[int], int]
+    """
+    # Refinable partition: the states of a block b are stored contiguously in
+    # elements[first[b]:end[b]], and the marked ones are in elements[first[b]:mid[b]].
+    elements = [state for block in blocks for state in block]
+    location = [0] * len(elements)
+    for (i, state) in enumerate(elements):
+        location[state] = i
+    block_of = [0] * len(elements)
+    first = []
+    end = []
+    for block in blocks:
+        low = end[-1] if len(end) > 0 else 0
+        for state in block:
+            block_of[state] = len(first)
+        first.append(low)
+        end.append(low + len(block))
+    mid = first.copy()
+
+    # Worklist of splitter blocks. All blocks but the largest one are needed.
+    largest = max(range(len(first)), key=lambda b: end[b] - first[b], default=0)
+    waiting = [b for b in range(len(first)) if b != largest]
+    in_waiting = [b != largest for b in range(len(first))]
+    rounds = 0 # Number of splitters processed.
+    while len(waiting) > 0:
+        splitter = waiting.pop()
+        in_waiting[splitter] = False
+        rounds += 1
+        splitter_states = elements[first[splitter]:end[splitter]]
+
+        for inverse_symbol in inverse:
+            # Mark the predecessors of the splitter.
+            touched = []
+            for state in splitter_states:
+                for pred in inverse_symbol[state]:
+                    b = block_of[pred]
+                    i = location[pred]
+                    j = mid[b]
+                    if i < j:
+                        continue # Already marked.
+                    if j == first[b]:
+                        touched.append(b)
+                    other = elements[j]
+                    elements[i] = other
+                    location[other] = i
+                    elements[j] = pred
+                    location[pred] = j
+                    mid[b] = j + 1
+
+            # Split the touched blocks between marked and unmarked states.
+            for b in touched:
+                if mid[b] == end[b]:
+                    mid[b] = first[b]
+                    continue
+                new_block = len(first)
+                first.append(first[b])
+                end.append(mid[b])
+                mid.append(first[b])
+                first[b] = mid[b]
+                mid[b] = first[b]
+                for i in range(first[new_block], end[new_block]):
+                    block_of[elements[i]] = new_block
+                if in_waiting[b] or end[new_block] - first[new_block] <= end[b] - first[b]:
+                    waiting.append(new_block)
+                    in_waiting.append(True)
+                else:
+                    waiting.append(b)
+                    in_waiting[b] = True
+                    in_waiting.append(False)
+    return (block_of, rounds)
+
 def equivalent_states(dfa: DFA) -> List[List[str]]:
     """
-     Returns a list containing each group of equivalent states.
+     Returns a list containing each group of equivalent states. Missing
+        transitions are considered as going to an implicit sink state which
+        is not equivalent to any state of the automaton.
+
+     The groups are computed with Hopcroft's partition refinement algorithm
+        (see `refine_partition`), in O(k.n.log(n)) for n states and k classes
+        of equivalent symbols. Groups are ordered by their first state, and
+        states inside a group follow the order of `dfa.states`.
 
     :param dfa: the DFA to search for equivalent states.
     :type dfa: DFA
     :return: a list of equivalent states lists.
     :rtype: List[List[str]]
     """
-
-    # Spread finals and non-final states.
-    partitions : List[List[str]] = [[], []]
-    for state in dfa.states:
-        if state in dfa.finals:
-            partitions[0].append(state)
-        else:
-            partitions[1].append(state)
-
-    changes = True # Determines if a change occured between two generations.
-
-    step_counter = 0
-    while changes:
-        #print(f"step {step_counter}")
-
-        n_p = []
-        for part in partitions:
-            part_d = distinguish(dfa, partitions, part)
-            #print(f"part = [{','.join(part)}] n_p: [{','.join(list(itertools.chain.from_iterable(part_d)))}]")
-            n_p.extend(part_d)
-        
-        if len(n_p) == len(partitions):
-            changes = False
-
-        partitions = n_p 
-        #print(f"ended step {step_counter} : \n")
-        #for part in partitions:
-            #print(f"   - {part}")
-
-        step_counter = step_counter + 1
-
-    return partitions
+    n = len(dfa.states)
+    sink = n # Implicit sink state, alone in its own block.
+
+    # Inverse transitions: inverse[c][q] = states reaching q with the symbols
+    # of the class c. Equivalent symbols (see `classes.symbol_class_ids`)
+    # split the same blocks, so one symbol per class is enough.
+    with profiling.phase("equivalent_states.inverse"):
+        columns = [dfa.class_ids[ids[0]] for ids in classes.symbol_class_ids([dfa], dfa.alphabet)]
+        k = len(columns)
+        inverse = [[[] for _ in range(n + 1)] for _ in range(k)]
+        for (c, column) in enumerate(columns):
+            inverse_symbol = inverse[c]
+            for (src, dst) in enumerate(dfa.table[column::len(dfa.class_symbols)]):
+                inverse_symbol[sink if dst < 0 else dst].append(src)
+            inverse_symbol[sink].append(sink)
+
+    finals = [dfa.state_ids[state] for state in dfa.finals]
+    is_final = [False] * n
+    for state in finals:
+        is_final[state] = True
+    blocks = [finals, [state for state in range(n) if not is_final[state]], [sink]]
+    blocks = [block for block in blocks if len(block) > 0]
+    with profiling.phase("equivalent_states.refine"):
+        (block_of, rounds) = refine_partition(inverse, blocks)
+
+    if profiling.ENABLED:
+        profiling.count("equivalent_states.rounds", rounds)
+        profiling.count("equivalent_states.splits", max(block_of) + 1 - len(blocks))
+
+    # Collect the groups, dropping the block of the sink.
+    groups = {}
+    for (i, state) in enumerate(dfa.states):
+        b = block_of[i]
+        if b not in groups:
+            groups[b] = []
+        groups[b].append(state)
+
+    return list(groups.values())
 
 def minimize(dfa: DFA) -> DFA:
     """
@@ -430,10 +1050,37 @@ def minimize(dfa: DFA) -> DFA:
     """
 
     if len(dfa.states) < 2:
-        return copy.deepcopy(dfa) # sure ? 
+        return dfa.clone()
     
-    ret = DFA.DFA(dfa.alphabet)
-    eq_states = equivalent_states(dfa)
+    with profiling.phase("minimize.partition"):
+        eq_states = equivalent_states(dfa)
+    with profiling.phase("minimize.build"):
+        ret = quotient(dfa, eq_states)
+
+    if profiling.ENABLED:
+        profiling.count("minimize.groups", len(eq_states))
+        profiling.count("minimize.states", len(ret.states))
+    return ret
+
+def quotient(dfa: DFA, eq_states: List[List[str]]) -> DFA:
+    """
+    Returns the automaton whose states are the groups of equivalent states
+        accessible from the initial state, named after their members, for
+        instance "{q1,q3}" (see `minimize`).
+
+    :param dfa: the automaton.
+    :type dfa: DFA
+    :param eq_states: the groups of equivalent states of the automaton (see
+            `equivalent_states`), covering all its states.
+    :type eq_states: List[List[str]]
+    :return: the quotient automaton.
+    :rtype: DFA
+    """
+    finals = set(dfa.finals)
+    groups = {}
+    for state_group in eq_states:
+        for state in state_group:
+            groups[state] = state_group
 
     def group_of(state: str) -> List[str]:
         """
@@ -444,50 +1091,185 @@ def minimize(dfa: DFA) -> DFA:
         :return: the corresponding state group.
         :rtype: List[str]
         """
-        for state_group in eq_states:
-            if state in state_group:
-                return state_group
-        return None
-
+        return groups.get(state)
+
+    # The minimal automaton is built in bulk (see `DFA.from_table`), with one
+    # column per class of equivalent symbols (see `classes.symbol_class_ids`).
+    class_ids = classes.symbol_class_ids([dfa], dfa.alphabet)
+    columns = [dfa.class_ids[ids[0]] for ids in class_ids]
+    k = len(class_ids)
+    states = []
+    ret_finals = []
+    table = array("l")
+    missing = array("l", [-1]) * k # Row of a new state.
+    ids = {} # Maps the id() of each group to the id of its superstate.
     to_visit = [] # List of pair (super_state, state_group)
 
-    def get_superstate(state_group: List[str]) -> str:
+    def get_superstate(state_group: List[str]) -> int:
         """
         Returns the superstate corresponding to the specified state_group.
         If the superstate doesn't exists in the ret DFA, add it and add the pair (super_state, state_group) to the list of pair to visit.
 
         :param state_group: the group of state (partition) to be merged in a superstate.
         :type state_group: List[str]
-        :return: the superstate corresponding to the partition.
-        :rtype: str
+        :return: the id of the superstate corresponding to the partition.
+        :rtype: int
         """
-        sstate = "{" + ",".join(state_group) + "}"
+        # Each group is a single list, so its name is only built once.
+        if id(state_group) not in ids:
+            sstate = "{" + ",".join(state_group) + "}"
+            ids[id(state_group)] = len(states)
+            states.append(sstate)
+            if state_group[0] in finals: # If one is final, all are final.
+                ret_finals.append(sstate)
+            table.extend(missing)
+            to_visit.append((ids[id(state_group)], state_group)) # remember relation
 
-        if sstate not in ret.states:
-            is_final =  state_group[0] in dfa.finals # If one is final, all are final.
-            ret.add_state(sstate, is_final)
-            to_visit.append((sstate, state_group)) # remember relation
+        return ids[id(state_group)]
 
-        return sstate
-    
 
     # Construct minimal automaton
-    ret.init = get_superstate(group_of(dfa.init)) # Add init state.
+    init = get_superstate(group_of(dfa.init)) # Add init state.
 
     while len(to_visit) > 0:
-        #print("constructing: " + str(ret))
         (sstate, sg) = to_visit.pop()
 
-        # Add transitions.
-        for state in sg:
-            for symbol in ret.alphabet:
-                dst_state = dfa.dst_state(state, symbol)
+        # Add transitions. All states of the group are equivalent, so the
+        # transitions of the first one are enough.
+        src = dfa.state_ids[sg[0]] * len(dfa.class_symbols)
+        base = sstate * k
+        for (i, column) in enumerate(columns):
+            dst = dfa.table[src + column]
 
-                if dst_state is None:
-                    continue
+            if dst < 0:
+                continue
 
-                dst_sstate = get_superstate(group_of(dst_state))
+            table[base + i] = get_superstate(group_of(dfa.states[dst]))
 
-                ret.add_transition(sstate, symbol, dst_sstate)
+    return DFA.DFA.from_table(dfa.alphabet, states, table, states[init], ret_finals, class_ids)
+
+def epsilon_closures(fa: FA) -> List[int]:
+    """
+    Returns the epsilon closure of each state of the specified automaton. A
+        closure is represented as a bitmask in which the bit i is set if the
+        i-th state of `fa.states` is part of the closure.
+
+    :param fa: the considered automaton.
+    :type fa: FA
+    :return: the list of the closures, in the order of `fa.states`.
+    :rtype: List[int]
+    """
+    ids = {state: i for (i, state) in enumerate(fa.states)}
+    closures = []
+    for state in fa.states:
+        closure = 1 << ids[state]
+        to_visit = [state]
+        while len(to_visit) > 0:
+            src = to_visit.pop()
+            for (symbol, dst) in fa.transitions[src]:
+                bit = 1 << ids[dst]
+                if symbol == FA.EPSILON and not closure & bit:
+                    closure |= bit
+                    to_visit.append(dst)
+        closures.append(closure)
+    return closures
+
+def subset_moves(fa: FA, symbol_ids: dict, closures: List[int]) -> List[List[int]]:
+    """
+    Returns, for each state q and symbol a of the specified automaton, the
+        bitmask of the closure of the states reached from q with a. The moves
+        of a subset of states are the union of the moves of its states.
+
+    :param fa: the considered automaton.
+    :type fa: FA
+    :param symbol_ids: maps each symbol (except epsilon) to its index.
+    :type symbol_ids: dict
+    :param closures: the epsilon closures (see `epsilon_closures`).
+    :type closures: List[int]
+    :return: the moves, indexed by state id and symbol id.
+    :rtype: List[List[int]]
+    """
+    ids = {state: i for (i, state) in enumerate(fa.states)}
+    moves = [[0] * len(symbol_ids) for _ in fa.states]
+    for state in fa.states:
+        row = moves[ids[state]]
+        for (symbol, dst) in fa.transitions[state]:
+            if symbol != FA.EPSILON:
+                row[symbol_ids[symbol]] |= closures[ids[dst]]
+    return moves
+
+def determinize(fa: FA, max_states: int = None) -> DFA:
+    """
+    Returns a DFA recognizing the same language as the specified finite
+        automaton (with epsilon transitions), using the subset construction.
+        Only the subsets reachable from the initial state are built. Each state
+        of the DFA is named after its subset of states, e.g. "{q0,q2}", and the
+        empty subset is never built (the DFA is not necessarily complete).
+
+    :param fa: the automaton to determinize.
+    :type fa: FA
+    :param max_states: the maximal number of states of the DFA, defaults to
+            None (no limit).
+    :type max_states: int, optional
+    :return: the DFA, None if the limit has been reached.
+    :rtype: DFA
+    """
+    if fa.init is None:
+        print("error : the automaton does not have any initial state.")
+        return None
+
+    ids = {state: i for (i, state) in enumerate(fa.states)}
+    ret = DFA.DFA(s for s in fa.alphabet if s != FA.EPSILON)
+    closures = epsilon_closures(fa)
+    moves = subset_moves(fa, ret.symbol_ids, closures)
+
+    finals = 0
+    for state in fa.finals:
+        finals |= 1 << ids[state]
+
+    subsets = {} # Maps each discovered subset to its state in the DFA.
+    to_visit = []
+
+    def get_superstate(subset: int) -> str:
+        """
+        Returns the superstate corresponding to the specified subset and add
+            it to the DFA if it doesn't exist.
+
+        :param subset: the bitmask of the subset of states.
+        :type subset: int
+        :return: the corresponding superstate, None if the limit is reached.
+        :rtype: str
+        """
+        sstate = subsets.get(subset)
+        if sstate is None:
+            if max_states is not None and len(subsets) >= max_states:
+                return None
+            members = []
+            rest = subset
+            while rest:
+                low = rest & -rest
+                members.append(low.bit_length() - 1)
+                rest ^= low
+            sstate = "{" + ",".join(fa.states[i] for i in members) + "}"
+            subsets[subset] = sstate
+            ret.add_state(sstate, subset & finals != 0)
+            to_visit.append((sstate, members))
+        return sstate
+
+    ret.init = get_superstate(closures[ids[fa.init]])
+
+    while len(to_visit) > 0:
+        (sstate, members) = to_visit.pop()
+        for (symbol_id, symbol) in enumerate(ret.alphabet):
+            dst = 0
+            for i in members:
+                dst |= moves[i][symbol_id]
+            if dst == 0:
+                continue
+            dst_sstate = get_superstate(dst)
+            if dst_sstate is None:
+                print("error : the determinized automaton exceeds " + str(max_states) + " states.")
+                return None
+            ret.add_transition(sstate, symbol, dst_sstate)
 
     return ret
@@ -0,0 +1,11 @@
+"""
+Benchmarks of the library: generators of synthetic automata
+    (`bench.generators`) and timed size sweeps with a fit of the growth
+    exponent, JSON reports and comparison with a baseline (`bench.suite`).
+
+Run from the `src` directory:
+
+    python -m bench --output results.json
+    python -m bench --baseline results.json --benchmarks minimize product
+    python -m bench --sizes 200 400 800 --exponential-sizes 8 10 12
+"""
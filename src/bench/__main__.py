@@ -0,0 +1,37 @@
+from bench import suite
+import argparse
+import sys
+
+parser = argparse.ArgumentParser(prog="python -m bench",
+                                 description="Times the algorithms of the library on synthetic automata.")
+parser.add_argument("--benchmarks", nargs="+", choices=list(suite.BENCHMARKS), default=None,
+                    help="the benchmarks to run, defaults to all of them.")
+parser.add_argument("--sizes", nargs="+", type=int, default=None,
+                    help="the sizes of the sweep of the polynomial benchmarks, defaults to the ones of "
+                         "each benchmark.")
+parser.add_argument("--exponential-sizes", nargs="+", type=int, default=None,
+                    help="the sizes of the sweep of the exponential benchmarks, such as determinize_worst, "
+                         "defaults to the ones of each benchmark.")
+parser.add_argument("--alphabet", default="ab", help="the alphabet of the automata.")
+parser.add_argument("--repeat", type=int, default=3, help="the number of calls for each size.")
+parser.add_argument("--seed", type=int, default=0, help="the seed of the generators.")
+parser.add_argument("--output", default=None, help="the JSON file in which the results are saved.")
+parser.add_argument("--baseline", default=None, help="a JSON file of results to compare with.")
+parser.add_argument("--exponent-tolerance", type=float, default=0.3,
+                    help="the accepted increase of the growth exponents.")
+parser.add_argument("--time-tolerance", type=float, default=2.0,
+                    help="the accepted slowdown factor.")
+args = parser.parse_args()
+
+results = suite.run_suite(args.benchmarks, args.sizes, args.alphabet, args.repeat, args.seed,
+                          args.exponential_sizes)
+print(suite.report(results))
+if args.output is not None:
+    suite.save_results(results, args.output)
+if args.baseline is not None:
+    regressions = suite.compare(results, suite.load_results(args.baseline),
+                                args.exponent_tolerance, args.time_tolerance)
+    for regression in regressions:
+        print("regression : " + regression)
+    if len(regressions) > 0:
+        sys.exit(1)
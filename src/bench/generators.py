@@ -0,0 +1,161 @@
+import DFA
+import FA
+import random
+
+def random_dfa(n: int, alphabet: str = "ab", density: float = 1.0, final_ratio: float = 0.3,
+               seed: int = 0) -> DFA:
+    """
+    Returns a random DFA with n states named "0", "1"... The initial state is
+        "0", each state is final with probability `final_ratio` and each
+        transition exists with probability `density`, towards a uniformly
+        chosen state.
+
+    :param n: the number of states.
+    :type n: int
+    :param alphabet: the alphabet of the automaton, defaults to "ab"
+    :type alphabet: str, optional
+    :param density: the probability of each transition, defaults to 1.0
+    :type density: float, optional
+    :param final_ratio: the probability of each state being final,
+            defaults to 0.3
+    :type final_ratio: float, optional
+    :param seed: the seed of the random generator, defaults to 0
+    :type seed: int, optional
+    :return: the random automaton.
+    :rtype: DFA
+    """
+    r = random.Random(seed)
+    states = [str(i) for i in range(n)]
+    table = [r.randrange(n) if r.random() < density else -1
+             for _ in range(n * len(alphabet))]
+    finals = [state for state in states if r.random() < final_ratio]
+    return DFA.DFA.from_table(alphabet, states, table, states[0] if n > 0 else None, finals)
+
+def chain_dfa(n: int, alphabet: str = "ab") -> DFA:
+    """
+    Returns a DFA whose n states form a chain: the state i goes to i+1 on
+        every symbol, the last state is the only final state. It accepts the
+        words of length n-1. It is minimal and as deep as possible, which is
+        the worst case of the algorithms refining or exploring level by
+        level.
+
+    :param n: the number of states.
+    :type n: int
+    :param alphabet: the alphabet of the automaton, defaults to "ab"
+    :type alphabet: str, optional
+    :return: the chain automaton.
+    :rtype: DFA
+    """
+    states = [str(i) for i in range(n)]
+    table = [i + 1 if i + 1 < n else -1 for i in range(n) for _ in alphabet]
+    return DFA.DFA.from_table(alphabet, states, table, states[0] if n > 0 else None,
+                              states[-1:])
+
+def random_fa(n: int, alphabet: str = "ab", fanout: int = 2, epsilon_ratio: float = 0.05,
+              final_ratio: float = 0.3, seed: int = 0) -> FA:
+    """
+    Returns a random non deterministic automaton with n states named "0",
+        "1"... The initial state is "0", each state has between 1 and
+        `fanout` successors on each symbol, uniformly chosen, and an epsilon
+        transition with probability `epsilon_ratio`. The subset construction
+        of such automata usually blows up, see `suffix_fa` for a tractable
+        non deterministic input.
+
+    :param n: the number of states.
+    :type n: int
+    :param alphabet: the alphabet of the automaton, defaults to "ab"
+    :type alphabet: str, optional
+    :param fanout: the maximal number of successors per state and symbol,
+            defaults to 2
+    :type fanout: int, optional
+    :param epsilon_ratio: the probability of each state having an epsilon
+            transition, defaults to 0.05
+    :type epsilon_ratio: float, optional
+    :param final_ratio: the probability of each state being final,
+            defaults to 0.3
+    :type final_ratio: float, optional
+    :param seed: the seed of the random generator, defaults to 0
+    :type seed: int, optional
+    :return: the random automaton.
+    :rtype: FA
+    """
+    r = random.Random(seed)
+    ret = FA.FA(alphabet)
+    for i in range(n):
+        ret.add_state(str(i), r.random() < final_ratio)
+    ret.init = "0" if n > 0 else None
+    for i in range(n):
+        for symbol in alphabet:
+            for dst in set(r.randrange(n) for _ in range(r.randint(1, fanout))):
+                ret.add_transition(str(i), symbol, str(dst))
+        if r.random() < epsilon_ratio:
+            ret.add_transition(str(i), FA.EPSILON, str(r.randrange(n)))
+    return ret
+
+def suffix_fa(n: int, alphabet: str = "ab", seed: int = 0) -> FA:
+    """
+    Returns the non deterministic automaton with n+1 states recognizing the
+        words ending with a random word of length n, as used to search a
+        pattern in a text. Its subsets have up to n+1 states but its
+        determinization only has n+1 states (the automaton of
+        Knuth-Morris-Pratt).
+
+    :param n: the length of the searched word.
+    :type n: int
+    :param alphabet: the alphabet of the automaton, defaults to "ab"
+    :type alphabet: str, optional
+    :param seed: the seed of the random generator, defaults to 0
+    :type seed: int, optional
+    :return: the automaton.
+    :rtype: FA
+    """
+    word = random_word(n, alphabet, seed)
+    ret = FA.FA(alphabet)
+    for i in range(n + 1):
+        ret.add_state(str(i), i == n)
+    ret.init = "0"
+    for symbol in alphabet:
+        ret.add_transition("0", symbol, "0")
+    for (i, symbol) in enumerate(word):
+        ret.add_transition(str(i), symbol, str(i + 1))
+    return ret
+
+def nth_from_last_fa(n: int, alphabet: str = "ab") -> FA:
+    """
+    Returns the non deterministic automaton with n+1 states recognizing the
+        words whose n-th symbol from the end is the first symbol of the
+        alphabet. It is the classic worst case of the subset construction:
+        its minimal DFA has 2^n states.
+
+    :param n: the position of the symbol from the end.
+    :type n: int
+    :param alphabet: the alphabet of the automaton, defaults to "ab"
+    :type alphabet: str, optional
+    :return: the automaton.
+    :rtype: FA
+    """
+    ret = FA.FA(alphabet)
+    for i in range(n + 1):
+        ret.add_state(str(i), i == n)
+    ret.init = "0"
+    for symbol in alphabet:
+        ret.add_transition("0", symbol, "0")
+    ret.add_transition("0", alphabet[0], "1")
+    for i in range(1, n):
+        for symbol in alphabet:
+            ret.add_transition(str(i), symbol, str(i + 1))
+    return ret
+
+def random_word(n: int, alphabet: str = "ab", seed: int = 0) -> str:
+    """
+    :param n: the length of the word.
+    :type n: int
+    :param alphabet: the alphabet of the word, defaults to "ab"
+    :type alphabet: str, optional
+    :param seed: the seed of the random generator, defaults to 0
+    :type seed: int, optional
+    :return: a random word of length n over the alphabet.
+    :rtype: str
+    """
+    r = random.Random(seed)
+    return "".join(r.choice(alphabet) for _ in range(n))
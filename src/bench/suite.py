@@ -0,0 +1,304 @@
+import algorithms
+import util
+from bench import generators
+import json
+import math
+import os
+import platform
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+def bench_run(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.run` on a complete random DFA of 1000 states, n is the
+        length of the word."""
+    dfa = generators.random_dfa(1000, alphabet, seed=seed)
+    word = generators.random_word(n, alphabet, seed)
+    return lambda : algorithms.run(dfa, word)
+
+def bench_minimize(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.minimize` on a complete random DFA of n states."""
+    dfa = generators.random_dfa(n, alphabet, seed=seed)
+    return lambda : algorithms.minimize(dfa)
+
+def bench_minimize_chain(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.minimize` on the chain DFA of n states."""
+    dfa = generators.chain_dfa(n, alphabet)
+    return lambda : algorithms.minimize(dfa)
+
+def bench_equivalent_states(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.equivalent_states` on a complete random DFA of n
+        states."""
+    dfa = generators.random_dfa(n, alphabet, seed=seed)
+    return lambda : algorithms.equivalent_states(dfa)
+
+def bench_product(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.product` of two complete random DFAs of sqrt(n) states,
+        n is the size of the product."""
+    size = max(1, math.isqrt(n))
+    dfa1 = generators.random_dfa(size, alphabet, seed=seed)
+    dfa2 = generators.random_dfa(size, alphabet, seed=seed + 1)
+    return lambda : algorithms.product(dfa1, dfa2)
+
+def bench_accessible_states(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.accessible_states` on a random DFA of n states, the
+        cache of the DFA is emptied before each call."""
+    dfa = generators.random_dfa(n, alphabet, density=0.8, seed=seed)
+    def function():
+        dfa.cache = {}
+        return algorithms.accessible_states(dfa)
+    return function
+
+def bench_coaccessible_states(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.coaccessible_states` on a random DFA of n states, the
+        cache of the DFA is emptied before each call."""
+    dfa = generators.random_dfa(n, alphabet, density=0.8, seed=seed)
+    def function():
+        dfa.cache = {}
+        return algorithms.coaccessible_states(dfa)
+    return function
+
+def bench_save(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `util.save` of a complete random DFA of n states."""
+    dfa = generators.random_dfa(n, alphabet, seed=seed)
+    directory = tempfile.TemporaryDirectory()
+    filename = os.path.join(directory.name, "bench.dfa")
+    def function():
+        directory # Keeps the directory alive as long as the function.
+        return util.save(dfa, filename)
+    return function
+
+def bench_read(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `util.read` of a complete random DFA of n states in text format."""
+    directory = tempfile.TemporaryDirectory()
+    filename = os.path.join(directory.name, "bench.dfa")
+    util.save(generators.random_dfa(n, alphabet, seed=seed), filename)
+    def function():
+        directory # Keeps the directory alive as long as the function.
+        return util.read(filename)
+    return function
+
+def bench_to_dot(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `util.to_dot` of a complete random DFA of n states."""
+    dfa = generators.random_dfa(n, alphabet, seed=seed)
+    return lambda : util.to_dot(dfa)
+
+def bench_determinize(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.determinize` of the FA searching a random word of length
+        n (see `generators.suffix_fa`)."""
+    fa = generators.suffix_fa(n, alphabet, seed)
+    return lambda : algorithms.determinize(fa)
+
+def bench_determinize_worst(n: int, alphabet: str, seed: int) -> Callable[[], Any]:
+    """ `algorithms.determinize` of the FA recognizing the words whose n-th
+        symbol from the end is the first one (2^n states once
+        determinized)."""
+    fa = generators.nth_from_last_fa(n, alphabet)
+    return lambda : algorithms.determinize(fa)
+
+BENCHMARKS : Dict[str, Tuple[Callable[[int, str, int], Callable[[], Any]], List[int]]] = {
+    "run": (bench_run, [10000, 20000, 40000, 80000, 160000]),
+    "minimize": (bench_minimize, [1000, 2000, 4000, 8000, 16000]),
+    "minimize_chain": (bench_minimize_chain, [1000, 2000, 4000, 8000, 16000]),
+    "equivalent_states": (bench_equivalent_states, [1000, 2000, 4000, 8000, 16000]),
+    "product": (bench_product, [1000, 2000, 4000, 8000, 16000]),
+    "accessible_states": (bench_accessible_states, [1000, 2000, 4000, 8000, 16000]),
+    "coaccessible_states": (bench_coaccessible_states, [1000, 2000, 4000, 8000, 16000]),
+    "save": (bench_save, [1000, 2000, 4000, 8000, 16000]),
+    "read": (bench_read, [1000, 2000, 4000, 8000, 16000]),
+    "to_dot": (bench_to_dot, [1000, 2000, 4000, 8000, 16000]),
+    "determinize": (bench_determinize, [1000, 2000, 4000, 8000, 16000]),
+    "determinize_worst": (bench_determinize_worst, [6, 8, 10, 12, 14]),
+}
+""" Dict: Maps the name of each benchmark to its setup function and its
+    default sizes. The setup function takes the size, the alphabet and a
+    seed, builds the input and returns the function to be timed."""
+
+EXPONENTIAL : Dict[str, int] = {
+    "determinize_worst": 20,
+}
+""" Dict[str, int]: Maps the name of each benchmark whose cost grows
+    exponentially with the size to the largest size it accepts. These
+    benchmarks are not swept over the sizes of the other ones (see
+    `run_suite`)."""
+
+def measure(function: Callable[[], Any], repeat: int = 3) -> float:
+    """
+    Returns the best duration of several calls of the function.
+
+    :param function: the function to be timed.
+    :type function: Callable[[], Any]
+    :param repeat: the number of calls, defaults to 3
+    :type repeat: int, optional
+    :return: the minimal duration of a call, in seconds.
+    :rtype: float
+    """
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def growth_exponent(sizes: List[int], times: List[float]) -> float:
+    """
+    Fits the durations with `c * size^k` by least squares on the logarithms
+        and returns k: 1 for a linear growth, 2 for a quadratic one...
+
+    :param sizes: the sizes.
+    :type sizes: List[int]
+    :param times: the duration for each size.
+    :type times: List[float]
+    :return: the growth exponent, None if there is less than two usable
+            points.
+    :rtype: float
+    """
+    points = [(math.log(n), math.log(t)) for (n, t) in zip(sizes, times) if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for (x, _) in points) / len(points)
+    mean_y = sum(y for (_, y) in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for (x, _) in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for (x, y) in points) / variance
+
+def sweep(name: str, sizes: List[int] = None, alphabet: str = "ab", repeat: int = 3,
+          seed: int = 0) -> Dict[str, Any]:
+    """
+    Times a benchmark for each size and fits its growth exponent.
+
+    :param name: the name of the benchmark (see `BENCHMARKS`).
+    :type name: str
+    :param sizes: the sizes, defaults to the ones of the benchmark.
+    :type sizes: List[int], optional
+    :param alphabet: the alphabet of the automata, defaults to "ab"
+    :type alphabet: str, optional
+    :param repeat: the number of calls for each size (see `measure`),
+            defaults to 3
+    :type repeat: int, optional
+    :param seed: the seed of the generators, defaults to 0
+    :type seed: int, optional
+    :return: the result: sizes, times (in seconds) and exponent. The sizes
+            above the limit of an exponential benchmark (see `EXPONENTIAL`)
+            are skipped.
+    :rtype: Dict[str, Any]
+    """
+    (setup, default_sizes) = BENCHMARKS[name]
+    if sizes is None:
+        sizes = default_sizes
+    limit = EXPONENTIAL.get(name)
+    if limit is not None and any(n > limit for n in sizes):
+        print("error : " + name + " is exponential, the sizes above " + str(limit) + " are skipped.")
+        sizes = [n for n in sizes if n <= limit]
+    times = [measure(setup(n, alphabet, seed), repeat) for n in sizes]
+    return {"sizes": list(sizes), "times": times, "exponent": growth_exponent(sizes, times)}
+
+def run_suite(names: List[str] = None, sizes: List[int] = None, alphabet: str = "ab",
+              repeat: int = 3, seed: int = 0, exponential_sizes: List[int] = None) -> Dict[str, Any]:
+    """
+    Runs several benchmarks (see `sweep`).
+
+    :param names: the names of the benchmarks, defaults to all of them.
+    :type names: List[str], optional
+    :param sizes: the sizes of the polynomial benchmarks, defaults to the
+            ones of each benchmark.
+    :type sizes: List[int], optional
+    :param alphabet: the alphabet of the automata, defaults to "ab"
+    :type alphabet: str, optional
+    :param repeat: the number of calls for each size, defaults to 3
+    :type repeat: int, optional
+    :param seed: the seed of the generators, defaults to 0
+    :type seed: int, optional
+    :param exponential_sizes: the sizes of the exponential benchmarks (see
+            `EXPONENTIAL`), defaults to the ones of each benchmark.
+    :type exponential_sizes: List[int], optional
+    :return: the results, with the environment and the result of each
+            benchmark under "benchmarks".
+    :rtype: Dict[str, Any]
+    """
+    if names is None:
+        names = list(BENCHMARKS)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "alphabet": alphabet,
+        "repeat": repeat,
+        "seed": seed,
+        "benchmarks": {name: sweep(name, exponential_sizes if name in EXPONENTIAL else sizes,
+                                   alphabet, repeat, seed) for name in names},
+    }
+
+def save_results(results: Dict[str, Any], filename: str):
+    """
+    Saves results in JSON.
+
+    :param results: the results (see `run_suite`).
+    :type results: Dict[str, Any]
+    :param filename: the name of the file.
+    :type filename: str
+    """
+    with open(filename, "w") as file:
+        json.dump(results, file, indent=2)
+
+def load_results(filename: str) -> Dict[str, Any]:
+    """
+    :param filename: the name of a file written by `save_results`.
+    :type filename: str
+    :return: the results stored in the file.
+    :rtype: Dict[str, Any]
+    """
+    with open(filename, "r") as file:
+        return json.load(file)
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], exponent_tolerance: float = 0.3,
+            time_tolerance: float = 2.0) -> List[str]:
+    """
+    Compares results with a baseline and returns the regressions: a growth
+        exponent higher than the one of the baseline by more than
+        `exponent_tolerance` (a complexity regression), or a duration longer
+        than the one of the baseline, for the same size, by a factor of more
+        than `time_tolerance`.
+
+    :param results: the results (see `run_suite`).
+    :type results: Dict[str, Any]
+    :param baseline: the results of reference.
+    :type baseline: Dict[str, Any]
+    :param exponent_tolerance: the accepted increase of the exponents,
+            defaults to 0.3
+    :type exponent_tolerance: float, optional
+    :param time_tolerance: the accepted slowdown factor, defaults to 2.0
+    :type time_tolerance: float, optional
+    :return: the descriptions of the regressions.
+    :rtype: List[str]
+    """
+    ret = []
+    for (name, result) in results["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            continue
+        if result["exponent"] is not None and reference["exponent"] is not None \
+                and result["exponent"] > reference["exponent"] + exponent_tolerance:
+            ret.append("%s: growth exponent %.2f instead of %.2f." % (
+                name, result["exponent"], reference["exponent"]))
+        reference_times = dict(zip(reference["sizes"], reference["times"]))
+        for (n, t) in zip(result["sizes"], result["times"]):
+            if n in reference_times and t > reference_times[n] * time_tolerance:
+                ret.append("%s: %.4fs instead of %.4fs for size %d." % (
+                    name, t, reference_times[n], n))
+    return ret
+
+def report(results: Dict[str, Any]) -> str:
+    """
+    :param results: the results (see `run_suite`).
+    :type results: Dict[str, Any]
+    :return: a human readable table of the results.
+    :rtype: str
+    """
+    lines = []
+    for (name, result) in results["benchmarks"].items():
+        exponent = "n/a" if result["exponent"] is None else "%.2f" % result["exponent"]
+        lines.append("%s (exponent %s):" % (name, exponent))
+        for (n, t) in zip(result["sizes"], result["times"]):
+            lines.append("   %10d  %10.4fs" % (n, t))
+    return "\n".join(lines)
@@ -0,0 +1,193 @@
+import DFA
+from array import array
+from typing import List, Tuple
+
+def dfa_classes(dfa: DFA) -> Tuple[List[List[int]], array]:
+    """
+    Returns the equivalence classes of the symbols of the specified
+        automaton: the classes of its storage (see `DFA.class_symbols`) whose
+        columns are equal are merged, which `DFA.split_class` does not do.
+        The result is cached until the automaton is modified (see
+        `DFA.cached`).
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :return: the classes, as lists of symbol ids ordered by their first
+            symbol, and the index of the class of each symbol id.
+    :rtype: Tuple[List[List[int]], array]
+    """
+    def compute():
+        columns = DFA.equal_columns(dfa.table, len(dfa.class_symbols))
+        ret = sorted(sorted(i for column in ids for i in dfa.class_symbols[column]) for ids in columns)
+        class_of = array("l", [0]) * len(dfa.alphabet)
+        for (class_id, ids) in enumerate(ret):
+            for i in ids:
+                class_of[i] = class_id
+        return (ret, class_of)
+    return dfa.cached("symbol_classes", compute)
+
+def symbol_class_ids(dfas: List[DFA], alphabet: str) -> List[List[int]]:
+    """
+    Partitions the symbols of the alphabet into equivalence classes: two
+        symbols are equivalent if every state of every automaton has the same
+        transition (or lack of transition) on both. The partition is the
+        common refinement of the classes of the automata (see
+        `dfa_classes`), so no transition is compared per symbol.
+
+    :param dfas: the automata considered.
+    :type dfas: List[DFA]
+    :param alphabet: the symbols to partition, a symbol which is not part of
+            the alphabet of an automaton has no transition in it.
+    :type alphabet: str
+    :return: the classes, as lists of indices in the alphabet, ordered by
+            their first symbol.
+    :rtype: List[List[int]]
+    """
+    if len(dfas) == 1 and dfas[0].alphabet == alphabet:
+        return dfa_classes(dfas[0])[0]
+    keys = []
+    for dfa in dfas:
+        class_of = dfa_classes(dfa)[1]
+        if dfa.alphabet == alphabet:
+            keys.append(class_of)
+        else:
+            keys.append([-1 if i is None else class_of[i] for i in map(dfa.symbol_ids.get, alphabet)])
+    groups = {}
+    for (index, key) in enumerate(zip(*keys)):
+        groups.setdefault(key, []).append(index)
+    return list(groups.values())
+
+def symbol_classes(dfa: DFA) -> List[str]:
+    """
+    Returns the equivalence classes of the symbols of the specified automaton
+        (see `symbol_class_ids`). Algorithms can work on one symbol per class
+        instead of the whole alphabet.
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :return: the classes, as strings of symbols.
+    :rtype: List[str]
+    """
+    return ["".join(dfa.alphabet[i] for i in ids) for ids in symbol_class_ids([dfa], dfa.alphabet)]
+
+def id_ranges(ids: List[int]) -> List[Tuple[int, int]]:
+    """
+    :param ids: increasing integers.
+    :type ids: List[int]
+    :return: the maximal ranges of consecutive integers, as (start, stop)
+            pairs with stop excluded.
+    :rtype: List[Tuple[int, int]]
+    """
+    ret = []
+    for i in ids:
+        if len(ret) > 0 and ret[-1][1] == i:
+            ret[-1] = (ret[-1][0], i + 1)
+        else:
+            ret.append((i, i + 1))
+    return ret
+
+def intervals(symbols: str) -> List[Tuple[str, str]]:
+    """
+    Returns the set of symbols as a list of intervals of code points, for
+        instance `[("a", "z"), ("_", "_")]`.
+
+    :param symbols: the symbols.
+    :type symbols: str
+    :return: the sorted maximal intervals (first, last), last included.
+    :rtype: List[Tuple[str, str]]
+    """
+    codes = sorted(set(ord(symbol) for symbol in symbols))
+    return [(chr(start), chr(stop - 1)) for (start, stop) in id_ranges(codes)]
+
+def from_intervals(ranges: List[Tuple[str, str]]) -> str:
+    """
+    Returns the string of the symbols of the specified intervals, for
+        instance to build the alphabet of all the bytes with
+        `from_intervals([("\\x00", "\\xff")])`.
+
+    :param ranges: the intervals (first, last), last included.
+    :type ranges: List[Tuple[str, str]]
+    :return: the symbols, in order, without duplicates.
+    :rtype: str
+    """
+    return "".join(dict.fromkeys(chr(code) for (first, last) in ranges
+                                 for code in range(ord(first), ord(last) + 1)))
+
+def interval_transitions(dfa: DFA, state: str) -> List[Tuple[str, str, str]]:
+    """
+    Returns the transitions of the specified state labelled by intervals of
+        symbols: consecutive code points leading to the same state are
+        merged. The work is done per class of symbols (see
+        `DFA.class_symbols`), whose intervals are cached until the automaton
+        is modified.
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :param state: the source state.
+    :type state: str
+    :return: the transitions (first, last, dst_state), last included, sorted
+            by code point.
+    :rtype: List[Tuple[str, str, str]]
+    """
+    if state not in dfa.state_ids:
+        print("error : the state '" + str(state) + "' is not part of the automaton.")
+        return
+    class_ranges = dfa.cached("class_ranges", lambda : [
+        id_ranges(sorted(ord(dfa.alphabet[i]) for i in ids)) for ids in dfa.class_symbols])
+    width = len(dfa.class_symbols)
+    base = dfa.state_ids[state] * width
+    ranges = []
+    for (class_id, dst) in enumerate(dfa.table[base:base + width]):
+        if dst >= 0:
+            ranges.extend((start, stop, dst) for (start, stop) in class_ranges[class_id])
+    ranges.sort()
+    ret = []
+    for (start, stop, dst) in ranges:
+        if len(ret) > 0 and ret[-1][2] == dst and ret[-1][1] == start:
+            ret[-1] = (ret[-1][0], stop, dst)
+        else:
+            ret.append((start, stop, dst))
+    return [(chr(start), chr(stop - 1), dfa.states[dst]) for (start, stop, dst) in ret]
+
+def compress(dfa: DFA) -> Tuple[DFA, List[str]]:
+    """
+    Returns an automaton over one representative symbol (the first one) per
+        equivalence class of the symbols of the specified automaton, with
+        the same states, and the classes. Algorithms which do not depend on
+        the symbols themselves can run on the compressed automaton, see
+        `expand` to get back an automaton over the whole alphabet.
+
+    :param dfa: the automaton to compress.
+    :type dfa: DFA
+    :return: the compressed automaton and the classes, as strings of symbols.
+    :rtype: Tuple[DFA, List[str]]
+    """
+    class_ids = symbol_class_ids([dfa], dfa.alphabet)
+    table = DFA.select_columns(dfa.table, len(dfa.class_symbols), [dfa.class_ids[ids[0]] for ids in class_ids])
+    ret = DFA.DFA.from_table("".join(dfa.alphabet[ids[0]] for ids in class_ids),
+                             dfa.states, table, dfa.init, dfa.finals)
+    return (ret, ["".join(dfa.alphabet[i] for i in ids) for ids in class_ids])
+
+def expand(dfa: DFA, classes: List[str]) -> DFA:
+    """
+    Returns the automaton over the whole alphabet corresponding to an
+        automaton compressed with `compress`, whose symbols are the first
+        symbol of each class.
+
+    :param dfa: the compressed automaton.
+    :type dfa: DFA
+    :param classes: the classes, as strings of symbols.
+    :type classes: List[str]
+    :return: the expanded automaton, whose alphabet is the concatenation of
+            the classes.
+    :rtype: DFA
+    """
+    alphabet = "".join(classes)
+    class_symbols = []
+    position = 0
+    for symbol_class in classes:
+        class_symbols.append(list(range(position, position + len(symbol_class))))
+        position += len(symbol_class)
+    columns = [dfa.class_ids[dfa.symbol_ids[symbol_class[0]]] for symbol_class in classes]
+    table = DFA.select_columns(dfa.table, len(dfa.class_symbols), columns)
+    return DFA.DFA.from_table(alphabet, dfa.states, table, dfa.init, dfa.finals, class_symbols)
@@ -0,0 +1,318 @@
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+def id_array(values: Iterable[int], bound: int) -> array:
+    """
+    :param values: integers between -1 and `bound`.
+    :type values: Iterable[int]
+    :param bound: an upper bound of the values.
+    :type bound: int
+    :return: the values in the smallest signed array type holding them, 4 or
+            8 bytes per value.
+    :rtype: array
+    """
+    return array("i" if bound < 2 ** 31 else "l", values)
+
+class PackedLists:
+    """
+    This class represent a read-only list of lists of integers stored in two
+        arrays: the concatenation of the lists and the offset of each list.
+        It replaces `DFA.predecessor_ids` in compact mode.
+    """
+    __slots__ = ("offsets", "values")
+
+    def __init__(self, lists: Iterable[Iterable[int]], bound: int):
+        """
+        Packs the lists.
+
+        :param lists: the lists to pack.
+        :type lists: Iterable[Iterable[int]]
+        :param bound: an upper bound of the values.
+        :type bound: int
+        """
+        self.offsets = array("l", [0])
+        """ array: The list i is stored in `values[offsets[i]:offsets[i + 1]]`."""
+        self.values = id_array((), bound)
+        """ array: The concatenated lists."""
+        for values in lists:
+            self.values.extend(values)
+            self.offsets.append(len(self.values))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> List[int]:
+        return self.values[self.offsets[index]:self.offsets[index + 1]].tolist()
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for index in range(len(self)):
+            yield self[index]
+
+class TableTransitions(Mapping):
+    """
+    This class represent a read-only view of the transitions of a DFA,
+        computed on demand from its table. It is returned by
+        `DFA.transitions`.
+    """
+    __slots__ = ("states", "state_ids", "alphabet", "table", "class_ids")
+
+    def __init__(self, states: List[str], state_ids: Dict[str, int], alphabet: str, table: array,
+                 class_ids: array):
+        """
+        Initialise the view.
+
+        :param states: the states of the DFA.
+        :type states: List[str]
+        :param state_ids: the ids of the states.
+        :type state_ids: Dict[str, int]
+        :param alphabet: the alphabet of the DFA.
+        :type alphabet: str
+        :param table: the transition table of the DFA (see `DFA.table`).
+        :type table: array
+        :param class_ids: the class of each symbol (see `DFA.class_ids`).
+        :type class_ids: array
+        """
+        self.states = states
+        self.state_ids = state_ids
+        self.alphabet = alphabet
+        self.table = table
+        self.class_ids = class_ids
+
+    def __getitem__(self, state: str) -> List[Tuple[str, str]]:
+        width = len(self.table) // len(self.states) if self.states else 0
+        base = self.state_ids[state] * width
+        row = self.table[base:base + width]
+        return [(symbol, self.states[dst]) for (symbol, dst) in zip(self.alphabet, map(row.__getitem__, self.class_ids))
+                if dst >= 0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.states)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, state) -> bool:
+        return state in self.state_ids
+
+class SinkTable:
+    """
+    This class represent a read-only view of a transition table completed
+        with a sink state: the missing transitions lead to the sink, which is
+        the next state id and whose row is appended to the table. It replaces
+        `DFA.table` in the automata returned by `DFA.clone_with_sink`.
+    """
+    __slots__ = ("table", "width", "sink")
+
+    def __init__(self, table: array, width: int, sink: int):
+        """
+        Initialise the view.
+
+        :param table: the transition table (see `DFA.table`).
+        :type table: array
+        :param width: the number of entries of a row.
+        :type width: int
+        :param sink: the id of the sink state, the number of rows of `table`.
+        :type sink: int
+        """
+        self.table = table
+        self.width = width
+        self.sink = sink
+
+    def __len__(self) -> int:
+        return len(self.table) + self.width
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.entries(index)
+        if index < 0:
+            index += len(self)
+        if index >= len(self.table):
+            if not 0 <= index < len(self):
+                raise IndexError("table index out of range")
+            return self.sink
+        dst = self.table[index]
+        return self.sink if dst < 0 else dst
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.entries(slice(None)))
+
+    def __contains__(self, value) -> bool:
+        if value == self.sink:
+            return self.width > 0
+        return value >= 0 and value in self.table
+
+    def index(self, value: int, start: int = 0) -> int:
+        return self.entries(slice(None)).index(value, start)
+
+    def entries(self, index: slice) -> array:
+        """
+        :param index: a slice of the table.
+        :type index: slice
+        :return: the entries of the slice, in a new array.
+        :rtype: array
+        """
+        (start, stop, step) = index.indices(len(self))
+        if step < 0:
+            return array(self.table.typecode, [self[i] for i in range(start, stop, step)])
+        ret = self.table[start:min(stop, len(self.table)):step]
+        i = -1
+        try:
+            while True:
+                i = ret.index(-1, i + 1)
+                ret[i] = self.sink
+        except ValueError:
+            pass
+        ret.extend([self.sink] * len(range(start + len(ret) * step, stop, step)))
+        return ret
+
+    def tobytes(self) -> bytes:
+        return self.entries(slice(None)).tobytes()
+
+class SinkPredecessors:
+    """
+    This class represent a read-only view of the predecessor lists of the
+        states of a `SinkTable`: the lists of the other states are unchanged,
+        the one of the sink is computed on first access.
+    """
+    __slots__ = ("lists", "table", "width", "sink_list")
+
+    def __init__(self, lists, table: array, width: int):
+        """
+        Initialise the view.
+
+        :param lists: the predecessor lists (see `DFA.predecessor_ids`).
+        :param table: the transition table without the sink.
+        :type table: array
+        :param width: the number of entries of a row.
+        :type width: int
+        """
+        self.lists = lists
+        self.table = table
+        self.width = width
+        self.sink_list = None
+
+    def __len__(self) -> int:
+        return len(self.lists) + 1
+
+    def __getitem__(self, index: int) -> List[int]:
+        if index < 0:
+            index += len(self)
+        if index < len(self.lists):
+            return self.lists[index]
+        if index != len(self.lists):
+            raise IndexError("list index out of range")
+        if self.sink_list is None:
+            sink_list = []
+            i = -1
+            try:
+                while True:
+                    i = self.table.index(-1, i + 1)
+                    sink_list.append(i // self.width)
+            except ValueError:
+                pass
+            self.sink_list = sink_list + [index] * self.width
+        return self.sink_list
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for index in range(len(self)):
+            yield self[index]
+
+class PackedTransitions(Mapping):
+    """
+    This class represent a read-only view of the transitions of a FA stored
+        in three arrays: for each state, the range of its transitions in the
+        arrays of the symbol ids (-1 for epsilon) and of the destination ids.
+        It has the interface of `FA.transitions`, which it replaces in compact
+        mode.
+    """
+    __slots__ = ("states", "state_ids", "alphabet", "epsilon", "offsets", "symbols", "destinations")
+
+    def __init__(self, states: List[str], alphabet: str, epsilon: str,
+                 transitions: Dict[str, List[Tuple[str, str]]]):
+        """
+        Packs the transitions.
+
+        :param states: the states of the FA.
+        :type states: List[str]
+        :param alphabet: the alphabet of the FA.
+        :type alphabet: str
+        :param epsilon: the symbol of the epsilon transitions.
+        :type epsilon: str
+        :param transitions: the transitions of the FA (see `FA.transitions`).
+        :type transitions: Dict[str, List[Tuple[str, str]]]
+        """
+        self.states = states
+        self.state_ids = {state: i for (i, state) in enumerate(states)}
+        self.alphabet = alphabet
+        self.epsilon = epsilon
+        symbol_ids = {symbol: i for (i, symbol) in reversed(list(enumerate(alphabet)))}
+        symbol_ids[epsilon] = -1
+        self.offsets = array("l", [0])
+        self.symbols = id_array((), len(alphabet))
+        self.destinations = id_array((), len(states))
+        for state in states:
+            for (symbol, dst_state) in transitions[state]:
+                self.symbols.append(symbol_ids[symbol])
+                self.destinations.append(self.state_ids[dst_state])
+            self.offsets.append(len(self.symbols))
+
+    def __getitem__(self, state: str) -> List[Tuple[str, str]]:
+        index = self.state_ids[state]
+        (start, stop) = (self.offsets[index], self.offsets[index + 1])
+        return [(self.epsilon if symbol < 0 else self.alphabet[symbol], self.states[dst])
+                for (symbol, dst) in zip(self.symbols[start:stop], self.destinations[start:stop])]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.states)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, state) -> bool:
+        return state in self.state_ids
+
+def deep_size(obj, seen: set) -> int:
+    """
+    Returns the memory used by an object and the objects it references
+        (containers, arrays, records with `__slots__`), in bytes. Objects
+        whose id is in `seen` are not counted, the counted ones are added to
+        it so that shared objects are only counted once.
+
+    :param obj: the object.
+    :param seen: the ids of the objects already counted.
+    :type seen: set
+    :return: the size in bytes.
+    :rtype: int
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for (key, value) in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(type(obj), "__slots__"):
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    size += deep_size(getattr(obj, name), seen)
+    return size
+
+def memory_report(components: Dict[str, object]) -> Dict[str, int]:
+    """
+    Returns the memory used by each component of an automaton (see
+        `deep_size`). An object shared by several components is counted in
+        the first one. The total is given under `"total"`.
+
+    :param components: the components, by name.
+    :type components: Dict[str, object]
+    :return: the size of each component in bytes.
+    :rtype: Dict[str, int]
+    """
+    seen = set()
+    ret = {name: deep_size(component, seen) for (name, component) in components.items()}
+    ret["total"] = sum(ret.values())
+    return ret
@@ -0,0 +1,98 @@
+import DFA
+import algorithms
+from typing import List
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INT64_LIMIT = 2 ** 63
+""" int: Counts are computed with NumPy int64 arrays while they stay below this
+    bound, and with Python integers afterwards."""
+
+def length_distribution(dfa: DFA, max_len: int) -> List[int]:
+    """
+    Returns the number of words of each length, from 0 to `max_len`, accepted
+        by the specified automaton.
+
+    The counts are computed by dynamic programming on the transition table:
+        the number of paths of length l from the initial state to each state
+        is derived from the one of length l-1. Only useful states are
+        considered. Each step is vectorized with NumPy (if available) as long
+        as the counts fit in 64 bits, the computation goes on with exact
+        Python integers afterwards.
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :param max_len: the maximal length of the words.
+    :type max_len: int
+    :return: the list of the counts, indexed by length, empty if `max_len`
+            is negative.
+    :rtype: List[int]
+    """
+    useful = algorithms.useful_states(dfa)
+    if dfa.init not in useful or max_len < 0:
+        return [0] * (max_len + 1)
+    ids = {dfa.state_ids[state]: i for (i, state) in enumerate(useful)}
+    # The transitions are read per class of symbols (see `DFA.class_symbols`),
+    # each edge is weighted by the number of symbols leading along it.
+    k = len(dfa.class_symbols)
+    sizes = [len(symbols) for symbols in dfa.class_symbols]
+    edges = {} # Maps each pair (src, dst) of useful ids to its weight.
+    for (state, src) in ids.items():
+        base = state * k
+        for (size, dst) in zip(sizes, dfa.table[base:base + k]):
+            dst = ids.get(dst)
+            if dst is not None:
+                edges[(src, dst)] = edges.get((src, dst), 0) + size
+    sources = [src for (src, dst) in edges]
+    destinations = [dst for (src, dst) in edges]
+    weights = list(edges.values())
+    finals = [ids[dfa.state_ids[state]] for state in dfa.finals if dfa.state_ids[state] in ids]
+    n = len(useful)
+    k = max(1, len(dfa.alphabet))
+
+    ret = []
+    paths = [0] * n
+    paths[ids[dfa.state_ids[dfa.init]]] = 1
+    total = 1 # Upper bound of every count in paths.
+
+    if numpy is not None:
+        sources_array = numpy.array(sources, dtype=numpy.int64)
+        destinations_array = numpy.array(destinations, dtype=numpy.int64)
+        weights_array = numpy.array(weights, dtype=numpy.int64)
+        finals_array = numpy.array(finals, dtype=numpy.int64)
+        vector = numpy.array(paths, dtype=numpy.int64)
+        while len(ret) <= max_len and total * k < INT64_LIMIT:
+            ret.append(int(vector[finals_array].sum()))
+            next_vector = numpy.zeros(n, dtype=numpy.int64)
+            numpy.add.at(next_vector, destinations_array, vector[sources_array] * weights_array)
+            vector = next_vector
+            total *= k
+        paths = [int(count) for count in vector]
+
+    while len(ret) <= max_len:
+        ret.append(sum(paths[state] for state in finals))
+        next_paths = [0] * n
+        for (src, dst, weight) in zip(sources, destinations, weights):
+            next_paths[dst] += paths[src] * weight
+        paths = next_paths
+
+    return ret
+
+def count_words(dfa: DFA, n: int) -> int:
+    """
+    Returns the number of words of length n accepted by the specified
+        automaton (see `length_distribution`).
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :param n: the length of the words.
+    :type n: int
+    :return: the number of accepted words of length n, 0 if n is negative.
+    :rtype: int
+    """
+    if n < 0:
+        return 0
+    return length_distribution(dfa, n)[n]
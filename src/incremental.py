@@ -0,0 +1,529 @@
+import DFA
+import algorithms
+import profiling
+from typing import Dict, List, Set, Tuple
+
+FALLBACK_RATIO = 0.25
+""" float: The default fraction of the states whose language may change
+    (see `IncrementalMinimalDFA.affected_states`) above which an edit is
+    handled by a full recomputation."""
+
+class IncrementalMinimalDFA:
+    """
+    This class maintains the groups of equivalent states of an automaton (see
+        `algorithms.equivalent_states`) while it is edited, so that its
+        minimal automaton is available after each edit without minimizing it
+        from scratch.
+
+    The language of a state only changes if the edited state can be reached
+        from it. Each edit therefore only reassigns these states, the other
+        groups are kept: a reassigned state joins a kept group with the same
+        signature (finality and groups of its successors), the strongly
+        connected components of the reassigned states are matched with kept
+        groups by walking both together, and the remaining states are split
+        into new groups by partition refinement. When an edit may change the
+        language of too many states, the groups are recomputed.
+
+    The edits are tuples:
+
+    - `("add_state", state, final)`
+    - `("add_transition", src_state, symbol, dst_state)`
+    - `("remove_transition", src_state, symbol)`
+    - `("set_final", state, final)`
+    - `("set_init", state)`
+    """
+    def __init__(self, dfa: DFA, fallback_ratio: float = FALLBACK_RATIO):
+        """
+        Computes the groups of equivalent states of the automaton, which must
+            then be edited through `apply`. Other modifications of the
+            automaton are detected and trigger a full recomputation.
+
+        :param dfa: the automaton, edited in place.
+        :type dfa: DFA
+        :param fallback_ratio: the fraction of the states whose language may
+                change above which the groups are recomputed, defaults to
+                `FALLBACK_RATIO`
+        :type fallback_ratio: float, optional
+        """
+        self.dfa : DFA = dfa
+        """ DFA: The automaton."""
+        self.fallback_ratio : float = fallback_ratio
+        """ float: The fraction of the states whose language may change above
+            which the groups are recomputed."""
+        self.block_of : List[int] = []
+        """ List[int]: The group of each state id."""
+        self.members : Dict[int, Set[int]] = {}
+        """ Dict[int, Set[int]]: The state ids of each group."""
+        self.signatures : Dict[int, tuple] = {}
+        """ Dict[int, tuple]: The signature of each group (see `signature`)."""
+        self.register : Dict[tuple, int] = {}
+        """ Dict[tuple, int]: Maps each signature to its group. Two groups
+            never have the same signature."""
+        self.shapes : Dict[tuple, Set[int]] = {}
+        """ Dict[tuple, Set[int]]: The groups of each shape: the finality and
+            the classes of symbols of the transitions of their states (see
+            `DFA.class_symbols`)."""
+        self.is_final : bytearray = bytearray()
+        """ bytearray: 1 for each final state id."""
+        self.next_block : int = 0
+        """ int: The id of the next new group."""
+        self.version : int = -1
+        """ int: The version of the automaton the groups correspond to (see
+            `DFA.version`)."""
+        self.minimal_dfa : DFA = None
+        """ DFA: The last minimal automaton returned by `minimal`."""
+        self.minimal_version : int = -1
+        """ int: The version of the automaton of `minimal_dfa`."""
+
+        self.updates : int = 0
+        """ int: The number of edits handled locally."""
+        self.recomputations : int = 0
+        """ int: The number of full recomputations of the groups."""
+        self.recompute()
+
+    def signature(self, state: int) -> tuple:
+        """
+        :param state: the id of a state whose successors all have a group.
+        :type state: int
+        :return: the finality of the state and the pairs (class of symbols,
+                group) of its transitions (see `DFA.class_symbols`). Two
+                states are equivalent if and only if they have the same
+                signature.
+        :rtype: tuple
+        """
+        k = len(self.dfa.class_symbols)
+        row = self.dfa.table[state * k:(state + 1) * k]
+        return (self.is_final[state], tuple((symbol, self.block_of[dst]) for (symbol, dst) in enumerate(row) if dst >= 0))
+
+    def add_block(self, states: List[int]) -> int:
+        """
+        Adds a group of states, whose signature must then be registered with
+            `register_block`.
+
+        :param states: the ids of the states of the group.
+        :type states: List[int]
+        :return: the id of the group.
+        :rtype: int
+        """
+        block = self.next_block
+        self.next_block += 1
+        for state in states:
+            self.block_of[state] = block
+        self.members[block] = set(states)
+        return block
+
+    def register_block(self, block: int):
+        """
+        Registers the signature and the shape of a group. The successors of
+            its states must all have a group.
+
+        :param block: the id of the group.
+        :type block: int
+        """
+        signature = self.signature(next(iter(self.members[block])))
+        self.signatures[block] = signature
+        self.register[signature] = block
+        self.shapes.setdefault((signature[0], tuple(symbol for (symbol, _) in signature[1])), set()).add(block)
+
+    def remove_block(self, block: int):
+        """
+        Removes an empty group.
+
+        :param block: the id of the group.
+        :type block: int
+        """
+        signature = self.signatures.pop(block)
+        del self.register[signature]
+        del self.members[block]
+        shape = (signature[0], tuple(symbol for (symbol, _) in signature[1]))
+        self.shapes[shape].discard(block)
+        if len(self.shapes[shape]) == 0:
+            del self.shapes[shape]
+
+    def recompute(self):
+        """
+        Recomputes all the groups from scratch (see
+            `algorithms.equivalent_states`).
+        """
+        dfa = self.dfa
+        self.is_final = bytearray(len(dfa.states))
+        for state in dfa.finals:
+            self.is_final[dfa.state_ids[state]] = 1
+        self.block_of = [-1] * len(dfa.states)
+        self.members = {}
+        self.signatures = {}
+        self.register = {}
+        self.shapes = {}
+        self.next_block = 0
+        for group in algorithms.equivalent_states(dfa):
+            self.add_block([dfa.state_ids[state] for state in group])
+        for block in self.members:
+            self.register_block(block)
+        self.version = dfa.version
+        self.recomputations += 1
+
+    def apply(self, edit: tuple):
+        """
+        Applies an edit to the automaton and updates the groups of equivalent
+            states. Invalid edits print an error and are ignored, like the
+            corresponding methods of `DFA`.
+
+        :param edit: the edit, see the list of the edits in the description
+                of the class.
+        :type edit: tuple
+        """
+        dfa = self.dfa
+        if dfa.version != self.version:
+            self.recompute() # The automaton was modified outside of apply.
+        width = len(dfa.class_symbols)
+        kind = edit[0]
+        if kind == "add_state":
+            final = len(edit) > 2 and bool(edit[2])
+            dfa.add_state(edit[1], final)
+            if dfa.version == self.version:
+                return
+            self.block_of.append(-1)
+            self.is_final.append(final)
+            state = len(dfa.states) - 1
+        elif kind == "add_transition":
+            dfa.add_transition(edit[1], edit[2], edit[3])
+            state = dfa.state_ids.get(edit[1])
+        elif kind == "remove_transition":
+            dfa.remove_transition(edit[1], edit[2])
+            state = dfa.state_ids.get(edit[1])
+        elif kind == "set_final":
+            state = dfa.state_ids.get(edit[1])
+            if state is None:
+                print("error : the state '" + str(edit[1]) + "' is not an existing state.")
+                return
+            if bool(self.is_final[state]) != bool(edit[2]):
+                if edit[2]:
+                    dfa.finals.append(edit[1])
+                else:
+                    dfa.finals.remove(edit[1])
+                self.is_final[state] = bool(edit[2])
+        elif kind == "set_init":
+            if edit[1] not in dfa.state_ids:
+                print("error : the state '" + str(edit[1]) + "' is not an existing state.")
+                return
+            dfa.init = edit[1]
+            self.version = dfa.version # The groups do not depend on the initial state.
+            return
+        else:
+            print("error : unknown edit '" + str(kind) + "'.")
+            return
+        if dfa.version == self.version:
+            return # Invalid or empty edit.
+        if len(dfa.class_symbols) != width:
+            self.recompute() # A class of symbols was split, the signatures changed.
+            return
+        self.update(state)
+        self.version = dfa.version
+
+    def affected_states(self, state: int, limit: int) -> List[int]:
+        """
+        Returns the states from which the specified state can be reached,
+            itself included: the states whose language may change when it is
+            edited.
+
+        :param state: the id of the edited state.
+        :type state: int
+        :param limit: the maximal number of states returned.
+        :type limit: int
+        :return: the ids of the states, None if there are more than `limit`.
+        :rtype: List[int]
+        """
+        predecessor_ids = self.dfa.predecessor_ids
+        ret = [state]
+        seen = {state}
+        for dst in ret:
+            for src in predecessor_ids[dst]:
+                if src not in seen:
+                    if len(ret) >= limit:
+                        return None
+                    seen.add(src)
+                    ret.append(src)
+        return ret
+
+    def components(self, states: List[int]) -> List[List[int]]:
+        """
+        Returns the strongly connected components of the transition graph
+            restricted to the specified states, in reverse topological order
+            (see `algorithms.strongly_connected_components`).
+
+        :param states: the ids of the states.
+        :type states: List[int]
+        :return: the components.
+        :rtype: List[List[int]]
+        """
+        k = len(self.dfa.class_symbols)
+        table = self.dfa.table
+        index = {state: -1 for state in states}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for root in states:
+            if index[root] >= 0:
+                continue
+            work = [(root, 0)] # Pairs (state, next class to explore).
+            while len(work) > 0:
+                (state, symbol) = work.pop()
+                if symbol == 0:
+                    index[state] = lowlink[state] = counter
+                    counter += 1
+                    stack.append(state)
+                    on_stack.add(state)
+                recurse = False
+                while symbol < k:
+                    dst = table[state * k + symbol]
+                    symbol += 1
+                    if dst not in index:
+                        continue
+                    if index[dst] < 0:
+                        work.append((state, symbol))
+                        work.append((dst, 0))
+                        recurse = True
+                        break
+                    if dst in on_stack:
+                        lowlink[state] = min(lowlink[state], index[dst])
+                if recurse:
+                    continue
+                if lowlink[state] == index[state]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == state:
+                            break
+                    components.append(component)
+                if len(work) > 0:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[state])
+
+        return components
+
+    def match(self, component: List[int], start: int, block: int) -> Dict[int, int]:
+        """
+        Tests whether the states of a strongly connected component, whose
+            successors outside of the component all have a group, are
+            equivalent to states of existing groups, by walking from the
+            specified state and group together.
+
+        :param component: the ids of the states of the component.
+        :type component: List[int]
+        :param start: the id of a state of the component.
+        :type start: int
+        :param block: the group tested for the state `start`.
+        :type block: int
+        :return: the group of each state of the component, None if `start` is
+                not equivalent to the states of `block`.
+        :rtype: Dict[int, int]
+        """
+        k = len(self.dfa.class_symbols)
+        table = self.dfa.table
+        block_of = self.block_of
+        ret = {start: block}
+        to_visit = [start]
+        while len(to_visit) > 0:
+            state = to_visit.pop()
+            other = next(iter(self.members[ret[state]]))
+            if self.is_final[state] != self.is_final[other]:
+                return None
+            for symbol in range(k):
+                dst = table[state * k + symbol]
+                other_dst = table[other * k + symbol]
+                if dst < 0 or other_dst < 0:
+                    if dst != other_dst:
+                        return None
+                elif block_of[dst] >= 0:
+                    if block_of[dst] != block_of[other_dst]:
+                        return None
+                elif dst in ret:
+                    if ret[dst] != block_of[other_dst]:
+                        return None
+                else:
+                    ret[dst] = block_of[other_dst]
+                    to_visit.append(dst)
+        return ret if len(ret) == len(component) else None
+
+    def candidates(self, component: List[int]) -> Tuple[int, Set[int]]:
+        """
+        Returns the existing groups which may contain states equivalent to a
+            state of a strongly connected component, whose successors outside
+            of the component all have a group: the groups with a transition
+            to the same group with the same class if the component has a
+            transition leaving it, the groups with the same shape otherwise.
+
+        :param component: the ids of the states of the component.
+        :type component: List[int]
+        :return: the id of the state of the component and its candidate
+                groups.
+        :rtype: Tuple[int, Set[int]]
+        """
+        k = len(self.dfa.class_symbols)
+        table = self.dfa.table
+        block_of = self.block_of
+        for state in component:
+            for symbol in range(k):
+                dst = table[state * k + symbol]
+                if dst >= 0 and block_of[dst] >= 0:
+                    ret = set()
+                    for member in self.members[block_of[dst]]:
+                        for pred in self.dfa.predecessor_ids[member]:
+                            if block_of[pred] >= 0 and table[pred * k + symbol] == member:
+                                ret.add(block_of[pred])
+                    return (state, ret)
+        state = component[0]
+        row = table[state * k:(state + 1) * k]
+        shape = (self.is_final[state], tuple(symbol for (symbol, dst) in enumerate(row) if dst >= 0))
+        return (state, self.shapes.get(shape, set()))
+
+    def update(self, state: int):
+        """
+        Updates the groups after an edit of the transitions or of the
+            finality of a state.
+
+        :param state: the id of the edited state.
+        :type state: int
+        """
+        dfa = self.dfa
+        k = len(dfa.class_symbols)
+        table = dfa.table
+        block_of = self.block_of
+        limit = int(self.fallback_ratio * len(dfa.states))
+        affected = self.affected_states(state, limit)
+        if affected is None:
+            self.recompute()
+            return
+        if profiling.ENABLED:
+            profiling.count("incremental.affected", len(affected))
+
+        # Remove the affected states from their groups. The other states keep
+        # their language, so their groups and signatures are unchanged.
+        for member in affected:
+            block = block_of[member]
+            if block >= 0:
+                self.members[block].discard(member)
+                if len(self.members[block]) == 0:
+                    self.remove_block(block)
+            block_of[member] = -1
+
+        # Match the affected states with the remaining groups, successors
+        # first. Unmatched states keep the group -1.
+        work = 0 # Number of transitions compared.
+        unmatched = []
+        for component in self.components(affected):
+            inside = set(component)
+            successors = [dst for member in component for dst in table[member * k:(member + 1) * k]]
+            work += len(successors)
+            if any(dst >= 0 and block_of[dst] < 0 and dst not in inside for dst in successors):
+                unmatched.extend(component) # A successor has a new language.
+                continue
+            groups = None
+            if len(component) == 1 and component[0] not in successors:
+                block = self.register.get(self.signature(component[0]))
+                if block is not None:
+                    groups = {component[0]: block}
+            else:
+                (start, blocks) = self.candidates(component)
+                for block in blocks:
+                    work += len(component) * k
+                    if work > limit * max(1, k):
+                        self.recompute()
+                        return
+                    groups = self.match(component, start, block)
+                    if groups is not None:
+                        break
+            if groups is None:
+                unmatched.extend(component)
+                continue
+            for (member, block) in groups.items():
+                block_of[member] = block
+                self.members[block].add(member)
+
+        # Split the unmatched states into new groups by partition refinement,
+        # the groups of their other successors and the missing transitions
+        # being fixed, distinct states.
+        if len(unmatched) > 0:
+            ids = {state: i for (i, state) in enumerate(unmatched)}
+            fixed = {-1: len(ids)} # Maps each fixed group (-1 for missing transitions) to its id.
+            successors = []
+            for member in unmatched:
+                for dst in table[member * k:(member + 1) * k]:
+                    if dst >= 0 and block_of[dst] < 0:
+                        successors.append(ids[dst])
+                    else:
+                        block = block_of[dst] if dst >= 0 else -1
+                        if block not in fixed:
+                            fixed[block] = len(ids) + len(fixed)
+                        successors.append(fixed[block])
+            n = len(ids) + len(fixed)
+            inverse = [[[] for _ in range(n)] for _ in range(k)]
+            for (i, dst) in enumerate(successors):
+                inverse[i % k][dst].append(i // k)
+            blocks = [[i for i in range(len(ids)) if self.is_final[unmatched[i]]],
+                      [i for i in range(len(ids)) if not self.is_final[unmatched[i]]]]
+            blocks = [block for block in blocks if len(block) > 0] + [[i] for i in fixed.values()]
+            (refined, _) = algorithms.refine_partition(inverse, blocks)
+            new_blocks = {}
+            for (i, member) in enumerate(unmatched):
+                new_blocks.setdefault(refined[i], []).append(member)
+            for states in new_blocks.values():
+                self.add_block(states)
+            for states in new_blocks.values():
+                self.register_block(block_of[states[0]])
+        self.updates += 1
+
+    def equivalent(self, state1: str, state2: str) -> bool:
+        """
+        :param state1: a state of the automaton.
+        :type state1: str
+        :param state2: a state of the automaton.
+        :type state2: str
+        :return: true if the states are equivalent, false otherwise.
+        :rtype: bool
+        """
+        for state in (state1, state2):
+            if state not in self.dfa.state_ids:
+                print("error : the state '" + str(state) + "' is not an existing state.")
+                return
+        if self.dfa.version != self.version:
+            self.recompute()
+        return self.block_of[self.dfa.state_ids[state1]] == self.block_of[self.dfa.state_ids[state2]]
+
+    def equivalent_states(self) -> List[List[str]]:
+        """
+        :return: the groups of equivalent states, in the same order as
+                `algorithms.equivalent_states`.
+        :rtype: List[List[str]]
+        """
+        if self.dfa.version != self.version:
+            self.recompute()
+        groups = {}
+        for (state, block) in zip(self.dfa.states, self.block_of):
+            if block not in groups:
+                groups[block] = []
+            groups[block].append(state)
+        return list(groups.values())
+
+    def minimal(self) -> DFA:
+        """
+        Returns the minimal automaton, the same as `algorithms.minimize`. It is
+            built from the groups when it is requested, and kept until the
+            next edit.
+
+        :return: the minimal automaton, which must not be modified.
+        :rtype: DFA
+        """
+        dfa = self.dfa
+        if self.minimal_version != dfa.version:
+            if len(dfa.states) < 2:
+                self.minimal_dfa = dfa.clone()
+            else:
+                self.minimal_dfa = algorithms.quotient(dfa, self.equivalent_states())
+            self.minimal_version = dfa.version
+        return self.minimal_dfa
@@ -0,0 +1,188 @@
+import FA
+import algorithms
+from typing import Dict, Iterable, List
+
+class LazyDFA:
+    """
+    This class runs a finite automaton (with epsilon transitions) by
+        determinizing it on demand: the DFA states and transitions are only
+        computed along the paths taken by the input, and are kept in a cache
+        of bounded size. When the cache is full it is flushed and the run goes
+        on, so the memory used stays bounded whatever the number of subsets.
+    """
+    def __init__(self, fa: FA, max_states: int = 10000):
+        """
+        Initialise the runner.
+
+        :param fa: the automaton to execute.
+        :type fa: FA
+        :param max_states: the maximal number of DFA states kept in the cache,
+                defaults to 10000
+        :type max_states: int, optional
+        """
+        self.alphabet : str = "".join(dict.fromkeys(s for s in fa.alphabet if s != FA.EPSILON))
+        """ str: The alphabet of the automaton, without epsilon."""
+        self.symbol_ids : Dict[str, int] = {s: i for (i, s) in enumerate(self.alphabet)}
+        """ Dict[str, int]: Interns each symbol to its index in `alphabet`."""
+        closures = algorithms.epsilon_closures(fa)
+        self.moves : List[List[int]] = algorithms.subset_moves(fa, self.symbol_ids, closures)
+        """ List[List[int]]: The moves of each state of the FA for each symbol
+            (see `algorithms.subset_moves`)."""
+        ids = {state: i for (i, state) in enumerate(fa.states)}
+        self.finals : int = 0
+        """ int: The bitmask of the final states of the FA."""
+        for state in fa.finals:
+            self.finals |= 1 << ids[state]
+        self.init : int = 0 if fa.init is None else closures[ids[fa.init]]
+        """ int: The bitmask of the initial subset."""
+        self.max_states : int = max(1, max_states)
+        """ int: The maximal number of DFA states kept in the cache."""
+
+        self.states : Dict[int, int] = {}
+        """ Dict[int, int]: The cache, mapping each known subset to its DFA
+            state index."""
+        self.members : List[List[int]] = []
+        """ List[List[int]]: The FA state ids of each cached DFA state."""
+        self.accepting : List[bool] = []
+        """ List[bool]: True for each cached DFA state containing a final state."""
+        self.rows : List[Dict[str, int]] = []
+        """ List[Dict[str, int]]: For each cached DFA state, the known
+            transitions, mapping a symbol to a DFA state index or to -1 for the
+            empty subset."""
+
+        self.steps : int = 0
+        """ int: The number of symbols read."""
+        self.misses : int = 0
+        """ int: The number of transitions which were not in the cache."""
+        self.flushes : int = 0
+        """ int: The number of times the cache has been flushed."""
+
+    def flush(self):
+        """
+        Empties the cache of DFA states and transitions.
+        """
+        self.states.clear()
+        self.members.clear()
+        self.accepting.clear()
+        self.rows.clear()
+        self.flushes += 1
+
+    def get_state(self, subset: int) -> int:
+        """
+        Returns the index of the DFA state corresponding to the specified
+            subset, adding it to the cache if needed. The cache is flushed
+            first if it is full.
+
+        :param subset: the bitmask of the subset.
+        :type subset: int
+        :return: the index of the DFA state.
+        :rtype: int
+        """
+        index = self.states.get(subset)
+        if index is not None:
+            return index
+        if len(self.members) >= self.max_states:
+            self.flush()
+        members = []
+        rest = subset
+        while rest:
+            low = rest & -rest
+            members.append(low.bit_length() - 1)
+            rest ^= low
+        index = len(self.members)
+        self.states[subset] = index
+        self.members.append(members)
+        self.accepting.append(subset & self.finals != 0)
+        self.rows.append({})
+        return index
+
+    def step(self, index: int, symbol: str) -> int:
+        """
+        Computes the transition from the specified cached DFA state and stores it
+            in the cache.
+
+        :param index: the index of the source DFA state.
+        :type index: int
+        :param symbol: the symbol of the transition.
+        :type symbol: str
+        :return: the index of the destination state, -1 if the destination is
+                the empty subset or if the symbol is not part of the alphabet.
+        :rtype: int
+        """
+        self.misses += 1
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            return -1
+        subset = 0
+        for state in self.members[index]:
+            subset |= self.moves[state][symbol_id]
+        if subset == 0:
+            self.rows[index][symbol] = -1
+            return -1
+        flushes = self.flushes
+        dst = self.get_state(subset)
+        if flushes == self.flushes: # The source state is still in the cache.
+            self.rows[index][symbol] = dst
+        return dst
+
+    def match(self, word: str) -> bool:
+        """
+        Returns True if the word is accepted by the automaton.
+
+        :param word: the word to be tested.
+        :type word: str
+        :return: True if the word is accepted, False otherwise.
+        :rtype: bool
+        """
+        if self.init == 0:
+            return False
+        state = self.get_state(self.init)
+        rows = self.rows
+        read = 0
+        for symbol in word:
+            read += 1
+            dst = rows[state].get(symbol)
+            if dst is None:
+                dst = self.step(state, symbol)
+            if dst < 0:
+                self.steps += read
+                return False
+            state = dst
+        self.steps += read
+        return self.accepting[state]
+
+    def match_many(self, words: Iterable[str]) -> List[int]:
+        """
+        Runs the automaton on each word and returns the indices of the accepted
+            words, in increasing order.
+
+        :param words: the words to be tested.
+        :type words: Iterable[str]
+        :return: the indices of the accepted words.
+        :rtype: List[int]
+        """
+        return [index for (index, word) in enumerate(words) if self.match(word)]
+
+    def hit_rate(self) -> float:
+        """
+        :return: the proportion of transitions found in the cache, 1.0 if no
+                symbol has been read yet.
+        :rtype: float
+        """
+        if self.steps == 0:
+            return 1.0
+        return 1.0 - self.misses / self.steps
+
+    def stats(self) -> Dict[str, float]:
+        """
+        :return: the cache statistics: symbols read, cache misses, flushes,
+                number of cached states and hit rate.
+        :rtype: Dict[str, float]
+        """
+        return {
+            "steps": self.steps,
+            "misses": self.misses,
+            "flushes": self.flushes,
+            "states": len(self.members),
+            "hit_rate": self.hit_rate(),
+        }
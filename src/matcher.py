@@ -0,0 +1,349 @@
+import DFA
+import mmap
+from typing import Iterable, List, Sequence, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class CompiledDFA:
+    """
+    This class represent an immutable, execution-only version of a DFA. It is
+        created with the `compile` function and provides fast membership
+        tests which do not print anything.
+
+    Attributes:
+         - `alphabet` (`str`): the alphabet of the automaton.
+         - `states` (`Tuple[str]`): the names of the states, indexed by id.
+         - `state_ids` (`Dict[str, int]`): the id of each state (see `DFA.state_ids`).
+         - `symbol_ids` (`Dict[str, int]`): interned symbol ids (see `DFA.symbol_ids`).
+         - `table` (`Tuple[int]`): the flat `state x symbol` table (see `DFA.table`).
+         - `init` (`int`): the id of the initial state, -1 if there is none.
+         - `finals` (`FrozenSet[int]`): the ids of the final states.
+         - `rows` (`Tuple[Dict[str, int]]`): for each state, maps the symbols to
+            the destination state id. Only transitions to useful states are kept.
+    """
+    __slots__ = ("alphabet", "states", "state_ids", "symbol_ids", "table", "init", "finals", "rows")
+
+    def __init__(self, dfa: DFA):
+        """
+        Freezes the specified DFA. States which cannot reach a final state are
+            dropped so that a run stops as soon as the word cannot be accepted.
+
+        :param dfa: the automaton to compile.
+        :type dfa: DFA
+        """
+        n_states = len(dfa.states)
+        # The analysis and the rows work per class of symbols (see
+        # `DFA.class_symbols`), only `table` is expanded to every symbol.
+        k = len(dfa.class_symbols)
+        table = tuple(DFA.select_columns(dfa.table, k, dfa.class_ids))
+
+        # Useful states: coaccessible states, computed backward from finals.
+        final_ids = frozenset(dfa.state_ids[state] for state in dfa.finals)
+        preds = [[] for _ in range(n_states)]
+        for index, dst in enumerate(dfa.table):
+            if dst >= 0:
+                preds[dst].append(index // k)
+        useful = [False] * n_states
+        to_visit = list(final_ids)
+        for state in to_visit:
+            useful[state] = True
+        while len(to_visit) > 0:
+            state = to_visit.pop()
+            for pred in preds[state]:
+                if not useful[pred]:
+                    useful[pred] = True
+                    to_visit.append(pred)
+
+        symbols = ["".join(dfa.alphabet[i] for i in ids) for ids in dfa.class_symbols]
+        rows = []
+        for state in range(n_states):
+            row = {}
+            if useful[state]:
+                base = state * k
+                for (class_symbols, dst) in zip(symbols, dfa.table[base:base + k]):
+                    if dst >= 0 and useful[dst]:
+                        row.update(dict.fromkeys(class_symbols, dst))
+            rows.append(row)
+
+        init = -1 if dfa.init is None else dfa.state_ids[dfa.init]
+        object.__setattr__(self, "alphabet", dfa.alphabet)
+        object.__setattr__(self, "states", tuple(dfa.states))
+        object.__setattr__(self, "state_ids", dict(dfa.state_ids))
+        object.__setattr__(self, "symbol_ids", dict(dfa.symbol_ids))
+        object.__setattr__(self, "table", table)
+        object.__setattr__(self, "init", init)
+        object.__setattr__(self, "finals", final_ids)
+        object.__setattr__(self, "rows", tuple(rows))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledDFA is immutable.")
+
+    def match(self, word: str) -> bool:
+        """
+        Returns True if the word is accepted by the automaton.
+
+        :param word: the word to be tested.
+        :type word: str
+        :return: True if the word is accepted, False otherwise.
+        :rtype: bool
+        """
+        rows = self.rows
+        state = self.init
+        if state < 0:
+            return False
+        try:
+            for symbol in word:
+                state = rows[state][symbol]
+        except KeyError:
+            return False
+        return state in self.finals
+
+    def match_many(self, words: Iterable[str]) -> List[int]:
+        """
+        Runs the automaton on each word and returns the indices of the accepted
+            words, in increasing order.
+
+        :param words: the words to be tested.
+        :type words: Iterable[str]
+        :return: the indices of the accepted words.
+        :rtype: List[int]
+        """
+        rows = self.rows
+        init = self.init
+        finals = self.finals
+        ret = []
+        if init < 0:
+            return ret
+        for index, word in enumerate(words):
+            state = init
+            try:
+                for symbol in word:
+                    state = rows[state][symbol]
+            except KeyError:
+                continue
+            if state in finals:
+                ret.append(index)
+        return ret
+
+def compile(dfa: DFA) -> CompiledDFA:
+    """
+    Compiles the specified DFA into an immutable matcher. Later modifications
+        of the DFA are not reflected in the matcher.
+
+    :param dfa: the DFA to be compiled.
+    :type dfa: DFA
+    :return: the compiled matcher.
+    :rtype: CompiledDFA
+    """
+    return CompiledDFA(dfa)
+
+class Scanner:
+    """
+    This class represent a resumable run of a DFA over an input given in
+        chunks. Chunks can be `str`, or any object supporting the buffer
+        protocol (`bytes`, `memoryview`, `mmap`...), in which case each byte
+        `b` is read as the symbol `chr(b)`. Chunks are never concatenated nor
+        copied, so the memory used does not depend on the size of the input.
+    """
+    def __init__(self, dfa: DFA):
+        """
+        Initialise the scanner on the initial state of the automaton.
+
+        :param dfa: the automaton to execute, a DFA or a CompiledDFA.
+        :type dfa: DFA
+        """
+        if not isinstance(dfa, CompiledDFA):
+            dfa = compile(dfa)
+        self.dfa : CompiledDFA = dfa
+        """ CompiledDFA: The executed automaton."""
+        self.byte_rows = tuple(
+            tuple(row.get(chr(b)) for b in range(256)) for row in dfa.rows)
+        """ Tuple[Tuple[int]]: For each state, the destination state id for
+            each byte value, None if the input can no longer be accepted."""
+        self.current : int = None
+        """ int: The id of the current state, None if the input can no
+            longer be accepted."""
+        self.position : int = 0
+        """ int: The number of symbols fed since the last reset."""
+        self.reset()
+
+    def reset(self, state: str = None, position: int = 0):
+        """
+        Resets the scanner. By default the run restarts from the initial state,
+            a previous run can be resumed by specifying the state and the
+            position it had reached.
+
+        :param state: the state to restart from, defaults to the initial state.
+        :type state: str, optional
+        :param position: the number of symbols already consumed, defaults to 0
+        :type position: int, optional
+        """
+        if state is None:
+            self.current = self.dfa.init if self.dfa.init >= 0 else None
+        else:
+            self.current = self.dfa.state_ids[state]
+            if len(self.dfa.rows[self.current]) == 0 and self.current not in self.dfa.finals:
+                self.current = None
+        self.position = position
+
+    def feed(self, chunk: Union[str, bytes, memoryview]) -> bool:
+        """
+        Advances the run on the specified chunk of input.
+
+        :param chunk: the next part of the input.
+        :type chunk: Union[str, bytes, memoryview]
+        :return: False if the input can no longer be accepted, True otherwise.
+        :rtype: bool
+        """
+        state = self.current
+        if isinstance(chunk, str):
+            self.position += len(chunk)
+            if state is None:
+                return False
+            rows = self.dfa.rows
+            try:
+                for symbol in chunk:
+                    state = rows[state][symbol]
+            except KeyError:
+                state = None
+        else:
+            view = memoryview(chunk)
+            if view.format != "B" or view.ndim != 1:
+                view = view.cast("B")
+            self.position += len(view)
+            if state is None:
+                return False
+            rows = self.byte_rows
+            try:
+                for byte in view:
+                    state = rows[state][byte]
+            except TypeError:
+                state = None
+        self.current = state
+        return state is not None
+
+    @property
+    def state(self) -> str:
+        """
+        :return: the name of the current state, None if the input can no longer
+                be accepted.
+        :rtype: str
+        """
+        if self.current is None:
+            return None
+        return self.dfa.states[self.current]
+
+    @property
+    def accepted(self) -> bool:
+        """
+        :return: True if the input fed so far is accepted, False otherwise.
+        :rtype: bool
+        """
+        return self.current in self.dfa.finals
+
+def scan_file(dfa: DFA, filename: str, chunk_size: int = 1 << 20) -> bool:
+    """
+    Runs the specified automaton on the content of a file, read as bytes. The
+        file is memory-mapped and fed chunk by chunk to a `Scanner`.
+
+    :param dfa: the automaton to execute, a DFA or a CompiledDFA.
+    :type dfa: DFA
+    :param filename: the name of the file.
+    :type filename: str
+    :param chunk_size: the size of the chunks, defaults to 1 MiB
+    :type chunk_size: int, optional
+    :return: True if the content of the file is accepted, False otherwise.
+    :rtype: bool
+    """
+    scanner = Scanner(dfa)
+    with open(filename, "rb") as file:
+        file.seek(0, 2)
+        if file.tell() == 0:
+            return scanner.accepted
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                for start in range(0, len(view), chunk_size):
+                    if not scanner.feed(view[start:start + chunk_size]):
+                        break
+            finally:
+                view.release()
+    return scanner.accepted
+
+def run_batch(dfa: DFA, words: Sequence[str], batch_size: int = 65536) -> "numpy.ndarray":
+    """
+    Runs the specified automaton simultaneously on many words and returns a
+        boolean mask of the accepted words. The words are encoded in a padded
+        matrix of symbol ids and all of them are advanced at once with NumPy
+        fancy indexing into the transition table. Missing transitions and
+        symbols which are not part of the alphabet lead to a sink state.
+        Requires NumPy.
+
+    :param dfa: the automaton to execute, a DFA or a CompiledDFA.
+    :type dfa: DFA
+    :param words: the words to be tested.
+    :type words: Sequence[str]
+    :param batch_size: the number of words encoded at once, bounds the size of
+            the padded matrix, defaults to 65536
+    :type batch_size: int, optional
+    :return: a boolean array, True for each accepted word.
+    :rtype: numpy.ndarray
+    """
+    if numpy is None:
+        raise ImportError("run_batch requires NumPy.")
+    if not isinstance(dfa, CompiledDFA):
+        dfa = compile(dfa)
+
+    n_words = len(words)
+    ret = numpy.zeros(n_words, dtype=bool)
+    if dfa.init < 0 or n_words == 0:
+        return ret
+
+    # Transition table with a sink row, an 'invalid' and a 'padding' column.
+    n_symbols = len(dfa.alphabet)
+    n_states = len(dfa.table) // n_symbols if n_symbols > 0 else len(dfa.rows)
+    sink = n_states
+    invalid = n_symbols
+    padding = n_symbols + 1
+    table = numpy.full((n_states + 1, n_symbols + 2), sink, dtype=numpy.int64)
+    if n_symbols > 0:
+        flat = numpy.array(dfa.table, dtype=numpy.int64).reshape(n_states, n_symbols)
+        table[:n_states, :n_symbols] = numpy.where(flat < 0, sink, flat)
+    table[:, padding] = numpy.arange(n_states + 1)
+    finals = numpy.zeros(n_states + 1, dtype=bool)
+    finals[list(dfa.finals)] = True
+
+    # Code point -> symbol id lookup.
+    codes = numpy.array(sorted(ord(symbol) for symbol in dfa.alphabet), dtype=numpy.uint32)
+    code_ids = numpy.array([dfa.symbol_ids[chr(code)] for code in codes], dtype=numpy.int64)
+    symbol_dtype = numpy.uint8 if padding < 256 else numpy.int64
+
+    for start in range(0, n_words, batch_size):
+        batch = words[start:start + batch_size]
+        lengths = numpy.fromiter((len(word) for word in batch), dtype=numpy.int64, count=len(batch))
+        max_len = int(lengths.max())
+        matrix = numpy.full((len(batch), max_len), padding, dtype=symbol_dtype)
+
+        if max_len > 0:
+            text = numpy.frombuffer("".join(batch).encode("utf-32-le"), dtype=numpy.uint32)
+            symbols = numpy.full(len(text), invalid, dtype=numpy.int64)
+            if len(codes) > 0:
+                pos = numpy.minimum(numpy.searchsorted(codes, text), len(codes) - 1)
+                found = codes[pos] == text
+                symbols[found] = code_ids[pos[found]]
+            offsets = numpy.cumsum(lengths) - lengths
+            rows = numpy.repeat(numpy.arange(len(batch)), lengths)
+            cols = numpy.arange(len(text)) - numpy.repeat(offsets, lengths)
+            matrix[rows, cols] = symbols
+
+        states = numpy.full(len(batch), dfa.init, dtype=numpy.int64)
+        for column in range(max_len):
+            states = table[states, matrix[:, column]]
+            if column % 16 == 15 and (states == sink).all():
+                break
+        ret[start:start + len(batch)] = finals[states]
+
+    return ret
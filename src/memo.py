@@ -0,0 +1,195 @@
+import DFA
+import algorithms
+import classes
+import util
+import collections
+import hashlib
+import json
+import os
+from array import array
+from typing import List
+
+def fingerprint(dfa: DFA) -> str:
+    """
+    Returns a hash (SHA-256, hexadecimal) of the whole content of the
+        specified automaton: alphabet, state names and order, initial state,
+        final states and transitions. Unlike `algorithms.canonical_hash`, it
+        identifies the exact automaton, so it can key the results of
+        algorithms which depend on state names.
+
+    :param dfa: the automaton considered.
+    :type dfa: DFA
+    :return: the hash of the automaton.
+    :rtype: str
+    """
+    (class_symbols, _) = classes.dfa_classes(dfa)
+    table = DFA.select_columns(dfa.table, len(dfa.class_symbols), [dfa.class_ids[ids[0]] for ids in class_symbols])
+    h = hashlib.sha256()
+    h.update(json.dumps([dfa.alphabet, dfa.states, dfa.init, dfa.finals, class_symbols]).encode("utf-8"))
+    h.update(array("q", table).tobytes())
+    return h.hexdigest()
+
+class Memo:
+    """
+    This class represent a bounded LRU cache of algorithm results, keyed by
+        the name of the algorithm and the fingerprints of its operands. The
+        results can also be stored in a directory, so that they survive the
+        process: DFAs are saved in binary format (see `util.save_binary`) and
+        lists of states in JSON.
+    """
+    def __init__(self, maxsize: int = 128, directory: str = None):
+        """
+        Initialise the cache.
+
+        :param maxsize: the maximal number of results kept in memory,
+                defaults to 128
+        :type maxsize: int, optional
+        :param directory: the directory in which the results are stored,
+                defaults to None (no on-disk cache).
+        :type directory: str, optional
+        """
+        self.maxsize : int = maxsize
+        """ int: The maximal number of results kept in memory."""
+        self.directory : str = directory
+        """ str: The directory of the on-disk cache, None if disabled."""
+        self.entries : collections.OrderedDict = collections.OrderedDict()
+        """ OrderedDict: The results kept in memory, from the least to the most
+            recently used."""
+        self.hits : int = 0
+        """ int: The number of results found in the cache."""
+        self.misses : int = 0
+        """ int: The number of results which had to be computed."""
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        """
+        :param key: the key of a result.
+        :type key: str
+        :return: the name of the file storing the result in the directory.
+        :rtype: str
+        """
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str):
+        """
+        Returns the result stored for the key, None if there is none.
+
+        :param key: the key of the result.
+        :type key: str
+        :return: the stored result.
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if self.directory is None:
+            return None
+        if os.path.exists(self.path(key) + ".bdfa"):
+            value = util.load_binary(self.path(key) + ".bdfa")
+        elif os.path.exists(self.path(key) + ".json"):
+            with open(self.path(key) + ".json", "r") as file:
+                value = json.load(file)
+        else:
+            return None
+        self.put(key, value, False)
+        return value
+
+    def put(self, key: str, value, store: bool = True):
+        """
+        Stores the result for the key, evicting the least recently used results
+            if the cache is full.
+
+        :param key: the key of the result.
+        :type key: str
+        :param value: the result, a DFA or a JSON-serializable value.
+        :param store: if True, the result is also written in the directory,
+                defaults to True
+        :type store: bool, optional
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        if store and self.directory is not None:
+            if isinstance(value, DFA.DFA):
+                util.save_binary(value, self.path(key) + ".bdfa")
+            else:
+                with open(self.path(key) + ".json", "w") as file:
+                    json.dump(value, file)
+
+    def clear(self):
+        """
+        Empties the in-memory cache. The on-disk cache is kept.
+        """
+        self.entries.clear()
+
+    def call(self, function, *dfas):
+        """
+        Returns the result of the function on the specified automata, computing
+            it only if it is not in the cache.
+
+        :param function: the algorithm, taking the automata as arguments.
+        :param dfas: the operands.
+        :return: the cached result (must not be modified).
+        """
+        key = function.__name__ + "-" + "-".join(fingerprint(dfa) for dfa in dfas)
+        value = self.get(key)
+        if value is None:
+            self.misses += 1
+            value = function(*dfas)
+            if value is not None:
+                self.put(key, value)
+        else:
+            self.hits += 1
+        return value
+
+CACHE = Memo()
+""" Memo: The cache used by the memoized algorithms of this module."""
+
+def configure(maxsize: int = 128, directory: str = None):
+    """
+    Replaces the cache used by the memoized algorithms.
+
+    :param maxsize: the maximal number of results kept in memory,
+            defaults to 128
+    :type maxsize: int, optional
+    :param directory: the directory of the on-disk cache, defaults to None
+    :type directory: str, optional
+    """
+    global CACHE
+    CACHE = Memo(maxsize, directory)
+
+def minimize(dfa: DFA) -> DFA:
+    """
+    Memoized version of `algorithms.minimize`.
+
+    :param dfa: the DFA to be minimized.
+    :type dfa: DFA
+    :return: the minimized DFA.
+    :rtype: DFA
+    """
+    return CACHE.call(algorithms.minimize, dfa).clone()
+
+def product(dfa1: DFA, dfa2: DFA) -> DFA:
+    """
+    Memoized version of `algorithms.product`.
+
+    :param dfa1: the first operand of the product.
+    :type dfa1: DFA
+    :param dfa2: the second operand of the product.
+    :type dfa2: DFA
+    :return: the product of the two DFAs.
+    :rtype: DFA
+    """
+    return CACHE.call(algorithms.product, dfa1, dfa2).clone()
+
+def equivalent_states(dfa: DFA) -> List[List[str]]:
+    """
+    Memoized version of `algorithms.equivalent_states`.
+
+    :param dfa: the DFA to search for equivalent states.
+    :type dfa: DFA
+    :return: a list of equivalent states lists.
+    :rtype: List[List[str]]
+    """
+    return [group.copy() for group in CACHE.call(algorithms.equivalent_states, dfa)]
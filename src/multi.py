@@ -0,0 +1,173 @@
+import DFA
+import algorithms
+import classes
+from array import array
+from typing import Dict, FrozenSet, Iterable, List
+
+class MultiDFA:
+    """
+    This class represent the union of several DFAs (the patterns) as a
+        single automaton, in which each state is tagged with the set of the
+        patterns accepting there. All the patterns are run in a single pass.
+        It is built with the `union` function.
+    """
+    def __init__(self, dfa: DFA, tags: Dict[str, FrozenSet[int]]):
+        """
+        Initialise the automaton.
+
+        :param dfa: the union automaton, its final states are the states
+                with at least one tag.
+        :type dfa: DFA
+        :param tags: maps each state of the DFA to the ids of the patterns
+                accepting there.
+        :type tags: Dict[str, FrozenSet[int]]
+        """
+        self.dfa : DFA = dfa
+        """ DFA: The union automaton."""
+        self.tags : Dict[str, FrozenSet[int]] = tags
+        """ Dict[str, FrozenSet[int]]: The ids of the patterns accepting in
+            each state."""
+        # The rows are filled per class of symbols (see `DFA.class_symbols`).
+        k = len(dfa.class_symbols)
+        symbols = ["".join(dfa.alphabet[i] for i in ids) for ids in dfa.class_symbols]
+        rows = []
+        for state in range(len(dfa.states)):
+            base = state * k
+            row = {}
+            for (class_symbols, dst) in zip(symbols, dfa.table[base:base + k]):
+                if dst >= 0:
+                    row.update(dict.fromkeys(class_symbols, dst))
+            rows.append(row)
+        self.rows : List[Dict[str, int]] = rows
+        """ List[Dict[str, int]]: For each state id, maps the symbols to the
+            destination state id."""
+        self.accepts : List[List[int]] = [sorted(tags[state]) for state in dfa.states]
+        """ List[List[int]]: For each state id, the sorted ids of the patterns
+            accepting there."""
+
+    def match(self, word: str) -> List[int]:
+        """
+        Runs all the patterns on the word and returns the ids of the patterns
+            accepting it.
+
+        :param word: the word to be tested.
+        :type word: str
+        :return: the sorted ids of the accepting patterns.
+        :rtype: List[int]
+        """
+        if self.dfa.init is None:
+            return []
+        rows = self.rows
+        state = self.dfa.state_ids[self.dfa.init]
+        try:
+            for symbol in word:
+                state = rows[state][symbol]
+        except KeyError:
+            return []
+        return self.accepts[state]
+
+    def match_many(self, words: Iterable[str]) -> List[List[int]]:
+        """
+        Runs all the patterns on each word.
+
+        :param words: the words to be tested.
+        :type words: Iterable[str]
+        :return: for each word, the sorted ids of the accepting patterns.
+        :rtype: List[List[int]]
+        """
+        return [self.match(word) for word in words]
+
+def union(dfas: List[DFA], max_states: int = None) -> MultiDFA:
+    """
+    Merges the specified DFAs (the patterns) into a single automaton whose
+        states are tagged with the ids (indices in the list) of the patterns
+        accepting there. The product of the patterns is explored from the
+        initial states; a component which can no longer reach a final state
+        is replaced by a dead marker, so that product states differing only
+        by dead components are merged, and the state in which every
+        component is dead is never built. The states are named "0", "1"...
+
+    :param dfas: the patterns.
+    :type dfas: List[DFA]
+    :param max_states: the maximal number of states of the union, defaults to
+            None (no limit).
+    :type max_states: int, optional
+    :return: the union automaton, None if the limit has been reached.
+    :rtype: MultiDFA
+    """
+    alphabet = "".join(dict.fromkeys(s for dfa in dfas for s in dfa.alphabet))
+    # The symbols are handled by equivalence classes (see
+    # `classes.symbol_class_ids`), ordered by their first symbol.
+    # columns[i][c]: the column of the class c in the table of the i-th DFA,
+    # -1 if its symbols are not in its alphabet.
+    class_ids = classes.symbol_class_ids(dfas, alphabet)
+    k = len(class_ids)
+    columns = [[algorithms.class_column(dfa, alphabet[ids[0]]) for ids in class_ids] for dfa in dfas]
+    widths = [len(dfa.class_symbols) for dfa in dfas]
+    live = [set(dfa.state_ids[state] for state in algorithms.coaccessible_states(dfa))
+            for dfa in dfas]
+    finals = [set(dfa.state_ids[state] for state in dfa.finals) for dfa in dfas]
+
+    states = []
+    ret_finals = []
+    table = array("l")
+    missing = array("l", [-1]) * k # Row of a new state.
+    tags = {}
+    ids = {} # Maps each tuple of component states to its id.
+    to_visit = []
+
+    def get_superstate(components: tuple) -> int:
+        """
+        Returns the id of the state corresponding to the tuple of component
+            states and add it to the union if it doesn't exist.
+
+        :param components: the state id in each pattern, -1 if dead.
+        :type components: tuple
+        :return: the id of the corresponding state, None if the limit is
+                reached.
+        :rtype: int
+        """
+        sstate = ids.get(components)
+        if sstate is None:
+            if max_states is not None and len(states) >= max_states:
+                return None
+            sstate = len(states)
+            ids[components] = sstate
+            states.append(str(sstate))
+            tag = frozenset(i for (i, q) in enumerate(components) if q in finals[i])
+            tags[states[-1]] = tag
+            if len(tag) > 0:
+                ret_finals.append(states[-1])
+            table.extend(missing)
+            to_visit.append((sstate, components))
+        return sstate
+
+    init = []
+    for (i, dfa) in enumerate(dfas):
+        q = -1 if dfa.init is None else dfa.state_ids[dfa.init]
+        init.append(q if q in live[i] else -1)
+    init = get_superstate(tuple(init))
+
+    while len(to_visit) > 0:
+        (sstate, components) = to_visit.pop()
+        base = sstate * k
+        for column in range(k):
+            dst = []
+            for (i, q) in enumerate(components):
+                dfa_column = columns[i][column]
+                if q < 0 or dfa_column < 0:
+                    dst.append(-1)
+                    continue
+                d = dfas[i].table[q * widths[i] + dfa_column]
+                dst.append(d if d in live[i] else -1)
+            dst = tuple(dst)
+            if all(q < 0 for q in dst):
+                continue
+            dst_sstate = get_superstate(dst)
+            if dst_sstate is None:
+                print("error : the union automaton exceeds " + str(max_states) + " states.")
+                return None
+            table[base + column] = dst_sstate
+
+    ret = DFA.DFA.from_table(alphabet, states, table, states[init], ret_finals, class_ids)
+    return MultiDFA(ret, tags)
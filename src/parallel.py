@@ -0,0 +1,269 @@
+import DFA
+import matcher
+import collections
+import mmap
+import multiprocessing
+import multiprocessing.util
+import os
+from array import array
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, List, Tuple, Union
+
+CHUNK_SIZE = 65536
+""" int: The number of words of an iterable sent at once to a worker by
+    `run_parallel`."""
+SHARD_SIZE = 1 << 24
+""" int: The approximate size in bytes of the parts of a file processed by a
+    worker at once by `run_parallel`."""
+
+class SharedTable:
+    """
+    This class represent the transition table of a compiled automaton stored
+        in shared memory, so that the workers of a process pool can read it
+        without receiving a copy. The block contains the flat `state x symbol`
+        table (int32, -1 for missing transitions or transitions to useless
+        states) followed by one byte per state, 1 for final states.
+    """
+    def __init__(self, dfa: matcher.CompiledDFA):
+        """
+        Copies the table of the compiled automaton into a new shared memory
+            block, which must be released with `close`.
+
+        :param dfa: the compiled automaton.
+        :type dfa: CompiledDFA
+        """
+        n_symbols = len(dfa.alphabet)
+        n_states = len(dfa.rows)
+        table = array("i", [-1]) * (n_states * n_symbols)
+        for (state, row) in enumerate(dfa.rows):
+            base = state * n_symbols
+            for (symbol, dst) in row.items():
+                table[base + dfa.symbol_ids[symbol]] = dst
+        finals = bytes(state in dfa.finals for state in range(n_states))
+
+        self.memory : shared_memory.SharedMemory = shared_memory.SharedMemory(
+            create=True, size=max(1, len(table) * table.itemsize + n_states))
+        """ SharedMemory: The shared memory block."""
+        self.memory.buf[:len(table) * table.itemsize] = table.tobytes()
+        self.memory.buf[len(table) * table.itemsize:len(table) * table.itemsize + n_states] = finals
+        self.spec : tuple = (self.memory.name, dfa.alphabet, n_states, dfa.init)
+        """ tuple: What a worker needs to attach the table (see
+            `attach_table`): the name of the block, the alphabet, the number of
+            states and the id of the initial state."""
+
+    def close(self):
+        """
+        Releases the shared memory block.
+        """
+        self.memory.close()
+        self.memory.unlink()
+
+worker_table = None
+""" The state of the current worker process, set by `attach_table`: the
+    shared memory block, the symbol ids, the number of states, the initial
+    state id and the number of symbols. The views on the block are only held
+    while a task runs, so that the block can be closed at any time."""
+
+def attach_table(spec: tuple):
+    """
+    Initialiser of the worker processes: attaches the shared table described
+        by `SharedTable.spec`.
+
+    :param spec: the description of the shared table.
+    :type spec: tuple
+    """
+    global worker_table
+    (name, alphabet, n_states, init) = spec
+    # The workers share the resource tracker of the parent process, which
+    # already tracks the block and unlinks it.
+    memory = shared_memory.SharedMemory(name=name)
+    # Closed when the worker exits, no view on the block is held by then.
+    multiprocessing.util.Finalize(memory, memory.close, exitpriority=10)
+    symbol_ids = {symbol: i for (i, symbol) in enumerate(alphabet)}
+    worker_table = (memory, symbol_ids, n_states, init, len(alphabet))
+
+def match_words(words: List[str]) -> Tuple[int, List[int]]:
+    """
+    Runs the shared automaton of the worker on each word.
+
+    :param words: the words to be tested.
+    :type words: List[str]
+    :return: the number of words and the indices of the accepted ones.
+    :rtype: Tuple[int, List[int]]
+    """
+    (memory, symbol_ids, n_states, init, n_symbols) = worker_table
+    ret = []
+    if init < 0:
+        return (len(words), ret)
+    size = n_states * n_symbols * 4
+    # The views are released on exit, even on errors.
+    with memory.buf[:size] as view, view.cast("i") as table, \
+            memory.buf[size:size + n_states] as finals:
+        match_table(words, symbol_ids, table, finals, init, n_symbols, ret)
+    return (len(words), ret)
+
+def match_table(words: List[str], symbol_ids: dict, table: memoryview, finals: memoryview,
+                init: int, n_symbols: int, ret: List[int]):
+    """
+    Runs an automaton given by views on a shared table on each word (see
+        `SharedTable`).
+
+    :param words: the words to be tested.
+    :type words: List[str]
+    :param symbol_ids: the id of each symbol.
+    :type symbol_ids: dict
+    :param table: the transition table.
+    :type table: memoryview
+    :param finals: the final flag of each state.
+    :type finals: memoryview
+    :param init: the id of the initial state.
+    :type init: int
+    :param n_symbols: the number of symbols.
+    :type n_symbols: int
+    :param ret: the list to which the indices of the accepted words are
+            appended.
+    :type ret: List[int]
+    """
+    for (index, word) in enumerate(words):
+        state = init
+        try:
+            for symbol in word:
+                state = table[state * n_symbols + symbol_ids[symbol]]
+                if state < 0:
+                    break
+        except KeyError:
+            continue
+        if state >= 0 and finals[state]:
+            ret.append(index)
+
+def match_shard(shard: Tuple[str, int, int]) -> Tuple[int, List[int]]:
+    """
+    Runs the shared automaton of the worker on each line of a part of a file.
+
+    :param shard: the name of the file and the byte range of the part, which
+            starts at the beginning of a line and ends after a newline or at
+            the end of the file. Lines may end with "\\n" or "\\r\\n".
+    :type shard: Tuple[str, int, int]
+    :return: the number of lines and the indices of the accepted ones in the
+            part.
+    :rtype: Tuple[int, List[int]]
+    """
+    (filename, start, end) = shard
+    with open(filename, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode("utf-8")
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+    return match_words(lines)
+
+def shards_of(filename: str, shard_size: int) -> List[Tuple[str, int, int]]:
+    """
+    Splits a file into parts of about `shard_size` bytes made of whole lines.
+
+    :param filename: the name of the file.
+    :type filename: str
+    :param shard_size: the approximate size of the parts.
+    :type shard_size: int
+    :return: the parts, as (filename, start, end) byte ranges.
+    :rtype: List[Tuple[str, int, int]]
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+    ret = []
+    with open(filename, "rb") as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            end = data.find(b"\n", min(start + shard_size, size) - 1)
+            end = size if end < 0 else end + 1
+            ret.append((filename, start, end))
+            start = end
+    return ret
+
+def chunks_of(words: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    """
+    :param words: the words.
+    :type words: Iterable[str]
+    :param chunk_size: the number of words of each chunk.
+    :type chunk_size: int
+    :return: an iterator over consecutive lists of words.
+    :rtype: Iterator[List[str]]
+    """
+    chunk = []
+    for word in words:
+        chunk.append(word)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+def run_parallel(dfa: DFA, source: Union[str, Iterable[str]], workers: int = None,
+                 chunk_size: int = CHUNK_SIZE, shard_size: int = SHARD_SIZE) -> Tuple[int, List[int]]:
+    """
+    Runs the specified automaton on many words with a pool of processes. The
+        source is either the name of a text file (UTF-8), whose lines are the
+        words (without the "\\n" or "\\r\\n"), or an iterable of words.
+
+    The transition table is compiled once and placed in shared memory, each
+        worker reads it from there instead of receiving a copy of the
+        automaton. Files are split into parts of whole lines which the
+        workers read themselves; iterables are sent in chunks of
+        `chunk_size` words. At most two tasks per worker are pending at once,
+        so the input is consumed as the workers progress, and the results are
+        gathered in order.
+
+    :param dfa: the automaton to execute, a DFA or a CompiledDFA.
+    :type dfa: DFA
+    :param source: the name of a file or the words.
+    :type source: Union[str, Iterable[str]]
+    :param workers: the number of processes, defaults to the number of CPUs.
+    :type workers: int, optional
+    :param chunk_size: the number of words sent at once, defaults to
+            `CHUNK_SIZE`
+    :type chunk_size: int, optional
+    :param shard_size: the approximate size in bytes of the parts of a file,
+            defaults to `SHARD_SIZE`
+    :type shard_size: int, optional
+    :return: the number of words and the indices of the accepted ones, in
+            increasing order.
+    :rtype: Tuple[int, List[int]]
+    """
+    if not isinstance(dfa, matcher.CompiledDFA):
+        dfa = matcher.compile(dfa)
+    if isinstance(source, (str, os.PathLike)):
+        tasks = shards_of(os.fspath(source), shard_size)
+        function = match_shard
+    else:
+        tasks = chunks_of(source, chunk_size)
+        function = match_words
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    n_words = 0
+    accepted = []
+    pending = collections.deque() # Results not gathered yet, in order.
+
+    def gather():
+        nonlocal n_words
+        (count, indices) = pending.popleft().get()
+        accepted.extend(n_words + index for index in indices)
+        n_words += count
+
+    table = SharedTable(dfa)
+    try:
+        with multiprocessing.Pool(workers, attach_table, (table.spec,)) as pool:
+            for task in tasks:
+                pending.append(pool.apply_async(function, (task,)))
+                if len(pending) >= 2 * workers:
+                    gather() # Bounds the number of chunks in memory.
+            while len(pending) > 0:
+                gather()
+            pool.close()
+            pool.join() # Lets the workers exit and close the block.
+    finally:
+        table.close()
+    return (n_words, accepted)
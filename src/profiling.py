@@ -0,0 +1,158 @@
+import collections
+import contextlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+ENABLED : bool = False
+""" bool: True if the instrumentation is enabled (see `enable`). When it is
+    disabled, the algorithms only test this flag once per call; the
+    transitions are counted per loop by their callers, never in
+    `DFA.dst_state`."""
+depth : int = 0
+""" int: The number of calls of `enable` not matched by a call of
+    `disable`."""
+lock : threading.Lock = threading.Lock()
+""" Lock: Protects `depth`, `ENABLED` and the updates of `counters` and
+    `timings`."""
+counters : collections.Counter = collections.Counter()
+""" Counter: The work counted by the algorithms, by name, such as
+    `"run.transitions"` or `"equivalent_states.splits"`."""
+timings : collections.Counter = collections.Counter()
+""" Counter: The total duration of each phase, in seconds (see `phase`)."""
+hooks : List[Callable[[str, str, Any], None]] = []
+""" List[Callable[[str, str, Any], None]]: The functions called on each event
+    with its kind (`"count"` or `"time"`), its name and its value (see
+    `add_hook`)."""
+
+def enable():
+    """
+    Enables the instrumentation. The calls can be nested: the
+        instrumentation stays enabled until each of them is matched by a call
+        of `disable`. The counters and timings are kept, see `reset`.
+    """
+    global ENABLED, depth
+    with lock:
+        depth += 1
+        ENABLED = True
+
+def disable():
+    """
+    Matches a call of `enable`. The instrumentation is disabled, and then
+        only costs a test of `ENABLED`, when every call is matched.
+    """
+    global ENABLED, depth
+    with lock:
+        depth = max(0, depth - 1)
+        ENABLED = depth > 0
+
+def reset():
+    """
+    Clears the counters and timings.
+    """
+    with lock:
+        counters.clear()
+        timings.clear()
+
+def add_hook(hook: Callable[[str, str, Any], None]):
+    """
+    Registers a function called on each event, for instance to export
+        metrics.
+
+    :param hook: a function taking the kind of the event (`"count"` or
+            `"time"`), its name and its value (the counted amount or the
+            duration in seconds).
+    :type hook: Callable[[str, str, Any], None]
+    """
+    hooks.append(hook)
+
+def remove_hook(hook: Callable[[str, str, Any], None]):
+    """
+    Unregisters a function registered with `add_hook`.
+
+    :param hook: the function.
+    :type hook: Callable[[str, str, Any], None]
+    """
+    hooks.remove(hook)
+
+def count(name: str, amount: int = 1):
+    """
+    Adds an amount of work to a counter and notifies the hooks. Does nothing
+        if the instrumentation is disabled.
+
+    :param name: the name of the counter.
+    :type name: str
+    :param amount: the amount added, defaults to 1
+    :type amount: int, optional
+    """
+    if not ENABLED:
+        return
+    with lock:
+        counters[name] += amount
+    for hook in hooks:
+        hook("count", name, amount)
+
+@contextlib.contextmanager
+def timed(name: str) -> Iterator[None]:
+    """ The context manager returned by `phase` when the instrumentation is
+        enabled."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        with lock:
+            timings[name] += duration
+        for hook in hooks:
+            hook("time", name, duration)
+
+NO_PHASE = contextlib.nullcontext()
+""" The context manager returned by `phase` when the instrumentation is
+    disabled."""
+
+def phase(name: str):
+    """
+    Returns a context manager timing the code it encloses, whose duration is
+        added to `timings[name]` and sent to the hooks. If the
+        instrumentation is disabled, the code is not timed.
+
+    :param name: the name of the phase.
+    :type name: str
+    :return: the context manager.
+    """
+    return timed(name) if ENABLED else NO_PHASE
+
+@contextlib.contextmanager
+def profile() -> Iterator[Dict[str, Dict[str, Any]]]:
+    """
+    Context manager enabling the instrumentation for the code it encloses.
+        It yields a dictionary which is filled on exit with the counters
+        (`"counters"`) and the timings (`"timings"`) of the enclosed code
+        only. The previous state of the instrumentation is restored on exit,
+        even if the code raises an exception.
+
+    :return: the context manager.
+    """
+    with lock:
+        before = (counters.copy(), timings.copy())
+    stats = {}
+    enable()
+    try:
+        yield stats
+    finally:
+        disable()
+        with lock:
+            stats["counters"] = dict(counters - before[0])
+            stats["timings"] = dict(timings - before[1])
+
+def report() -> str:
+    """
+    :return: a human readable summary of the counters and timings.
+    :rtype: str
+    """
+    lines = []
+    for name in sorted(counters):
+        lines.append("%-40s %12d" % (name, counters[name]))
+    for name in sorted(timings):
+        lines.append("%-40s %11.4fs" % (name, timings[name]))
+    return "\n".join(lines)
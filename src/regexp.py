@@ -0,0 +1,343 @@
+import DFA
+import FA
+import algorithms
+import functools
+
+CACHE_SIZE = 256
+""" int: The maximal number of compiled patterns kept by `compile_dfa` (see
+    `cached_dfa`)."""
+
+class RegexError(Exception):
+    """ Raised when a pattern is malformed."""
+    pass
+
+def parse(pattern: str) -> tuple:
+    """
+    Parses the specified regular expression and returns its syntax tree. The
+        supported syntax is: concatenation, alternation `|`, the operators
+        `*`, `+` and `?`, parentheses, the wildcard `.`, character classes
+        such as `[abc]`, `[a-z]` or `[^ab]` and escaping with `\\`. An empty
+        expression (or alternative) matches the empty word.
+
+    The nodes of the tree are tuples: `("empty",)`, `("any",)`,
+        `("set", negated, ranges)` where ranges is a list of (first, last)
+        characters, `("cat", nodes)`, `("alt", nodes)` and
+        `("star" | "plus" | "opt", node)`.
+
+    :param pattern: the regular expression.
+    :type pattern: str
+    :raises RegexError: if the pattern is malformed.
+    :return: the syntax tree.
+    :rtype: tuple
+    """
+    position = 0
+
+    def error(message: str):
+        """
+        Raises a RegexError located at the current position.
+
+        :param message: the description of the error.
+        :type message: str
+        """
+        raise RegexError(message + " at position " + str(position) + " in '" + pattern + "'.")
+
+    def peek() -> str:
+        """
+        :return: the current character, None at the end of the pattern.
+        :rtype: str
+        """
+        return pattern[position] if position < len(pattern) else None
+
+    def parse_char() -> str:
+        """
+        Consumes a character, handling escaping.
+
+        :return: the character.
+        :rtype: str
+        """
+        nonlocal position
+        char = peek()
+        if char is None:
+            error("unexpected end")
+        position += 1
+        if char == "\\":
+            char = peek()
+            if char is None:
+                error("dangling escape")
+            position += 1
+        return char
+
+    def parse_alt() -> tuple:
+        """ alt := cat ('|' cat)*"""
+        nonlocal position
+        nodes = [parse_cat()]
+        while peek() == "|":
+            position += 1
+            nodes.append(parse_cat())
+        return nodes[0] if len(nodes) == 1 else ("alt", nodes)
+
+    def parse_cat() -> tuple:
+        """ cat := repeat*"""
+        nodes = []
+        while peek() is not None and peek() not in "|)":
+            nodes.append(parse_repeat())
+        if len(nodes) == 0:
+            return ("empty",)
+        return nodes[0] if len(nodes) == 1 else ("cat", nodes)
+
+    def parse_repeat() -> tuple:
+        """ repeat := atom ('*' | '+' | '?')*"""
+        nonlocal position
+        node = parse_atom()
+        while peek() is not None and peek() in "*+?":
+            node = ({"*": "star", "+": "plus", "?": "opt"}[peek()], node)
+            position += 1
+        return node
+
+    def parse_atom() -> tuple:
+        """ atom := '(' alt ')' | '[' class ']' | '.' | char"""
+        nonlocal position
+        char = peek()
+        if char == "(":
+            position += 1
+            node = parse_alt()
+            if peek() != ")":
+                error("missing ')'")
+            position += 1
+            return node
+        if char == "[":
+            position += 1
+            negated = peek() == "^"
+            if negated:
+                position += 1
+            ranges = []
+            while len(ranges) == 0 or peek() != "]":
+                first = parse_char()
+                last = first
+                if peek() == "-" and position + 1 < len(pattern) and pattern[position + 1] != "]":
+                    position += 1
+                    last = parse_char()
+                    if last < first:
+                        error("invalid range '" + first + "-" + last + "'")
+                ranges.append((first, last))
+            position += 1
+            return ("set", negated, ranges)
+        if char == ".":
+            position += 1
+            return ("any",)
+        if char in "*+?":
+            error("nothing to repeat")
+        char = parse_char()
+        return ("set", False, [(char, char)])
+
+    tree = parse_alt()
+    if position != len(pattern):
+        error("unbalanced ')'")
+    return tree
+
+def symbols_of(tree: tuple) -> str:
+    """
+    Returns the symbols appearing in the specified syntax tree, in order of
+        appearance. Ranges are expanded.
+
+    :param tree: the syntax tree (see `parse`).
+    :type tree: tuple
+    :return: the string of the symbols.
+    :rtype: str
+    """
+    symbols = {}
+    to_visit = [tree]
+    while len(to_visit) > 0:
+        node = to_visit.pop()
+        if node[0] == "set":
+            for (first, last) in node[2]:
+                for code in range(ord(first), ord(last) + 1):
+                    symbols[chr(code)] = None
+        elif node[0] in ("cat", "alt"):
+            to_visit.extend(reversed(node[1]))
+        elif node[0] in ("star", "plus", "opt"):
+            to_visit.append(node[1])
+    return "".join(symbols)
+
+def to_fa(pattern: str, alphabet: str = None) -> FA:
+    """
+    Returns a finite automaton (with epsilon transitions) recognizing the
+        language of the specified regular expression (see `build_fa`).
+
+    :param pattern: the regular expression (see `parse`).
+    :type pattern: str
+    :param alphabet: the alphabet of the automaton, defaults to the symbols
+            appearing in the pattern.
+    :type alphabet: str, optional
+    :return: the automaton, None if the pattern is malformed.
+    :rtype: FA
+    """
+    try:
+        return build_fa(pattern, alphabet)
+    except RegexError as e:
+        print("error : " + str(e))
+        return None
+
+def build_fa(pattern: str, alphabet: str = None) -> FA:
+    """
+    Returns a finite automaton (with epsilon transitions) recognizing the
+        language of the specified regular expression, using Thompson's
+        construction. The states are named "0", "1", ...
+
+    Character classes and the wildcard are interpreted relatively to the
+        alphabet: `.` is any symbol of the alphabet, `[a-z]` the symbols of
+        the alphabet in the range and `[^ab]` the other symbols of the
+        alphabet. Every literal symbol must be part of the alphabet.
+
+    :param pattern: the regular expression (see `parse`).
+    :type pattern: str
+    :param alphabet: the alphabet of the automaton, defaults to the symbols
+            appearing in the pattern.
+    :type alphabet: str, optional
+    :return: the automaton.
+    :rtype: FA
+    :raises RegexError: if the pattern is malformed.
+    """
+    tree = parse(pattern)
+    if alphabet is None:
+        alphabet = symbols_of(tree)
+    alphabet = "".join(dict.fromkeys(alphabet))
+    ret = FA.FA(alphabet)
+
+    def new_state() -> str:
+        """
+        :return: the name of a new state of the automaton.
+        :rtype: str
+        """
+        state = str(len(ret.states))
+        ret.add_state(state)
+        return state
+
+    def symbols(node: tuple) -> str:
+        """
+        Returns the symbols of the alphabet matched by a set or wildcard node.
+
+        :param node: the node.
+        :type node: tuple
+        :return: the matched symbols.
+        :rtype: str
+        """
+        if node[0] == "any":
+            return alphabet
+        (_, negated, ranges) = node
+        if not negated and len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+            if ranges[0][0] not in alphabet:
+                raise RegexError("the symbol '" + ranges[0][0] + "' is not part of the alphabet.")
+            return ranges[0][0]
+        inside = lambda s : any(first <= s <= last for (first, last) in ranges)
+        return "".join(s for s in alphabet if inside(s) != negated)
+
+    def build(node: tuple) -> tuple:
+        """
+        Adds the sub-automaton of the node, with a single initial state and a
+            single final state.
+
+        :param node: the node.
+        :type node: tuple
+        :return: the pair (initial state, final state).
+        :rtype: tuple
+        """
+        kind = node[0]
+        if kind in ("cat", "alt"):
+            parts = [build(child) for child in node[1]]
+            if kind == "cat":
+                for (left, right) in zip(parts, parts[1:]):
+                    ret.add_transition(left[1], FA.EPSILON, right[0])
+                return (parts[0][0], parts[-1][1])
+            start = new_state()
+            end = new_state()
+            for (first, last) in parts:
+                ret.add_transition(start, FA.EPSILON, first)
+                ret.add_transition(last, FA.EPSILON, end)
+            return (start, end)
+        if kind in ("star", "plus", "opt"):
+            (first, last) = build(node[1])
+            start = new_state()
+            end = new_state()
+            ret.add_transition(start, FA.EPSILON, first)
+            ret.add_transition(last, FA.EPSILON, end)
+            if kind != "plus":
+                ret.add_transition(start, FA.EPSILON, end)
+            if kind != "opt":
+                ret.add_transition(last, FA.EPSILON, first)
+            return (start, end)
+        start = new_state()
+        end = new_state()
+        if kind == "empty":
+            ret.add_transition(start, FA.EPSILON, end)
+        else:
+            for symbol in symbols(node):
+                ret.add_transition(start, symbol, end)
+        return (start, end)
+
+    (start, end) = build(tree)
+    ret.init = start
+    ret.finals.append(end)
+    return ret
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def cached_dfa(pattern: str, alphabet: str = None) -> DFA:
+    """
+    Returns the minimal DFA of the specified regular expression, kept in a LRU
+        cache keyed by pattern and alphabet. Malformed patterns raise an
+        exception, which is not cached. The result is shared and must not be
+        modified: `compile_dfa` returns copies.
+
+    :param pattern: the regular expression (see `parse`).
+    :type pattern: str
+    :param alphabet: the alphabet of the automaton (see `to_fa`).
+    :type alphabet: str, optional
+    :return: the shared minimal DFA.
+    :rtype: DFA
+    :raises RegexError: if the pattern is malformed.
+    """
+    fa = build_fa(pattern, alphabet)
+    dfa = algorithms.minimize(algorithms.determinize(fa))
+
+    # Rename the states "0", "1"... in order, the ids and the table are kept.
+    names = {state: str(i) for (i, state) in enumerate(dfa.states)}
+    finals = set(dfa.finals)
+    return DFA.DFA.from_table(dfa.alphabet, list(names.values()), dfa.table,
+                              None if dfa.init is None else names[dfa.init],
+                              [names[state] for state in dfa.states if state in finals], dfa.class_symbols)
+
+def compile_dfa(pattern: str, alphabet: str = None) -> DFA:
+    """
+    Returns the minimal DFA of the specified regular expression, with the
+        states named "0", "1", ... Repeated compilations of the same pattern
+        and alphabet are served from the cache of `cached_dfa`, the result is
+        a copy-on-write clone (see `DFA.clone`) which can be modified without
+        affecting the cache.
+
+    :param pattern: the regular expression (see `parse`).
+    :type pattern: str
+    :param alphabet: the alphabet of the automaton (see `to_fa`).
+    :type alphabet: str, optional
+    :return: the minimal DFA.
+    :rtype: DFA
+    :raises RegexError: if the pattern is malformed.
+    """
+    return cached_dfa(pattern, alphabet).clone()
+
+def to_dfa(pattern: str, alphabet: str = None) -> DFA:
+    """
+    Returns the minimal DFA of the specified regular expression (see
+        `compile_dfa`). Print error if the pattern is malformed.
+
+    :param pattern: the regular expression (see `parse`).
+    :type pattern: str
+    :param alphabet: the alphabet of the automaton (see `to_fa`).
+    :type alphabet: str, optional
+    :return: the minimal DFA, None if the pattern is malformed.
+    :rtype: DFA
+    """
+    try:
+        return compile_dfa(pattern, alphabet)
+    except RegexError as e:
+        print("error : " + str(e))
+        return None
@@ -0,0 +1,195 @@
+import DFA
+import matcher
+import re
+from typing import Dict, Iterator, List, Tuple
+
+CACHE_SIZE = 10000
+""" int: The maximal number of transitions of the search automaton kept in
+    cache by `finditer`."""
+
+def skip_pattern(dfa: matcher.CompiledDFA) -> "re.Pattern":
+    """
+    Returns a compiled Python regular expression matching the symbols which can
+        start a match. The search automaton loops on its idle state on every
+        other symbol, so those can be skipped at once.
+
+    :param dfa: the compiled automaton.
+    :type dfa: CompiledDFA
+    :return: the pattern of the starting symbols, None if no symbol can start
+            a match.
+    :rtype: re.Pattern
+    """
+    first = dfa.rows[dfa.init].keys()
+    if len(first) == 0:
+        return None
+    return re.compile("[" + "".join(re.escape(symbol) for symbol in first) + "]")
+
+def finditer(dfa: DFA, text: str, mode: str = "leftmost-longest") -> Iterator[Tuple[int, int]]:
+    """
+    Finds the factors of the text accepted by the automaton and yields their
+        spans (start, end), such that `text[start:end]` is accepted.
+
+    The modes are:
+         - `"leftmost-longest"`: like `re.finditer`, non-overlapping matches
+            from left to right, the longest match is chosen among the matches
+            starting at the leftmost position. Empty matches are reported.
+         - `"all"`: every accepted factor, ordered by end then start.
+
+    The text is scanned with the unanchored search automaton of the DFA (the
+        runs started at every position, simulated together), whose
+        transitions are computed on demand and cached. On its idle state,
+        symbols which cannot start a match are skipped at once.
+
+    :param dfa: the automaton, a DFA or a CompiledDFA.
+    :type dfa: DFA
+    :param text: the text to search.
+    :type text: str
+    :param mode: the search mode, defaults to "leftmost-longest"
+    :type mode: str, optional
+    :return: an iterator over the spans of the matches.
+    :rtype: Iterator[Tuple[int, int]]
+    """
+    if not isinstance(dfa, matcher.CompiledDFA):
+        dfa = matcher.compile(dfa)
+    if mode == "leftmost-longest":
+        return leftmost_longest(dfa, text)
+    if mode == "all":
+        return all_matches(dfa, text)
+    print("error : unknown mode '" + str(mode) + "'.")
+    return iter(())
+
+def leftmost_longest(dfa: matcher.CompiledDFA, text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the spans of the leftmost-longest non-overlapping matches, see
+        `finditer`.
+
+    A state of the search automaton is the tuple of the states of the active
+        runs, ordered by starting position. When two runs reach the same state
+        only the earliest one is kept, since it has priority.
+
+    :param dfa: the compiled automaton.
+    :type dfa: CompiledDFA
+    :param text: the text to search.
+    :type text: str
+    :return: an iterator over the spans of the matches.
+    :rtype: Iterator[Tuple[int, int]]
+    """
+    init = dfa.init
+    if init < 0:
+        return
+    rows = dfa.rows
+    finals = dfa.finals
+    skip = None if init in finals else skip_pattern(dfa)
+    if init not in finals and skip is None:
+        return # No match can start.
+    cache : Dict[Tuple[tuple, str], Tuple[tuple, List[int]]] = {}
+    idle = (init,)
+
+    position = 0
+    while position <= len(text):
+        threads = idle
+        starts = [position]
+        best = None
+        while True:
+            if best is None and len(threads) == 1 and threads[0] == init and skip is not None:
+                # Idle: jump to the next symbol which can start a match.
+                # The current run, if any, dies on the skipped symbols.
+                found = skip.search(text, position)
+                if found is None:
+                    return
+                if found.start() > position:
+                    position = found.start()
+                    starts = [position]
+
+            # Keep the leftmost accepting run, drop the ones starting after it.
+            for (index, state) in enumerate(threads):
+                if state in finals:
+                    best = (starts[index], position)
+                    threads = threads[:index + 1]
+                    starts = starts[:index + 1]
+                    break
+
+            if position == len(text):
+                break
+            key = (threads, text[position], best is None)
+            step = cache.get(key)
+            if step is None:
+                new_threads = []
+                sources = []
+                for (index, state) in enumerate(threads):
+                    dst = rows[state].get(key[1])
+                    if dst is not None and dst not in new_threads:
+                        new_threads.append(dst)
+                        sources.append(index)
+                if key[2] and init not in new_threads:
+                    new_threads.append(init) # A new run starts at the next position.
+                    sources.append(-1)
+                step = (tuple(new_threads), sources)
+                if len(cache) >= CACHE_SIZE:
+                    cache.clear()
+                cache[key] = step
+            position += 1
+            (threads, sources) = step
+            starts = [position if source < 0 else starts[source] for source in sources]
+            if len(threads) == 0:
+                break
+
+        if best is None:
+            return
+        yield best
+        position = best[1] if best[1] > best[0] else best[1] + 1
+
+def all_matches(dfa: matcher.CompiledDFA, text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the spans of all the accepted factors, ordered by end then start,
+        see `finditer`.
+
+    :param dfa: the compiled automaton.
+    :type dfa: CompiledDFA
+    :param text: the text to search.
+    :type text: str
+    :return: an iterator over the spans of the matches.
+    :rtype: Iterator[Tuple[int, int]]
+    """
+    init = dfa.init
+    if init < 0:
+        return
+    rows = dfa.rows
+    finals = dfa.finals
+    skip = None if init in finals else skip_pattern(dfa)
+    if init not in finals and skip is None:
+        return # No match can start.
+
+    threads : Dict[int, List[int]] = {} # Maps each active state to the starts of its runs.
+    position = 0
+    while True:
+        if len(threads) == 0 and skip is not None:
+            found = skip.search(text, position)
+            if found is None:
+                return
+            position = found.start()
+        if init in threads:
+            threads[init].append(position)
+        else:
+            threads[init] = [position]
+
+        ends = []
+        for (state, starts) in threads.items():
+            if state in finals:
+                ends.extend(starts)
+        for start in sorted(ends):
+            yield (start, position)
+
+        if position == len(text):
+            return
+        symbol = text[position]
+        new_threads = {}
+        for (state, starts) in threads.items():
+            dst = rows[state].get(symbol)
+            if dst is not None:
+                if dst in new_threads:
+                    new_threads[dst] = sorted(new_threads[dst] + starts)
+                else:
+                    new_threads[dst] = starts
+        threads = new_threads
+        position += 1
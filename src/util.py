@@ -1,20 +1,80 @@
 from subprocess import call
+from array import array
+import mmap
+import os
+import re
+import struct
+import sys
 import DFA
 
+BINARY_MAGIC = b"AUMALDFA"
+""" bytes: The magic number starting the binary DFA files."""
+BINARY_VERSION = 1
+""" int: The version of the binary DFA format written by `save_binary`."""
+BINARY_HEADER = struct.Struct("<8sIIIIiQQ")
+""" struct.Struct: The header of the binary DFA format: magic, version,
+    number of symbols, of states and of final states, id of the initial
+    state (-1 if none), size of the alphabet and of the state names in
+    bytes."""
+
 def read(filename: str) -> DFA:
     """
-    Read the specified dfa from a file. A DFA can be saved with the 'save' function.
+    Read the specified dfa from a file. A DFA can be saved with the 'save' or
+        the 'save_binary' function, the format is detected automatically. The
+        text format is parsed, never executed.
 
     :param filename: the file in which the DFA is stored.
     :type filename: str
-    :return: the DFA from the file.
+    :return: the DFA from the file, None if the file is malformed.
     :rtype: DFA
     """
-    local_dict = locals()
+    with open(filename, "rb") as file:
+        magic = file.read(len(BINARY_MAGIC))
+    if magic == BINARY_MAGIC:
+        return load_binary(filename)
+    return read_text(filename)
+
+def read_text(filename: str) -> DFA:
+    """
+    Read the specified dfa from a file in text format, as written by 'save'.
+
+    :param filename: the file in which the DFA is stored.
+    :type filename: str
+    :return: the DFA from the file, None if the file is malformed.
+    :rtype: DFA
+    """
+    patterns = (
+        ("alphabet", re.compile(r'a = DFA\.DFA\("(.*)"\)$')),
+        ("state", re.compile(r'a\.add_state\("(.*)"(, True)?\)$')),
+        ("init", re.compile(r'a\.init = "(.*)"$')),
+        ("transition", re.compile(r'a\.add_transition\("(.*)", "(.)", "(.*)"\)$')),
+    )
+    a = None
     with open(filename, "r") as file:
-        exec(compile(open(filename).read(), filename, 'exec'), globals(), local_dict)
+        for (number, line) in enumerate(file, 1):
+            line = line.strip()
+            if line == "":
+                continue
+            for (kind, pattern) in patterns:
+                match = pattern.match(line)
+                if match is not None:
+                    break
+            else:
+                print("error : " + filename + ":" + str(number) + ": unexpected line '" + line + "'.")
+                return None
+            if kind == "alphabet":
+                a = DFA.DFA(match.group(1))
+            elif a is None:
+                print("error : " + filename + ":" + str(number) + ": the automaton is not created.")
+                return None
+            elif kind == "state":
+                a.add_state(match.group(1), match.group(2) is not None)
+            elif kind == "init":
+                a.init = match.group(1)
+            else:
+                a.add_transition(match.group(1), match.group(2), match.group(3))
 
-    return local_dict["a"]
+    return a
 
 def save(dfa: DFA, filename: str):
     """
@@ -25,21 +85,145 @@ def save(dfa: DFA, filename: str):
     :param filename: the name of the file in which the automaton will be saved.
     :type filename: str
     """
-    txt = "a = DFA.DFA(\"" + dfa.alphabet + "\")\n"
+    finals = set(dfa.finals)
+    lines = ["a = DFA.DFA(\"" + dfa.alphabet + "\")\n"]
     for state in dfa.states:
-        if state in dfa.finals:
-            txt += "a.add_state(\"" + state + "\", True)\n"
+        if state in finals:
+            lines.append("a.add_state(\"" + state + "\", True)\n")
         else:
-            txt += "a.add_state(\"" + state + "\")\n"
+            lines.append("a.add_state(\"" + state + "\")\n")
 
-    txt += "\na.init = \"" + dfa.init + "\"\n\n"
+    lines.append("\na.init = \"" + dfa.init + "\"\n\n")
 
     for state in dfa.states:
         for (symbol, dst_state) in dfa.transitions[state]:
-            txt += "a.add_transition(\"" + state + "\", \"" + symbol + "\", \"" + dst_state + "\")\n"
+            lines.append("a.add_transition(\"" + state + "\", \"" + symbol + "\", \"" + dst_state + "\")\n")
 
     with open(filename, "w") as file:
-        file.write(txt)
+        file.writelines(lines)
+
+def save_binary(dfa: DFA, filename: str):
+    """
+    Save the specified dfa into a file, in binary format. A DFA can be read
+        with the 'read' or 'load_binary' functions.
+
+    The format is a header (see `BINARY_HEADER`) followed by the alphabet in
+        UTF-8, the character offsets of the state names (uint64), the state
+        names in UTF-8, the ids of the final states (uint32) and the flat
+        `state x symbol` transition table (int32, see `DFA.table`). Each
+        section starts on an 8-byte boundary.
+
+    :param dfa: the DFA to save
+    :type dfa: DFA
+    :param filename: the name of the file in which the automaton will be saved.
+    :type filename: str
+    """
+    alphabet = dfa.alphabet.encode("utf-8")
+    offsets = array("Q", [0])
+    for state in dfa.states:
+        offsets.append(offsets[-1] + len(state))
+    names = "".join(dfa.states).encode("utf-8")
+    finals = array("I", (dfa.state_ids[state] for state in dfa.finals))
+    table = array("i", DFA.select_columns(dfa.table, len(dfa.class_symbols), dfa.class_ids))
+    init = -1 if dfa.init is None else dfa.state_ids[dfa.init]
+    if sys.byteorder != "little":
+        for section in (offsets, finals, table):
+            section.byteswap()
+
+    padding = lambda size : b"\0" * (-size % 8)
+    with open(filename, "wb") as file:
+        file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(dfa.alphabet),
+                                      len(dfa.states), len(finals), init, len(alphabet), len(names)))
+        for section in (alphabet, offsets.tobytes(), names, finals.tobytes(), table.tobytes()):
+            file.write(section)
+            file.write(padding(len(section)))
+
+def load_binary(filename: str) -> DFA:
+    """
+    Read the specified dfa from a file in binary format, as written by
+        'save_binary'. The file is memory-mapped and the sections are read
+        through views on the mapping, without intermediate arrays: the
+        transition table is converted once, from the mapped int32 values to
+        the table of the DFA, which is built in bulk (see `DFA.from_table`).
+        On big-endian machines the sections are copied to be byte-swapped.
+
+    :param filename: the file in which the DFA is stored.
+    :type filename: str
+    :return: the DFA from the file, None if the file is malformed.
+    :rtype: DFA
+    """
+    with open(filename, "rb") as file:
+        # An empty file cannot be mapped, the header check must come first.
+        if os.fstat(file.fileno()).st_size < BINARY_HEADER.size:
+            print("error : " + filename + " is not a binary DFA file.")
+            return None
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    with data:
+        view = memoryview(data)
+        sections = [] # Views on the alphabet, offsets, names, finals and table.
+        try:
+            (magic, version, n_symbols, n_states, n_finals, init, alphabet_size,
+             names_size) = BINARY_HEADER.unpack_from(view)
+            if magic != BINARY_MAGIC:
+                print("error : " + filename + " is not a binary DFA file.")
+                return None
+            if version != BINARY_VERSION:
+                print("error : unsupported binary DFA version " + str(version) + ".")
+                return None
+
+            position = BINARY_HEADER.size
+            for (size, fmt) in ((alphabet_size, "B"), (8 * (n_states + 1), "Q"), (names_size, "B"),
+                                (4 * n_finals, "I"), (4 * n_states * n_symbols, "i")):
+                if position + size > len(view):
+                    print("error : " + filename + " is truncated.")
+                    return None
+                sections.append(view[position:position + size].cast(fmt))
+                position += size + (-size % 8)
+
+            (alphabet, offsets, names, finals, table) = sections
+            if sys.byteorder != "little":
+                (offsets, finals, table) = (array(section.format, section) for section in (offsets, finals, table))
+                for section in (offsets, finals, table):
+                    section.byteswap()
+            alphabet = str(alphabet, "utf-8")
+            names = str(names, "utf-8")
+            states = [names[offsets[i]:offsets[i + 1]] for i in range(n_states)]
+            return DFA.DFA.from_table(alphabet, states, table,
+                                      None if init < 0 else states[init],
+                                      [states[i] for i in finals])
+        except (UnicodeDecodeError, DFA.BuildError, IndexError):
+            print("error : " + filename + " is corrupted.")
+            return None
+        finally:
+            for section in sections:
+                section.release()
+            view.release()
+
+def text_to_binary(src_filename: str, dst_filename: str):
+    """
+    Converts a DFA file from the text format to the binary format.
+
+    :param src_filename: the name of the text file.
+    :type src_filename: str
+    :param dst_filename: the name of the binary file to write.
+    :type dst_filename: str
+    """
+    a = read_text(src_filename)
+    if a is not None:
+        save_binary(a, dst_filename)
+
+def binary_to_text(src_filename: str, dst_filename: str):
+    """
+    Converts a DFA file from the binary format to the text format.
+
+    :param src_filename: the name of the binary file.
+    :type src_filename: str
+    :param dst_filename: the name of the text file to write.
+    :type dst_filename: str
+    """
+    a = load_binary(src_filename)
+    if a is not None:
+        save(a, dst_filename)
 
 def to_dot(dfa: DFA, **kwargs) -> str:
     """
@@ -64,13 +248,14 @@ def to_dot(dfa: DFA, **kwargs) -> str:
     ret = "digraph " + kwargs["name"] + " {\n    bgcolor=\"transparent\";\nrankdir=\"LR\";\n\n"
     ret += "    // States (" + str(len(dfa.states)) + ")\n"
 
-    state_name = lambda s : "Q_" + str(dfa.states.index(s))
+    state_name = lambda s : "Q_" + str(dfa.state_ids[s])
+    finals = set(dfa.finals)
 
     # States
     ret += "    node [shape = point ];     __Qi__ // Initial state\n" # Initial state
     for state in dfa.states:
         ret += "    "
-        if state in dfa.finals:
+        if state in finals:
             ret += "node [shape=doublecircle]; "
         else:
             ret += "node [shape=circle];       "
@@ -0,0 +1,49 @@
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import DFA
+import FA
+
+def words(alphabet: str, max_len: int):
+    """ All the words over the alphabet of length at most max_len."""
+    for n in range(max_len + 1):
+        for word in itertools.product(alphabet, repeat=n):
+            yield "".join(word)
+
+def accepts(dfa: DFA, word: str) -> bool:
+    """ Reference run of a DFA, one dst_state call per symbol."""
+    state = dfa.init
+    for symbol in word:
+        if state is None or symbol not in dfa.symbol_ids:
+            return False
+        state = dfa.dst_state(state, symbol)
+    return state is not None and state in dfa.finals
+
+def fa_accepts(fa: FA, word: str) -> bool:
+    """ Reference run of a FA, simulating the set of current states."""
+    def closure(states):
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            for (symbol, dst) in fa.transitions[stack.pop()]:
+                if symbol == FA.EPSILON and dst not in seen:
+                    seen.add(dst)
+                    stack.append(dst)
+        return seen
+    current = closure({fa.init})
+    for symbol in word:
+        current = closure({dst for state in current for (s, dst) in fa.transitions[state] if s == symbol})
+    return any(state in fa.finals for state in current)
+
+def make_dfa(alphabet: str, states, transitions, init=None, finals=()) -> DFA:
+    """ Builds a DFA with the legacy API from (src, symbol, dst) triples."""
+    dfa = DFA.DFA(alphabet)
+    for state in states:
+        dfa.add_state(state, state in finals)
+    dfa.init = states[0] if init is None else init
+    for (src, symbol, dst) in transitions:
+        dfa.add_transition(src, symbol, dst)
+    return dfa
@@ -0,0 +1,134 @@
+import random
+
+import pytest
+
+import DFA
+import algorithms
+from bench import generators
+from conftest import accepts, fa_accepts, words
+
+SEEDS = range(40)
+
+def small_dfa(seed: int, alphabet: str = "ab") -> DFA:
+    r = random.Random(seed)
+    return generators.random_dfa(r.randint(1, 5), alphabet, density=r.choice([1.0, 0.7]),
+                                 final_ratio=r.choice([0.2, 0.5]), seed=seed)
+
+def moore_classes(dfa: DFA):
+    """ Reference: the groups of equivalent states by Moore refinement, the
+        missing transitions going to an implicit sink."""
+    block = {state: state in dfa.finals for state in dfa.states}
+    while True:
+        signature = {state: (block[state],) + tuple(block.get(dfa.dst_state(state, symbol))
+                                                    for symbol in dfa.alphabet)
+                     for state in dfa.states}
+        if len(set(signature.values())) == len(set(block.values())):
+            return {frozenset(s for s in dfa.states if signature[s] == key) for key in set(signature.values())}
+        block = signature
+
+def language(dfa: DFA, max_len: int, alphabet: str = "ab"):
+    return [word for word in words(alphabet, max_len) if accepts(dfa, word)]
+
+def bound(dfa1: DFA, dfa2: DFA) -> int:
+    """ A length up to which two DFAs differ if they are not equivalent."""
+    return len(dfa1.states) + len(dfa2.states)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_equivalent_states_agree_with_moore(seed):
+    dfa = small_dfa(seed)
+    # The states which cannot reach a final state all behave like the sink.
+    dead = frozenset(set(dfa.states) - set(algorithms.coaccessible_states(dfa)))
+    expected = {group - dead for group in moore_classes(dfa)} - {frozenset()}
+    groups = {frozenset(group) - dead for group in algorithms.equivalent_states(dfa)} - {frozenset()}
+    assert groups == expected
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_minimize_preserves_the_language(seed):
+    dfa = small_dfa(seed)
+    minimal = algorithms.minimize(dfa)
+    assert language(minimal, 7) == language(dfa, 7)
+    assert len(minimal.states) <= len(dfa.states)
+    assert len(algorithms.minimize(minimal).states) == len(minimal.states)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_canonical_hash_ignores_state_names(seed):
+    dfa = algorithms.minimize(small_dfa(seed))
+    names = {state: "q" + state for state in dfa.states}
+    renamed = DFA.DFA.from_table(dfa.alphabet, [names[state] for state in dfa.states],
+                                 dfa.table, names[dfa.init], [names[state] for state in dfa.finals],
+                                 dfa.class_symbols)
+    assert algorithms.canonical_hash(renamed) == algorithms.canonical_hash(dfa)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_equivalent_and_distinguishing_word_agree_with_enumeration(seed):
+    dfa1 = small_dfa(seed)
+    dfa2 = small_dfa(seed + 1000) if seed % 3 else algorithms.minimize(dfa1)
+    n = bound(dfa1, dfa2)
+    differences = [word for word in words("ab", n) if accepts(dfa1, word) != accepts(dfa2, word)]
+    assert algorithms.equivalent(dfa1, dfa2) == (len(differences) == 0)
+    word = algorithms.distinguishing_word(dfa1, dfa2)
+    if len(differences) == 0:
+        assert word is None
+    else:
+        assert len(word) == len(differences[0])
+        assert accepts(dfa1, word) != accepts(dfa2, word)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_product_and_witnesses(seed):
+    dfa1 = small_dfa(seed)
+    dfa2 = small_dfa(seed + 1000)
+    n = bound(dfa1, dfa2)
+    product = algorithms.product(dfa1, dfa2)
+    assert language(product, 6) == [word for word in language(dfa1, 6) if accepts(dfa2, word)]
+    both = [word for word in words("ab", n) if accepts(dfa1, word) and accepts(dfa2, word)]
+    only1 = [word for word in words("ab", n) if accepts(dfa1, word) and not accepts(dfa2, word)]
+    assert algorithms.is_empty_intersection(dfa1, dfa2) == (len(both) == 0)
+    assert algorithms.is_included(dfa1, dfa2) == (len(only1) == 0)
+    witness = algorithms.product_witness(dfa1, dfa2, "difference")
+    assert (witness is None) == (len(only1) == 0)
+    if witness is not None:
+        assert len(witness) == len(only1[0])
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_determinize_agrees_with_the_nfa(seed):
+    fa = generators.random_fa(random.Random(seed).randint(1, 6), "ab", epsilon_ratio=0.2, seed=seed)
+    dfa = algorithms.determinize(fa)
+    assert all(accepts(dfa, word) == fa_accepts(fa, word) for word in words("ab", 6))
+
+def test_determinize_limit(capsys):
+    fa = generators.nth_from_last_fa(8)
+    assert algorithms.determinize(fa, max_states=10) is None
+    assert "error : " in capsys.readouterr().out
+    assert len(algorithms.determinize(fa).states) == 2 ** 8
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_reachability_agrees_with_a_search(seed):
+    dfa = small_dfa(seed)
+    reached = {dfa.init}
+    for word in words("ab", len(dfa.states)):
+        state = dfa.init
+        for symbol in word:
+            state = state and dfa.dst_state(state, symbol)
+        if state is not None:
+            reached.add(state)
+    assert set(algorithms.accessible_states(dfa)) == reached
+    coaccessible = {state for state in dfa.states
+                    if any(accepts(DFA.DFA.from_table(dfa.alphabet, dfa.states, dfa.table, state, dfa.finals,
+                                                      dfa.class_symbols), word)
+                           for word in words("ab", len(dfa.states)))}
+    assert set(algorithms.coaccessible_states(dfa)) == coaccessible
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_is_finite_agrees_with_enumeration(seed):
+    dfa = small_dfa(seed)
+    n = len(dfa.states)
+    infinite = any(accepts(dfa, word) for word in words("ab", 2 * n) if len(word) >= n)
+    assert algorithms.is_finite(dfa) == (not infinite)
+
+def test_complete_adds_a_sink_per_class():
+    alphabet = "".join(chr(i) for i in range(256))
+    dfa = DFA.DFA.from_table(alphabet, ["0", "1"], [1] * 256 + [-1] * 256, "0", ["1"])
+    algorithms.complete(dfa)
+    assert algorithms.is_complete(dfa)
+    assert len(dfa.states) == 3 and len(dfa.class_symbols) == 1
+    assert accepts(dfa, "x") and not accepts(dfa, "xy")
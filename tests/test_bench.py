@@ -0,0 +1,29 @@
+from bench import generators, suite
+
+import algorithms
+from conftest import accepts, fa_accepts, words
+
+def test_generators():
+    dfa = generators.random_dfa(30, "abc", seed=1)
+    assert len(dfa.states) == 30 and algorithms.is_complete(dfa)
+    assert generators.random_dfa(30, "abc", seed=1).transitions == dfa.transitions
+    chain = generators.chain_dfa(4, "ab")
+    assert [word for word in words("ab", 4) if accepts(chain, word)] == [w for w in words("ab", 4) if len(w) == 3]
+    fa = generators.nth_from_last_fa(3)
+    assert all(fa_accepts(fa, word) == (len(word) >= 3 and word[-3] == "a") for word in words("ab", 6))
+
+def test_sweep_and_compare():
+    results = suite.run_suite(["minimize", "run"], [50, 100], repeat=1)
+    assert results["benchmarks"]["minimize"]["sizes"] == [50, 100]
+    assert suite.compare(results, results) == []
+    slower = {"benchmarks": {"minimize": dict(results["benchmarks"]["minimize"],
+                                              times=[t / 10 for t in results["benchmarks"]["minimize"]["times"]])}}
+    assert len(suite.compare(results, slower)) == 2
+    assert "minimize" in suite.report(results)
+
+def test_exponential_benchmarks_ignore_the_sizes(capsys):
+    results = suite.run_suite(["determinize_worst"], [200, 400], repeat=1, exponential_sizes=[4, 6, 50])
+    assert results["benchmarks"]["determinize_worst"]["sizes"] == [4, 6]
+    assert "error : " in capsys.readouterr().out
+    results = suite.run_suite(["determinize_worst"], [200, 400], repeat=1)
+    assert results["benchmarks"]["determinize_worst"]["sizes"] == suite.BENCHMARKS["determinize_worst"][1]
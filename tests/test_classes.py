@@ -0,0 +1,40 @@
+import DFA
+import algorithms
+import classes
+from conftest import accepts, words
+
+def byte_dfa():
+    """ Accepts the words made of digits separated by single spaces."""
+    alphabet = classes.from_intervals([("\x00", "\xff")])
+    dfa = DFA.DFA(alphabet)
+    dfa.add_state("start")
+    dfa.add_state("digits", True)
+    dfa.add_state("space")
+    dfa.init = "start"
+    for digit in "0123456789":
+        for state in ("start", "digits", "space"):
+            dfa.add_transition(state, digit, "digits")
+    dfa.add_transition("digits", " ", "space")
+    return dfa
+
+def test_symbol_classes():
+    dfa = byte_dfa()
+    assert sorted(classes.symbol_classes(dfa), key=len) == [" ", "0123456789",
+        "".join(c for c in dfa.alphabet if c not in "0123456789 ")]
+    dfa.merge_classes()
+    assert len(dfa.class_symbols) == 3
+
+def test_interval_transitions():
+    dfa = byte_dfa()
+    assert classes.interval_transitions(dfa, "digits") == [(" ", " ", "space"), ("0", "9", "digits")]
+    assert classes.intervals("abcxz") == [("a", "c"), ("x", "x"), ("z", "z")]
+
+def test_compress_and_expand():
+    dfa = byte_dfa()
+    (small, symbol_classes) = classes.compress(dfa)
+    assert len(small.alphabet) == 3
+    minimal = classes.expand(algorithms.minimize(small), symbol_classes)
+    assert sorted(minimal.alphabet) == sorted(dfa.alphabet)
+    for word in list(words("0 a", 4)) + ["12 345", "1  2", "\xff"]:
+        assert accepts(minimal, word) == accepts(dfa, word)
+    assert algorithms.equivalent(minimal, dfa)
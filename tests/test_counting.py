@@ -0,0 +1,29 @@
+import pytest
+
+import counting
+from bench import generators
+from conftest import accepts, words
+
+@pytest.mark.parametrize("seed", range(20))
+def test_length_distribution_agrees_with_enumeration(seed):
+    alphabet = "abc"[:1 + seed % 3]
+    dfa = generators.random_dfa(1 + seed % 6, alphabet, density=0.7, seed=seed)
+    expected = [0] * 6
+    for word in words(alphabet, 5):
+        if accepts(dfa, word):
+            expected[len(word)] += 1
+    assert counting.length_distribution(dfa, 5) == expected
+    assert [counting.count_words(dfa, n) for n in range(6)] == expected
+
+def test_counts_beyond_64_bits():
+    alphabet = "".join(chr(i) for i in range(256))
+    dfa = generators.chain_dfa(1, alphabet)
+    for symbol in alphabet:
+        dfa.add_transition("0", symbol, "0")
+    assert counting.count_words(dfa, 20) == 256 ** 20
+    assert counting.length_distribution(dfa, 3) == [1, 256, 256 ** 2, 256 ** 3]
+
+def test_negative_lengths():
+    dfa = generators.random_dfa(3, "ab", seed=1)
+    assert counting.count_words(dfa, -1) == 0
+    assert counting.length_distribution(dfa, -1) == []
@@ -0,0 +1,135 @@
+import pytest
+
+import DFA
+import algorithms
+from bench import generators
+from conftest import accepts, make_dfa, words
+
+def abc_dfa():
+    return make_dfa("abc", ["0", "1", "2"],
+                    [("0", "a", "1"), ("1", "b", "2"), ("2", "c", "2"), ("2", "a", "0")],
+                    finals=["2"])
+
+def full_table(dfa):
+    """ The `state x symbol` table of the automaton, whatever its classes."""
+    return list(DFA.select_columns(dfa.table, len(dfa.class_symbols), dfa.class_ids))
+
+def test_table_follows_the_legacy_api():
+    dfa = abc_dfa()
+    assert dfa.dst_state("0", "a") == "1"
+    assert dfa.dst_state("0", "b") is None
+    assert full_table(dfa) == [1, -1, -1, -1, 2, -1, 0, -1, 2]
+    assert dfa.transitions["2"] == [("a", "0"), ("c", "2")]
+    dfa.remove_transition("2", "a")
+    assert dfa.dst_state("2", "a") is None
+    assert algorithms.predecessors(dfa, "0") == []
+
+def test_invalid_edits_print_errors(capsys):
+    dfa = abc_dfa()
+    version = dfa.version
+    dfa.add_transition("0", "a", "2")
+    dfa.add_transition("0", "z", "2")
+    dfa.add_transition("9", "a", "2")
+    dfa.add_state("0")
+    assert capsys.readouterr().out.count("error : ") == 4
+    assert dfa.version == version
+    assert dfa.dst_state("0", "a") == "1"
+
+def test_transitions_assignment_rebuilds_the_table():
+    dfa = abc_dfa()
+    dfa.transitions = {"0": [("b", "0"), ("c", "2")]}
+    assert full_table(dfa) == [-1, 0, 2, -1, -1, -1, -1, -1, -1]
+    assert algorithms.predecessors(dfa, "0") == ["0"]
+    with pytest.raises(DFA.UnknownStateError):
+        dfa.transitions = {"9": [("a", "0")]}
+    with pytest.raises(DFA.TransitionConflictError):
+        dfa.transitions = {"0": [("a", "0"), ("a", "1")]}
+
+def test_from_table_matches_the_legacy_api():
+    dfa = abc_dfa()
+    bulk = DFA.DFA.from_table("abc", ["0", "1", "2"], [1, -1, -1, -1, 2, -1, 0, -1, 2], "0", ["2"])
+    assert full_table(bulk) == full_table(dfa)
+    assert [sorted(preds) for preds in bulk.predecessor_ids] == [sorted(preds) for preds in dfa.predecessor_ids]
+    assert all(accepts(bulk, word) == accepts(dfa, word) for word in words("abc", 5))
+
+@pytest.mark.parametrize("build, error", [
+    (lambda : DFA.DFA.from_table("ab", ["0", "0"], [-1] * 4), DFA.DuplicateStateError),
+    (lambda : DFA.DFA.from_table("ab", ["0"], [0]), DFA.TableError),
+    (lambda : DFA.DFA.from_table("ab", ["0"], [0, 5]), DFA.TableError),
+    (lambda : DFA.DFA.from_table("ab", ["0"], [0, 0], "1"), DFA.UnknownStateError),
+    (lambda : DFA.DFA.from_table("ab", ["0"], [0, 0], "0", ["1"]), DFA.UnknownStateError),
+    (lambda : DFA.DFA.builder("ab").add_state("0").add_transition("0", "z", "0").build(),
+     DFA.UnknownSymbolError),
+    (lambda : DFA.DFA.builder("ab").add_state("0").add_transition("0", "a", "1").build(),
+     DFA.UnknownStateError),
+    (lambda : DFA.DFA.builder("ab").add_states(["0", "1"]).add_transitions(
+        [("0", "a", "0"), ("0", "a", "1")]).build(), DFA.TransitionConflictError),
+])
+def test_bulk_construction_errors(build, error):
+    with pytest.raises(error):
+        build()
+    assert issubclass(error, DFA.BuildError)
+
+def test_table_error_reports_the_index():
+    with pytest.raises(DFA.TableError) as info:
+        DFA.DFA.from_table("ab", ["0", "1"], [0, 1, 7, 0])
+    assert info.value.index == 2
+
+def test_clone_is_copy_on_write():
+    dfa = abc_dfa()
+    clone = dfa.clone()
+    assert clone.table is dfa.table and dfa.shared
+    clone.add_transition("0", "b", "0")
+    assert dfa.dst_state("0", "b") is None
+    assert clone.dst_state("0", "b") == "0"
+    assert not dfa.shared and not clone.shared
+    dfa.add_transition("1", "c", "0")
+    assert clone.dst_state("1", "c") is None
+
+def test_completed_does_not_modify_the_original():
+    dfa = abc_dfa()
+    table = full_table(dfa)
+    completed = algorithms.completed(dfa)
+    assert algorithms.is_complete(completed)
+    assert not algorithms.is_complete(dfa)
+    assert full_table(dfa) == table
+    assert all(accepts(completed, word) == accepts(dfa, word) for word in words("abc", 5))
+    completed.remove_transition("0", "a")
+    assert full_table(dfa) == table and dfa.dst_state("0", "a") == "1"
+    negated = algorithms.negated(algorithms.completed(dfa))
+    assert all(accepts(negated, word) != accepts(dfa, word) for word in words("abc", 5))
+
+def test_cache_is_invalidated_by_modifications():
+    dfa = abc_dfa()
+    assert algorithms.accessible_states(dfa) == ["0", "1", "2"]
+    dfa.add_state("3")
+    assert "3" not in algorithms.accessible_states(dfa)
+    dfa.add_transition("1", "a", "3")
+    assert "3" in algorithms.accessible_states(dfa)
+    dfa.finals.append("3")
+    assert "3" in algorithms.coaccessible_states(dfa)
+
+def test_symbol_classes_split_and_merge():
+    dfa = DFA.DFA.from_table("abcd", ["0", "1"], [1, 1, 1, 0, 0, 0, 0, 0])
+    assert len(dfa.class_symbols) == 2
+    dfa.remove_transition("0", "b")
+    assert len(dfa.class_symbols) == 3
+    assert full_table(dfa) == [1, -1, 1, 0, 0, 0, 0, 0]
+    dfa.add_transition("0", "b", "1")
+    dfa.merge_classes()
+    assert len(dfa.class_symbols) == 2
+    assert full_table(dfa) == [1, 1, 1, 0, 0, 0, 0, 0]
+
+def test_compact_keeps_the_behavior():
+    dfa = generators.random_dfa(50, "abc", density=0.7, seed=3)
+    reference = dfa.clone()
+    reference.add_state("extra") # Detaches the reference.
+    dfa.compact()
+    assert dfa.compacted
+    assert all(accepts(dfa, word) == accepts(reference, word) for word in words("abc", 4))
+    report = dfa.memory_report()
+    assert report["total"] == sum(size for (name, size) in report.items() if name != "total")
+    dfa.add_state("new")
+    dfa.add_transition("new", "a", "0")
+    assert not dfa.compacted and dfa.dst_state("new", "a") == "0"
+    assert all(accepts(dfa, word) == accepts(reference, word) for word in words("abc", 4))
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import algorithms
+import incremental
+from bench import generators
+
+def random_edit(r: random.Random, dfa, alphabet: str) -> tuple:
+    states = dfa.states
+    kind = r.choice(["add_transition", "add_transition", "remove_transition", "set_final", "add_state"])
+    if kind == "add_state":
+        return ("add_state", "n" + str(len(states)), r.random() < 0.5)
+    if kind == "set_final":
+        return ("set_final", r.choice(states), r.random() < 0.5)
+    if kind == "remove_transition":
+        return ("remove_transition", r.choice(states), r.choice(alphabet))
+    return ("add_transition", r.choice(states), r.choice(alphabet), r.choice(states))
+
+def groups(partition):
+    return sorted(sorted(group) for group in partition)
+
+@pytest.mark.parametrize("seed", range(15))
+@pytest.mark.parametrize("fallback_ratio", [0.25, 1.0])
+def test_incremental_updates_match_a_full_recompute(seed, fallback_ratio):
+    r = random.Random(seed)
+    alphabet = "abc"
+    dfa = generators.random_dfa(r.randint(2, 12), alphabet, density=0.7, seed=seed)
+    maintained = incremental.IncrementalMinimalDFA(dfa, fallback_ratio)
+    for _ in range(40):
+        edit = random_edit(r, dfa, alphabet)
+        if edit[0] == "remove_transition" and dfa.dst_state(edit[1], edit[2]) is None:
+            continue
+        if edit[0] == "add_transition" and dfa.dst_state(edit[1], edit[2]) is not None:
+            maintained.apply(("remove_transition", edit[1], edit[2]))
+        maintained.apply(edit)
+        assert groups(maintained.equivalent_states()) == groups(algorithms.equivalent_states(dfa))
+    minimal = maintained.minimal()
+    assert algorithms.equivalent(minimal, dfa)
+    assert len(minimal.states) == len(algorithms.minimize(dfa).states)
+
+def test_local_updates_are_used():
+    dfa = generators.random_dfa(200, "ab", seed=1)
+    maintained = incremental.IncrementalMinimalDFA(dfa)
+    dfa.add_state("leaf")
+    maintained.recompute()
+    maintained.apply(("set_final", "leaf", True))
+    assert maintained.updates == 1
+    assert groups(maintained.equivalent_states()) == groups(algorithms.equivalent_states(dfa))
+
+def test_outside_modifications_trigger_a_recompute():
+    dfa = generators.random_dfa(20, "ab", seed=2)
+    maintained = incremental.IncrementalMinimalDFA(dfa)
+    recomputations = maintained.recomputations
+    dfa.finals.append("1" if "1" not in dfa.finals else "2")
+    assert groups(maintained.equivalent_states()) == groups(algorithms.equivalent_states(dfa))
+    assert maintained.recomputations == recomputations + 1
+
+def test_invalid_edits_are_ignored(capsys):
+    dfa = generators.random_dfa(5, "ab", seed=3)
+    maintained = incremental.IncrementalMinimalDFA(dfa)
+    before = groups(maintained.equivalent_states())
+    maintained.apply(("set_final", "missing", True))
+    maintained.apply(("unknown",))
+    maintained.apply(("add_transition", "0", "z", "1"))
+    assert groups(maintained.equivalent_states()) == before
+    assert capsys.readouterr().out.count("error : ") == 3
@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+import algorithms
+import lazy
+from bench import generators
+from conftest import accepts, fa_accepts, words
+
+@pytest.mark.parametrize("seed", range(15))
+def test_lazy_dfa_agrees_with_determinize(seed):
+    fa = generators.random_fa(random.Random(seed).randint(1, 8), "ab", epsilon_ratio=0.2, seed=seed)
+    runner = lazy.LazyDFA(fa)
+    dfa = algorithms.determinize(fa)
+    corpus = list(words("ab", 6))
+    assert [runner.match(word) for word in corpus] == [accepts(dfa, word) for word in corpus]
+    assert runner.match_many(corpus) == [i for (i, word) in enumerate(corpus) if fa_accepts(fa, word)]
+
+def test_bounded_cache_is_flushed():
+    fa = generators.nth_from_last_fa(10)
+    runner = lazy.LazyDFA(fa, max_states=16)
+    r = random.Random(1)
+    corpus = ["".join(r.choice("ab") for _ in range(30)) for _ in range(50)]
+    assert runner.match_many(corpus) == [i for (i, word) in enumerate(corpus) if word[-10] == "a"]
+    assert runner.flushes > 0
+    assert len(runner.states) <= 16
+    stats = runner.stats()
+    assert stats["flushes"] == runner.flushes and 0.0 <= runner.hit_rate() <= 1.0
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+import algorithms
+import matcher
+from bench import generators
+from conftest import accepts, words
+
+def sample_words(alphabet: str, count: int, seed: int):
+    r = random.Random(seed)
+    return ["".join(r.choice(alphabet) for _ in range(r.randint(0, 12))) for _ in range(count)]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compiled_matcher_agrees_with_run(seed):
+    dfa = generators.random_dfa(1 + seed % 7, "abc", density=0.8, seed=seed)
+    compiled = matcher.compile(dfa)
+    corpus = list(words("abc", 4)) + sample_words("abcd", 200, seed)
+    expected = [accepts(dfa, word) for word in corpus]
+    assert [compiled.match(word) for word in corpus] == expected
+    assert compiled.match_many(corpus) == [i for (i, ok) in enumerate(expected) if ok]
+    assert compiled.match_many(corpus) == [i for (i, word) in enumerate(corpus)
+                                           if all(s in dfa.alphabet for s in word) and algorithms.run(dfa, word)]
+
+def test_compiled_matcher_is_frozen():
+    dfa = generators.random_dfa(3, "ab", seed=1)
+    compiled = matcher.compile(dfa)
+    with pytest.raises(AttributeError):
+        compiled.init = 0
+    before = [compiled.match(word) for word in words("ab", 5)]
+    dfa.finals.clear()
+    assert [compiled.match(word) for word in words("ab", 5)] == before
+
+@pytest.mark.parametrize("seed", range(10))
+def test_run_batch_agrees_with_match(seed):
+    numpy = pytest.importorskip("numpy")
+    dfa = generators.random_dfa(6, "abc", density=0.8, seed=seed)
+    corpus = sample_words("abcz", 300, seed)
+    mask = matcher.run_batch(dfa, corpus, batch_size=64)
+    assert isinstance(mask, numpy.ndarray)
+    assert mask.tolist() == [accepts(dfa, word) for word in corpus]
+
+@pytest.mark.parametrize("seed", range(10))
+def test_scanner_resumes_across_chunks(seed):
+    dfa = generators.random_dfa(5, "ab", density=0.9, seed=seed)
+    word = sample_words("ab", 1, seed)[0] * 3
+    scanner = matcher.Scanner(dfa)
+    cut = len(word) // 2
+    scanner.feed(word[:cut])
+    (state, position) = (scanner.state, scanner.position)
+    other = matcher.Scanner(dfa)
+    if state is not None:
+        other.reset(state, position)
+        other.feed(word[cut:])
+        assert other.position == len(word)
+        assert other.accepted == accepts(dfa, word)
+    scanner.feed(word[cut:].encode("ascii"))
+    assert scanner.accepted == accepts(dfa, word)
+
+def test_scan_file(tmp_path):
+    dfa = generators.chain_dfa(6, "ab")
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"abab")
+    assert not matcher.scan_file(dfa, str(path))
+    path.write_bytes(b"ababa")
+    assert matcher.scan_file(dfa, str(path), chunk_size=2)
+    path.write_bytes(b"")
+    assert not matcher.scan_file(dfa, str(path))
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+import algorithms
+import memo
+from bench import generators
+
+@pytest.fixture
+def cache(tmp_path):
+    memo.configure(maxsize=4, directory=str(tmp_path / "memo"))
+    yield memo.CACHE
+    memo.configure()
+
+def test_fingerprint_follows_the_content():
+    dfa = generators.random_dfa(10, "ab", seed=1)
+    fingerprint = memo.fingerprint(dfa)
+    assert memo.fingerprint(dfa.clone()) == fingerprint
+    assert memo.fingerprint(generators.random_dfa(10, "ab", seed=1)) == fingerprint
+    dfa.finals.append("0" if "0" not in dfa.finals else "1")
+    assert memo.fingerprint(dfa) != fingerprint
+
+def test_memoized_results_are_copies(cache):
+    dfa = generators.random_dfa(30, "ab", seed=2)
+    first = memo.minimize(dfa)
+    second = memo.minimize(dfa)
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert first.states == algorithms.minimize(dfa).states
+    first.finals.clear()
+    assert second.finals == algorithms.minimize(dfa).finals
+    groups = memo.equivalent_states(dfa)
+    groups[0].append("junk")
+    assert memo.equivalent_states(dfa) == algorithms.equivalent_states(dfa)
+
+def test_results_survive_in_the_directory(cache, tmp_path):
+    dfa1 = generators.random_dfa(20, "ab", seed=3)
+    dfa2 = generators.random_dfa(20, "ab", seed=4)
+    product = memo.product(dfa1, dfa2)
+    groups = memo.equivalent_states(dfa1)
+    assert len(os.listdir(str(tmp_path / "memo"))) == 2
+
+    memo.configure(maxsize=4, directory=str(tmp_path / "memo")) # A new process.
+    assert memo.product(dfa1, dfa2).transitions == product.transitions
+    assert memo.equivalent_states(dfa1) == groups
+    assert (memo.CACHE.misses, memo.CACHE.hits) == (0, 2)
+
+def test_lru_eviction(cache):
+    dfas = [generators.random_dfa(5, "ab", seed=seed) for seed in range(6)]
+    for dfa in dfas:
+        memo.minimize(dfa)
+    assert len(cache.entries) == 4
+    cache.clear()
+    memo.minimize(dfas[0]) # Reloaded from the directory.
+    assert cache.hits == 1
+
+def test_corrupted_disk_entry_is_recomputed(cache, tmp_path, capsys):
+    dfa = generators.random_dfa(8, "ab", seed=5)
+    expected = memo.minimize(dfa)
+    (path,) = os.listdir(str(tmp_path / "memo"))
+    with open(os.path.join(str(tmp_path / "memo"), path), "r+b") as file:
+        file.truncate(20)
+    cache.clear()
+    assert memo.minimize(dfa).transitions == expected.transitions
+    assert "error : " in capsys.readouterr().out
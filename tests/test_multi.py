@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+import multi
+import regexp
+from bench import generators
+from conftest import accepts, words
+
+@pytest.mark.parametrize("seed", range(15))
+def test_union_agrees_with_each_pattern(seed):
+    r = random.Random(seed)
+    dfas = [generators.random_dfa(r.randint(1, 5), alphabet, density=0.7, seed=seed * 10 + i)
+            for (i, alphabet) in enumerate(["ab", "bc", "abc"][:r.randint(1, 3)])]
+    union = multi.union(dfas)
+    corpus = list(words("abcd", 4))
+    expected = [[i for (i, dfa) in enumerate(dfas) if accepts(dfa, word)] for word in corpus]
+    assert union.match_many(corpus) == expected
+
+def test_union_of_regular_expressions():
+    patterns = ["a+", "ab*", "(a|b)*b", "c"]
+    union = multi.union([regexp.compile_dfa(pattern, "abc") for pattern in patterns])
+    assert union.match("a") == [0, 1]
+    assert union.match("ab") == [1, 2]
+    assert union.match("bb") == [2]
+    assert union.match("cc") == []
+    assert multi.union([]).match("") == []
+
+def test_union_limit(capsys):
+    dfas = [regexp.compile_dfa("(a|b)*a" + "(a|b)" * n, "ab") for n in range(4)]
+    assert multi.union(dfas, max_states=8) is None
+    assert "error : " in capsys.readouterr().out
@@ -0,0 +1,26 @@
+import random
+
+import matcher
+import parallel
+from bench import generators
+from conftest import accepts
+
+def corpus(count: int, seed: int):
+    r = random.Random(seed)
+    return ["".join(r.choice("abc") for _ in range(r.randint(0, 10))) for _ in range(count)]
+
+def test_run_parallel_on_words():
+    dfa = generators.random_dfa(20, "ab", density=0.9, seed=1)
+    words = corpus(500, 1)
+    (count, accepted) = parallel.run_parallel(dfa, words, workers=2, chunk_size=64)
+    assert count == 500
+    assert accepted == [i for (i, word) in enumerate(words) if accepts(dfa, word)]
+
+def test_run_parallel_on_a_file(tmp_path):
+    dfa = generators.random_dfa(20, "ab", density=0.9, seed=2)
+    words = corpus(400, 2)
+    path = tmp_path / "words.txt"
+    path.write_bytes("\r\n".join(words).encode("utf-8") + b"\r\n")
+    (count, accepted) = parallel.run_parallel(matcher.compile(dfa), str(path), workers=2, shard_size=256)
+    assert count == 400
+    assert accepted == [i for (i, word) in enumerate(words) if accepts(dfa, word)]
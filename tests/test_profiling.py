@@ -0,0 +1,58 @@
+import threading
+
+import algorithms
+import profiling
+from bench import generators
+
+def test_disabled_by_default():
+    assert not profiling.ENABLED
+    before = profiling.counters.copy()
+    algorithms.minimize(generators.random_dfa(20, "ab", seed=1))
+    profiling.count("test.disabled")
+    assert profiling.counters == before
+
+def test_profile_collects_the_enclosed_work():
+    dfa = generators.random_dfa(50, "ab", seed=2)
+    with profiling.profile() as stats:
+        algorithms.run(dfa, "abba")
+        algorithms.minimize(dfa)
+    assert not profiling.ENABLED
+    assert stats["counters"]["run.transitions"] <= 4
+    assert stats["counters"]["minimize.states"] == len(algorithms.minimize(dfa).states)
+    assert set(stats["timings"]) >= {"minimize.partition", "minimize.build"}
+
+def test_nested_enable_and_exceptions():
+    profiling.enable()
+    try:
+        with profiling.profile():
+            raise KeyError()
+    except KeyError:
+        pass
+    assert profiling.ENABLED
+    profiling.disable()
+    assert not profiling.ENABLED
+
+def test_hooks_receive_the_events():
+    events = []
+    hook = lambda kind, name, value: events.append((kind, name))
+    profiling.add_hook(hook)
+    try:
+        with profiling.profile():
+            profiling.count("test.hook", 2)
+            with profiling.phase("test.phase"):
+                pass
+    finally:
+        profiling.remove_hook(hook)
+    assert ("count", "test.hook") in events and ("time", "test.phase") in events
+
+def test_threads_do_not_lose_counts():
+    def work():
+        for _ in range(20000):
+            profiling.count("test.threads")
+    with profiling.profile() as stats:
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert stats["counters"]["test.threads"] == 80000
@@ -0,0 +1,33 @@
+import re
+
+import pytest
+
+import algorithms
+import regexp
+from conftest import accepts, fa_accepts, words
+
+PATTERNS = ["", "a", "ab*", "(a|b)*abb", "a?b+c*", "(ab|ba)*", "[a-c]b", "[^a]*", ".a.", "a\\*"]
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_compile_dfa_agrees_with_re(pattern):
+    dfa = regexp.compile_dfa(pattern, "abc*")
+    fa = regexp.to_fa(pattern, "abc*")
+    for word in words("abc*", 4):
+        expected = re.fullmatch(pattern, word) is not None
+        assert accepts(dfa, word) == expected
+        assert fa_accepts(fa, word) == expected
+
+@pytest.mark.parametrize("pattern", ["(a", "a)", "*a", "[b-a]", "[ab", "a\\"])
+def test_malformed_patterns(pattern, capsys):
+    with pytest.raises(regexp.RegexError):
+        regexp.compile_dfa(pattern, "ab")
+    assert regexp.to_dfa(pattern, "ab") is None
+    assert "error : " in capsys.readouterr().out
+
+def test_compile_dfa_returns_independent_copies():
+    dfa = regexp.compile_dfa("(a|b)*abb", "ab")
+    assert dfa.states == [str(i) for i in range(len(dfa.states))]
+    assert len(dfa.states) == len(algorithms.minimize(dfa).states)
+    dfa.finals.clear()
+    again = regexp.compile_dfa("(a|b)*abb", "ab")
+    assert accepts(again, "abb") and not accepts(dfa, "abb")
@@ -0,0 +1,55 @@
+import random
+import re
+
+import pytest
+
+import regexp
+import search
+
+PATTERNS = ["ab", "a+b", "(ab|ba)*c", "a|aa|aaa", "b*", "[ab]c?", "a(b|c)*a"]
+
+def texts(seed: int):
+    r = random.Random(seed)
+    return ["".join(r.choice("abc") for _ in range(r.randint(0, 40))) for _ in range(30)]
+
+def leftmost_longest(pattern: str, text: str):
+    """ Reference: the leftmost-longest matches, from `re` with every
+        possible length at each position."""
+    compiled = re.compile(pattern)
+    ret = []
+    start = 0
+    while start <= len(text):
+        ends = [end for end in range(start, len(text) + 1) if compiled.fullmatch(text, start, end)]
+        if ends:
+            ret.append((start, ends[-1]))
+            start = ends[-1] if ends[-1] > start else start + 1
+        else:
+            start += 1
+    return ret
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_finditer_agrees_with_re(pattern):
+    dfa = regexp.compile_dfa(pattern, "abc")
+    for text in texts(len(pattern)):
+        assert list(search.finditer(dfa, text)) == leftmost_longest(pattern, text)
+
+@pytest.mark.parametrize("pattern", [p for p in PATTERNS if "|" not in p and "*" not in p])
+def test_finditer_agrees_with_re_finditer(pattern):
+    # Without alternatives nor stars, the first match of `re` is the longest.
+    dfa = regexp.compile_dfa(pattern, "abc")
+    for text in texts(7):
+        assert list(search.finditer(dfa, text)) == [m.span() for m in re.finditer(pattern, text)]
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_all_matches(pattern):
+    dfa = regexp.compile_dfa(pattern, "abc")
+    compiled = re.compile(pattern)
+    for text in texts(3)[:10]:
+        expected = sorted(((start, end) for end in range(len(text) + 1) for start in range(end + 1)
+                           if compiled.fullmatch(text, start, end)), key=lambda span: (span[1], span[0]))
+        assert list(search.finditer(dfa, text, "all")) == expected
+
+def test_unknown_mode(capsys):
+    dfa = regexp.compile_dfa("a", "ab")
+    assert list(search.finditer(dfa, "aaa", "first")) == []
+    assert "error : " in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import glob
+import os
+
+import pytest
+
+import DFA
+import util
+from bench import generators
+from conftest import accepts, words
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "examples", "*.dfa")))
+
+def same_dfa(dfa1: DFA, dfa2: DFA) -> bool:
+    return (dfa1.alphabet == dfa2.alphabet and dfa1.states == dfa2.states and dfa1.init == dfa2.init
+            and dfa1.finals == dfa2.finals
+            and all(dfa1.transitions[state] == dfa2.transitions[state] for state in dfa1.states))
+
+@pytest.mark.parametrize("filename", EXAMPLES, ids=os.path.basename)
+def test_examples_roundtrip_through_both_formats(filename, tmp_path):
+    dfa = util.read(filename)
+    assert dfa is not None
+    util.save_binary(dfa, str(tmp_path / "a.bdfa"))
+    util.save(dfa, str(tmp_path / "a.dfa"))
+    assert same_dfa(util.load_binary(str(tmp_path / "a.bdfa")), dfa)
+    assert same_dfa(util.read(str(tmp_path / "a.bdfa")), dfa)
+    assert same_dfa(util.read(str(tmp_path / "a.dfa")), dfa)
+
+def test_binary_roundtrip_of_a_large_alphabet(tmp_path):
+    alphabet = "".join(chr(i) for i in range(0x3b0, 0x3d0))
+    dfa = generators.random_dfa(40, alphabet, density=0.5, seed=2)
+    dfa.add_state("état final", True)
+    dfa.add_transition("0", alphabet[0], "état final")
+    util.save_binary(dfa, str(tmp_path / "a.bdfa"))
+    loaded = util.load_binary(str(tmp_path / "a.bdfa"))
+    assert same_dfa(loaded, dfa)
+    assert all(accepts(loaded, word) == accepts(dfa, word) for word in words(alphabet[:3], 3))
+
+def test_conversions(tmp_path):
+    dfa = generators.random_dfa(10, "ab", density=0.8, seed=4)
+    util.save(dfa, str(tmp_path / "a.dfa"))
+    util.text_to_binary(str(tmp_path / "a.dfa"), str(tmp_path / "a.bdfa"))
+    util.binary_to_text(str(tmp_path / "a.bdfa"), str(tmp_path / "b.dfa"))
+    assert (tmp_path / "a.dfa").read_text() == (tmp_path / "b.dfa").read_text()
+
+@pytest.mark.parametrize("size", [0, 10, 40, -1])
+def test_truncated_binary_files(size, tmp_path, capsys):
+    util.save_binary(generators.random_dfa(20, "ab", seed=1), str(tmp_path / "a.bdfa"))
+    data = (tmp_path / "a.bdfa").read_bytes()
+    (tmp_path / "b.bdfa").write_bytes(data[:size])
+    assert util.load_binary(str(tmp_path / "b.bdfa")) is None
+    assert "error : " in capsys.readouterr().out
+
+def test_corrupted_binary_files(tmp_path, capsys):
+    util.save_binary(generators.random_dfa(5, "ab", seed=1), str(tmp_path / "a.bdfa"))
+    data = bytearray((tmp_path / "a.bdfa").read_bytes())
+    version = bytearray(data)
+    version[8] = 99
+    (tmp_path / "version.bdfa").write_bytes(version)
+    assert util.load_binary(str(tmp_path / "version.bdfa")) is None
+    magic = bytearray(data)
+    magic[0:8] = b"NOTADFA!"
+    (tmp_path / "magic.bdfa").write_bytes(magic)
+    assert util.load_binary(str(tmp_path / "magic.bdfa")) is None
+    table = bytearray(data)
+    table[-4:] = (1000).to_bytes(4, "little") # Invalid destination id.
+    (tmp_path / "table.bdfa").write_bytes(table)
+    assert util.load_binary(str(tmp_path / "table.bdfa")) is None
+    assert capsys.readouterr().out.count("error : ") == 3
+
+def test_text_files_are_not_executed(tmp_path, capsys):
+    marker = tmp_path / "executed"
+    (tmp_path / "evil.dfa").write_text('a = DFA.DFA("ab")\nopen(' + repr(str(marker)) + ', "w")\n')
+    assert util.read(str(tmp_path / "evil.dfa")) is None
+    assert not marker.exists()
+    assert "unexpected line" in capsys.readouterr().out